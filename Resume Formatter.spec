@@ -1,7 +1,7 @@
 # -*- mode: python ; coding: utf-8 -*-
 from PyInstaller.utils.hooks import collect_all
 
-datas = [('/Users/macmcmurphy/Desktop/Resume Formatter/app/views', 'app/views'), ('/Users/macmcmurphy/Desktop/Resume Formatter/templates', 'templates')]
+datas = [('/Users/macmcmurphy/Desktop/Resume Formatter/app/views', 'app/views'), ('/Users/macmcmurphy/Desktop/Resume Formatter/templates', 'templates'), ('/Users/macmcmurphy/Desktop/Resume Formatter/app/data', 'app/data')]
 binaries = [('/Users/macmcmurphy/Desktop/Resume Formatter/build/pandoc/mac/pandoc', 'bin')]
 hiddenimports = []
 tmp_ret = collect_all('jinja2')
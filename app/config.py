@@ -57,6 +57,25 @@ def save_api_key(key: str) -> None:
 	cfg["RESUME_FORMATTER_OPENAI_API_KEY"] = key.strip()
 	_write_config_file(cfg)
 
+def get_setting(name: str, default):
+	"""Return a tunable setting: env var overrides config.json; cast to the type of `default`."""
+	raw = os.getenv(name)
+	if raw is None:
+		raw = _read_config_file().get(name)
+	if raw is None or raw == "":
+		return default
+	try:
+		if isinstance(default, bool):
+			return raw if isinstance(raw, bool) else str(raw).strip().lower() in {"1", "true", "yes", "on"}
+		if isinstance(default, int):
+			return int(raw)
+		if isinstance(default, float):
+			return float(raw)
+	except (TypeError, ValueError):
+		print(f"[warn] invalid value for {name}: {raw!r}; using {default!r}")
+		return default
+	return raw
+
 # Resolve OpenAI key precedence: env var overrides saved config
 OPENAI_API_KEY = os.getenv("RESUME_FORMATTER_OPENAI_API_KEY") or get_saved_api_key()
 if not OPENAI_API_KEY:
@@ -65,6 +84,7 @@ if not OPENAI_API_KEY:
 # Resource directories (bundled-safe)
 TEMPLATES_DIR = resource_path("templates")
 VIEWS_DIR = resource_path("app/views")
+DATA_DIR = resource_path("app/data")
 
 # Writable output directory under user data dir
 OUTPUT_DIR = USER_DATA_DIR / "output"
@@ -78,6 +98,83 @@ if not REFERENCE_DOCX.exists():
 if not REFERENCE_DOCX.exists():
 	print(f"[warn] reference.docx not found at {TEMPLATES_DIR}")
 
+# Shared OpenAI HTTP connection pool (see app/services/llm.py)
+LLM_MAX_CONNECTIONS = get_setting("RESUME_FORMATTER_LLM_MAX_CONNECTIONS", 100)
+LLM_MAX_KEEPALIVE = get_setting("RESUME_FORMATTER_LLM_MAX_KEEPALIVE", 20)
+LLM_KEEPALIVE_EXPIRY_S = get_setting("RESUME_FORMATTER_LLM_KEEPALIVE_EXPIRY_S", 30.0)
+LLM_CONNECT_TIMEOUT_S = get_setting("RESUME_FORMATTER_LLM_CONNECT_TIMEOUT_S", 10.0)
+LLM_READ_TIMEOUT_S = get_setting("RESUME_FORMATTER_LLM_READ_TIMEOUT_S", 120.0)
+LLM_MAX_RETRIES = get_setting("RESUME_FORMATTER_LLM_MAX_RETRIES", 2)
+
+# Per-stage model, max tokens, timeout, retries and fallback models (see app/services/model_registry.py),
+# e.g. {"summary": {"model": "gpt-4o-mini", "timeout_s": 20, "fallbacks": ["gpt-4o"]}}
+LLM_STAGES = get_setting("RESUME_FORMATTER_LLM_STAGES", {})
+
+# On-disk LLM response cache (see app/services/llm_cache.py)
+LLM_CACHE_ENABLED = get_setting("RESUME_FORMATTER_LLM_CACHE_ENABLED", True)
+LLM_CACHE_BYPASS = get_setting("RESUME_FORMATTER_LLM_CACHE_BYPASS", False)
+LLM_CACHE_MAX_MB = get_setting("RESUME_FORMATTER_LLM_CACHE_MAX_MB", 256.0)
+LLM_CACHE_TTL_S = get_setting("RESUME_FORMATTER_LLM_CACHE_TTL_S", 7 * 24 * 3600.0)
+
+# Extracted-text cache keyed by upload SHA-256 (see app/services/ingest_cache.py)
+INGEST_CACHE_MAX_ENTRIES = get_setting("RESUME_FORMATTER_INGEST_CACHE_MAX_ENTRIES", 200)
+
+# Extraction schema profile: "minimal" (fields the internal transform reads) or "full"
+EXTRACTION_SCHEMA_PROFILE = str(get_setting("RESUME_FORMATTER_EXTRACTION_SCHEMA", "minimal")).strip().lower()
+
+# Long resumes: extract role chunks concurrently and merge (see app/services/chunking.py)
+EXTRACTION_CHUNKING = get_setting("RESUME_FORMATTER_EXTRACTION_CHUNKING", True)
+EXTRACTION_CHUNK_THRESHOLD = get_setting("RESUME_FORMATTER_EXTRACTION_CHUNK_THRESHOLD", 15000)
+EXTRACTION_CHUNK_CHARS = get_setting("RESUME_FORMATTER_EXTRACTION_CHUNK_CHARS", 6000)
+
+# Seniority: "local" date rules with LLM fallback, or "llm" to always ask the model
+SENIORITY_MODE = str(get_setting("RESUME_FORMATTER_SENIORITY_MODE", "local")).strip().lower()
+
+# Summary prompts get a compact resume digest instead of the raw text (see app/services/digest.py);
+# strategy when over budget: "recent", "balanced" or "tail"
+SUMMARY_DIGEST_TOKENS = get_setting("RESUME_FORMATTER_SUMMARY_DIGEST_TOKENS", 700)
+SUMMARY_DIGEST_STRATEGY = str(get_setting("RESUME_FORMATTER_SUMMARY_DIGEST_STRATEGY", "recent")).strip().lower()
+SUMMARY_DIGEST_BULLETS = get_setting("RESUME_FORMATTER_SUMMARY_DIGEST_BULLETS", 2)
+SUMMARY_DIGEST_BULLET_CHARS = get_setting("RESUME_FORMATTER_SUMMARY_DIGEST_BULLET_CHARS", 180)
+# Summaries: draft with the "summary_draft" stage model, check it locally, and only send
+# the prompt to the "summary" stage model when the draft fails (see summary_completion).
+# Off by default: the draft has to be complete before it can be checked, so with the
+# cascade on the summary is no longer streamed token by token to job events
+SUMMARY_CASCADE = get_setting("RESUME_FORMATTER_SUMMARY_CASCADE", False)
+
+# One LLM pass for bullet harmonize + proofread (falls back to two passes on bad output)
+BULLETS_FUSED = get_setting("RESUME_FORMATTER_BULLETS_FUSED", True)
+
+# Background jobs (see app/services/jobs.py)
+JOB_WORKERS = get_setting("RESUME_FORMATTER_JOB_WORKERS", 4)
+JOB_MAX_RETAINED = get_setting("RESUME_FORMATTER_JOB_MAX_RETAINED", 200)
+JOB_SHUTDOWN_TIMEOUT_S = get_setting("RESUME_FORMATTER_JOB_SHUTDOWN_TIMEOUT_S", 120.0)
+
+# Worker resources for blocking work (see app/services/workers.py)
+PDF_WORKERS = get_setting("RESUME_FORMATTER_PDF_WORKERS", min(4, os.cpu_count() or 1))
+RENDER_CONCURRENCY = get_setting("RESUME_FORMATTER_RENDER_CONCURRENCY", 2)
+PANDOC_TIMEOUT_S = get_setting("RESUME_FORMATTER_PANDOC_TIMEOUT_S", 120.0)
+
+# PDF text extraction: scanned-PDF probe, page ranges per worker task, and an optional
+# budget (0 = no limit); a budgeted extraction is flagged "truncated" in /estimate and /ingest
+PDF_PROBE_PAGES = get_setting("RESUME_FORMATTER_PDF_PROBE_PAGES", 2)
+PDF_PAGES_PER_TASK = get_setting("RESUME_FORMATTER_PDF_PAGES_PER_TASK", 4)
+PDF_MAX_PAGES = get_setting("RESUME_FORMATTER_PDF_MAX_PAGES", 0)
+PDF_MAX_CHARS = get_setting("RESUME_FORMATTER_PDF_MAX_CHARS", 0)
+# PDF engine: "pdfminer", "pypdfium2" (optional package) or "auto" (pypdfium2 for large files)
+PDF_BACKEND = str(get_setting("RESUME_FORMATTER_PDF_BACKEND", "pdfminer")).strip().lower()
+PDF_AUTO_FAST_BYTES = get_setting("RESUME_FORMATTER_PDF_AUTO_FAST_BYTES", 2 * 1024 * 1024)
+
+# Put scrubbed emails/phones/URLs/addresses back into the final JSON, Markdown and DOCX
+# (per request: rehydrate_pii); the LLM only ever sees the tokens
+PII_REHYDRATE = get_setting("RESUME_FORMATTER_PII_REHYDRATE", False)
+
+# Skill canonicalization: alias taxonomy (empty = app/data/skill_taxonomy.json)
+SKILL_TAXONOMY = get_setting("RESUME_FORMATTER_SKILL_TAXONOMY", "")
+
+# DOCX renderer: "docx" builds the file with python-docx, "pandoc" converts resume.md
+RENDER_BACKEND = str(get_setting("RESUME_FORMATTER_RENDER_BACKEND", "docx")).strip().lower()
+
 def get_pandoc_executable() -> str:
 	"""Return path to bundled pandoc if present; else fallback to 'pandoc' on PATH."""
 	# In a bundled app, we add the pandoc binary under 'bin/pandoc'
@@ -6,6 +6,11 @@ from fastapi.templating import Jinja2Templates
 
 import app.config as cfg
 from app.routers.convert import router as convert_router
+from app.routers.jobs import router as jobs_router
+from app.services.jobs import get_job_manager
+from app.services.llm import aclose_openai_clients
+from app.services.reference_template import get_reference_template
+from app.services.workers import shutdown_workers
 
 # Configure logging
 logging.basicConfig(
@@ -25,8 +30,18 @@ templates = Jinja2Templates(directory=str(cfg.VIEWS_DIR))
 async def on_startup():
 	logger.info("App starting. version=%s", cfg.APP_VERSION)
 	logger.info("reference_docx_exists=%s path=%s", cfg.REFERENCE_DOCX.exists(), cfg.REFERENCE_DOCX)
+	if cfg.REFERENCE_DOCX.exists():
+		# Parse once up front; renders then patch the in-memory copy
+		get_reference_template(cfg.REFERENCE_DOCX)
 	logger.info("openai_key_present=%s", bool(cfg.OPENAI_API_KEY))
 
+@app.on_event("shutdown")
+async def on_shutdown():
+	# Let in-flight jobs finish before the clients and worker pools go away
+	await get_job_manager().shutdown(cfg.JOB_SHUTDOWN_TIMEOUT_S)
+	await aclose_openai_clients()
+	shutdown_workers()
+
 @app.get("/", response_class=HTMLResponse)
 async def index(request: Request):
 	if not cfg.OPENAI_API_KEY:
@@ -39,3 +54,4 @@ async def setup(request: Request):
 
 # API routes
 app.include_router(convert_router, prefix="/api")
+app.include_router(jobs_router, prefix="/api")
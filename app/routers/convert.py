@@ -1,25 +1,35 @@
+from dataclasses import replace
 from datetime import datetime
 from pathlib import Path
 import json
 import logging
-import tempfile
-from fastapi import APIRouter, UploadFile, File, HTTPException
+import shutil
+import time
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException
 from fastapi.responses import JSONResponse
 import os
-from typing import Dict
+from typing import Dict, List, Optional, Tuple
+import asyncio
 
-from app.config import OUTPUT_DIR, REFERENCE_DOCX, APP_VERSION, save_api_key
+from app.config import OUTPUT_DIR, APP_VERSION, save_api_key
 import app.config as cfg
-from app.services.pdf_ingest import extract_text_from_pdf
-from app.services.pii import scrub_text
+from app.services.ingest_cache import IngestResult, get_ingest_cache
+from app.services.pii import rehydrate, scrub_text
 from app.services.extraction import extract_to_json
 from app.services.normalize import normalize_resume_data
+from app.services.dates import iso_month, split_date_range
 from app.services.render import render_markdown_and_docx
-from app.services.summary import polish_intro_summary, enforce_sme_in_summary, generate_intro_summary
+from app.services.template_registry import ResumeTemplate, get_template_registry
+from app.services.summary import cascade_stats, polish_intro_summary, enforce_sme_in_summary, generate_intro_summary
+from app.services.digest import resume_corpus, summary_context
+from app.services.sections import ResumeSections, segment_resume
 from app.services.skills import extract_candidate_skills_from_text, organize_skills_for_role
-from app.services.bullets import harmonize_bullets_across_resume
+from app.services.bullets import harmonize_bullets_across_resume, polish_bullets_across_resume
 from app.services.proofread import proofread_summary_text, proofread_bullets_across_resume
 from app.services.seniority import infer_java_full_stack_seniority
+from app.services.pipeline import RunReporter, Stage, run_stages
+from app.services.llm_cache import get_llm_cache, set_cache_bypass
+from app.services.model_registry import stage_models
 from app.models.schema import Resume
 
 logger = logging.getLogger(__name__)
@@ -78,11 +88,16 @@ def _skill_scope_to_internal(data: dict) -> dict:
 
 	exp = []
 	for w in work:
-		start = w.get("startDate", "")
-		end = w.get("endDate", "")
+		start = w.get("startDate", "") or ""
+		end = w.get("endDate", "") or ""
+		if not end:
+			# the whole "Jan 2019 – Present" range sometimes lands in startDate
+			parts = split_date_range(start)
+			if parts:
+				start, end = parts
 		# reduce to YYYY-MM if possible
-		start = start[:7] if len(start) >= 7 else start
-		end = "Present" if (w.get("is_current") or str(end).lower() in {"", "present"}) else (end[:7] if len(end) >= 7 else end)
+		start = iso_month(start)
+		end = "Present" if (w.get("is_current") or not str(end).strip()) else iso_month(str(end))
 		exp.append({
 			"company": w.get("name", ""),
 			"role": w.get("position", ""),
@@ -125,6 +140,202 @@ def _skill_scope_to_internal(data: dict) -> dict:
 	return internal
 
 
+def _elapsed_ms(t0: float) -> int:
+	return int((time.perf_counter() - t0) * 1000)
+
+
+def _enrichment_stages(
+	normalized: dict, sections: ResumeSections, token_map: Dict[str, str], seniority_stage, summary_stage
+) -> List[Stage]:
+	"""Build the post-normalization stage graph.
+
+	Seniority waits on the "level" input (started while extraction streams, see
+	`_extract_streaming`); the summary chain and the skills stage wait on seniority (they use the title);
+	the bullets chain only needs the normalized experience and starts right away.
+	Each stage reads a snapshot of `normalized` and returns its result; nothing is
+	mutated until `_apply_enrichment` runs after the whole graph finishes.
+	`sections` is the run's segmentation of the scrubbed text; candidate-listed skills
+	are read from it and restored with `token_map` (scrubbing can catch names like socket.io).
+	"""
+	core_skills = list(normalized.get("core_skills", []))
+	experience = normalized.get("experience", [])
+
+	# 4.2) Skills: prefer candidate-listed skills; else organize extracted skills for role context
+	async def skills_stage(deps: dict) -> List[str]:
+		try:
+			candidate_listed = rehydrate(extract_candidate_skills_from_text(sections.text, sections), token_map)
+			if candidate_listed:
+				logger.info("skills: using candidate-listed skills count=%d", len(candidate_listed))
+				return candidate_listed
+			ordered = await organize_skills_for_role(core_skills, experience, deps["seniority"])
+			logger.info("skills: organized for role count=%d", len(ordered))
+			return ordered
+		except Exception:
+			logger.exception("skills_handling_failed; continuing with extracted skills as-is")
+			return core_skills
+
+	# 4.3) Harmonize bullets punctuation and tense via LLM (majority rule, minimal edits).
+	# In fused mode the same call also proofreads, and there is no separate proofread stage.
+	fused_bullets = bool(cfg.BULLETS_FUSED)
+
+	async def bullets_stage(_: dict) -> List[dict]:
+		try:
+			roles_before = sum(len(r.get("bullets", [])) for r in experience)
+			if fused_bullets:
+				harmonized = await polish_bullets_across_resume(experience)
+			else:
+				harmonized = await harmonize_bullets_across_resume(experience)
+			roles_after = sum(len(r.get("bullets", [])) for r in harmonized)
+			if roles_after == roles_before:
+				logger.info("bullets: harmonized punctuation/tense across %d bullets", roles_after)
+			else:
+				logger.warning("bullets: count mismatch before=%d after=%d", roles_before, roles_after)
+			return harmonized
+		except Exception:
+			logger.exception("bullets_harmonization_failed; continuing with original bullets")
+			return experience
+
+	# 4.4) Conservative proofreading for summary and bullets (spelling/spacing/commas only)
+	async def proofread_summary_stage(deps: dict) -> str:
+		summary = deps["summary"]
+		if not summary:
+			return summary
+		try:
+			pf = await proofread_summary_text(summary)
+			logger.info("proofread: applied to summary")
+			return pf or summary
+		except Exception:
+			logger.exception("proofread_failed; continuing without proofreading summary")
+			return summary
+
+	async def proofread_bullets_stage(deps: dict) -> List[dict]:
+		try:
+			proofed = await proofread_bullets_across_resume(deps["bullets"])
+			logger.info("proofread: applied to bullets")
+			return proofed
+		except Exception:
+			logger.exception("proofread_failed; continuing without proofreading bullets")
+			return deps["bullets"]
+
+	stages = [
+		Stage("seniority", seniority_stage, ("level",)),
+		Stage("summary", summary_stage, ("seniority",)),
+		Stage("proofread_summary", proofread_summary_stage, ("summary",)),
+		Stage("skills", skills_stage, ("seniority",)),
+		Stage("bullets", bullets_stage),
+	]
+	if not fused_bullets:
+		stages.append(Stage("proofread_bullets", proofread_bullets_stage, ("bullets",)))
+	return stages
+
+
+def _restore_pii(normalized: dict, token_map: Dict[str, str], requested: Optional[bool]) -> dict:
+	"""Swap scrub tokens in the final data back to the original values when asked to
+	(per request, else cfg.PII_REHYDRATE)."""
+	wanted = cfg.PII_REHYDRATE if requested is None else requested
+	if not wanted or not token_map:
+		return normalized
+	restored = rehydrate(normalized, token_map)
+	logger.info("pii: rehydrated tokens=%d", len(token_map))
+	return restored
+
+
+def _apply_enrichment(normalized: dict, results: dict) -> None:
+	normalized["candidate_title"] = results["seniority"]
+	normalized["summary"] = results["proofread_summary"]
+	normalized["core_skills"] = results["skills"]
+	normalized["experience"] = results.get("proofread_bullets", results["bullets"])
+
+
+async def _infer_level(work_ready: asyncio.Future) -> str:
+	work = await work_ready
+	try:
+		return await infer_java_full_stack_seniority(work, _skill_scope_to_internal({"work": work})["experience"])
+	except Exception:
+		logger.exception("seniority_infer_failed; keeping default title")
+		return ""
+
+
+async def _extract_streaming(
+	scrubbed_text: str, infer_level: bool = True, sections: Optional[ResumeSections] = None
+) -> Tuple[dict, asyncio.Future]:
+	"""Extract to Skill Scope JSON, starting seniority inference as soon as the 'work'
+	section has streamed in so it overlaps the rest of the extraction.
+
+	Returns the extracted data and a future for the seniority level ('' when skipped,
+	empty or failed), to be passed to the stage graph as the "level" input.
+	"""
+	loop = asyncio.get_running_loop()
+	work_ready = loop.create_future()
+
+	def on_section(name: str, value) -> None:
+		if name == "work" and not work_ready.done():
+			logger.info("extraction: work section ready roles=%d", len(value or []))
+			work_ready.set_result(value if isinstance(value, list) else [])
+
+	if infer_level:
+		level = asyncio.create_task(_infer_level(work_ready), name="seniority:early")
+	else:
+		level = loop.create_future()
+		level.set_result("")
+	try:
+		ss_data = await extract_to_json(scrubbed_text, on_section=on_section, sections=sections)
+	except BaseException:
+		level.cancel()
+		raise
+	if not work_ready.done():
+		work_ready.set_result(ss_data.get("work", []))
+	return ss_data, level
+
+
+def _resolve_template(name: Optional[str]) -> ResumeTemplate:
+	try:
+		return get_template_registry().get(name)
+	except ValueError as e:
+		raise HTTPException(status_code=400, detail=str(e))
+
+
+async def _resolve_upload(file: Optional[UploadFile], upload_id: Optional[str], error_prefix: str = "Ingest failed") -> IngestResult:
+	"""Return the ingest result for an uploaded PDF or a previously returned upload_id."""
+	if file is not None and not (file.filename or "").lower().endswith(".pdf"):
+		raise HTTPException(status_code=400, detail="Please upload a PDF file")
+	content = await file.read() if file is not None else None
+	return await _ingest_upload(content, file.filename if file is not None else "", upload_id, error_prefix)
+
+
+async def _ingest_upload(content: Optional[bytes], filename: str, upload_id: Optional[str], error_prefix: str = "Ingest failed") -> IngestResult:
+	cache = get_ingest_cache()
+	if content is None:
+		if not upload_id:
+			raise HTTPException(status_code=400, detail="Please upload a PDF file")
+		try:
+			res = await cache.get(upload_id)
+		except Exception as e:
+			logger.exception("ingest_failed")
+			raise HTTPException(status_code=500, detail=f"{error_prefix}: {e}")
+		if res is None:
+			raise HTTPException(status_code=404, detail="upload_id not found; please upload the PDF again")
+		return res
+	try:
+		res = await cache.ingest(content, filename)
+	except Exception as e:
+		logger.exception("ingest_failed")
+		raise HTTPException(status_code=500, detail=f"{error_prefix}: {e}")
+	# Same bytes under a new name: keep the caller's filename for the run copy
+	return replace(res, filename=filename) if res.filename != filename else res
+
+
+async def _copy_upload_to_run(res: IngestResult, run_dir: Path) -> Path:
+	pdf_path = run_dir / Path(res.filename).name
+	try:
+		await asyncio.to_thread(shutil.copyfile, res.pdf_path, pdf_path)
+	except FileNotFoundError:
+		# The cached PDF was pruned after the extraction was looked up
+		logger.warning("upload_expired: upload_id=%s", res.upload_id[:12])
+		raise HTTPException(status_code=410, detail="Upload expired; please upload the PDF again")
+	return pdf_path
+
+
 @router.get("/health")
 async def health():
 	return {"status": "ok", "version": APP_VERSION}
@@ -135,21 +346,11 @@ async def estimate_resume_time(file: UploadFile = File(...)):
 	"""
 	Quickly estimates processing time based on extracted text length.
 	Heuristic derived from recent logs: ~4s base + ~2.2ms per character.
+	The returned upload_id can be passed to /ingest or /process instead of re-uploading.
 	"""
-	if not file.filename.lower().endswith(".pdf"):
-		raise HTTPException(status_code=400, detail="Please upload a PDF file")
-
-	content = await file.read()
-	file_bytes = len(content)
-
-	# Write to a temporary file for the existing extractor
-	with tempfile.NamedTemporaryFile(suffix=".pdf", delete=True) as tmp:
-		tmp.write(content)
-		tmp.flush()
-		try:
-			raw_text = extract_text_from_pdf(Path(tmp.name))
-		except Exception as e:
-			raise HTTPException(status_code=500, detail=f"Estimate failed: {e}")
+	res = await _resolve_upload(file, None, error_prefix="Estimate failed")
+	file_bytes = res.file_bytes
+	raw_text = res.text
 
 	char_count = len(raw_text or "")
 	# Rough token estimate (chars ~ 4 * tokens)
@@ -164,21 +365,93 @@ async def estimate_resume_time(file: UploadFile = File(...)):
 	estimated_ms = max(8000, min(90000, estimated_ms))
 
 	return JSONResponse({
-		"filename": file.filename,
+		"upload_id": res.upload_id,
+		"filename": res.filename,
 		"file_bytes": file_bytes,
+		"page_count": res.page_count,
 		"char_count": char_count,
+		"truncated": res.truncated,
 		"token_estimate": token_estimate,
 		"estimated_ms": estimated_ms,
 		"estimated_seconds": round(estimated_ms / 1000, 1),
 	})
 
 
+@router.get("/templates")
+async def list_templates():
+	return {"templates": get_template_registry().names()}
+
+
+@router.get("/llm_cache/stats")
+async def llm_cache_stats():
+	cache = get_llm_cache()
+	if cache is None:
+		return {"enabled": False}
+	return await asyncio.to_thread(cache.stats)
+
+
+@router.get("/summary_cascade/stats")
+async def summary_cascade_stats():
+	return cascade_stats().snapshot()
+
+
+@router.get("/llm_stages")
+async def llm_stages():
+	return {"stages": stage_models()}
+
+
+@router.delete("/llm_cache")
+async def llm_cache_clear():
+	cache = get_llm_cache()
+	if cache is not None:
+		await asyncio.to_thread(cache.clear)
+	return {"ok": True}
+
+
 @router.post("/process")
-async def process_resume(file: UploadFile = File(...)):
-	start = datetime.utcnow()
-	logger.info("process_resume: start filename=%s", file.filename)
-	if not file.filename.lower().endswith(".pdf"):
+async def process_resume(
+	file: Optional[UploadFile] = File(None),
+	upload_id: Optional[str] = Form(None),
+	template: Optional[str] = Form(None),
+	rehydrate_pii: Optional[bool] = Form(None),
+	bypass_cache: bool = False,
+):
+	if file is not None and not (file.filename or "").lower().endswith(".pdf"):
 		raise HTTPException(status_code=400, detail="Please upload a PDF file")
+	content = await file.read() if file is not None else None
+	filename = file.filename if file is not None else ""
+	result = await run_upload_pipeline(
+		content, filename, upload_id, bypass_cache=bypass_cache, template=template, rehydrate_pii=rehydrate_pii
+	)
+	return JSONResponse(result)
+
+
+async def run_upload_pipeline(
+	content: Optional[bytes],
+	filename: str,
+	upload_id: Optional[str] = None,
+	bypass_cache: bool = False,
+	reporter: Optional[RunReporter] = None,
+	template: Optional[str] = None,
+	rehydrate_pii: Optional[bool] = None,
+) -> dict:
+	"""Full upload flow: ingest → PII → extraction → enrichment → render.
+
+	`template` names the output template (see /templates); default when empty.
+	`rehydrate_pii` restores scrubbed contact details in the output (None: cfg.PII_REHYDRATE).
+	Raises HTTPException on failure; returns the artifact URLs on success.
+	"""
+	reporter = reporter or RunReporter()
+	resume_template = _resolve_template(template)
+	start = datetime.utcnow()
+	set_cache_bypass(bypass_cache)
+	logger.info("process_resume: start filename=%s upload_id=%s", filename, upload_id or "")
+
+	# 1) Ingest (reuses the extraction for previously seen bytes)
+	t0 = time.perf_counter()
+	res = await _ingest_upload(content, filename, upload_id)
+	raw_text = res.text
+	logger.info("ingest: extracted_chars=%d pages=%d", res.char_count, res.page_count)
 
 	# Create a run directory
 	stamp = start.strftime("%Y%m%d-%H%M%S")
@@ -186,29 +459,30 @@ async def process_resume(file: UploadFile = File(...)):
 	run_dir.mkdir(parents=True, exist_ok=True)
 	logger.info("process_resume: run_dir=%s", run_dir)
 
-	pdf_path = run_dir / file.filename
-	with pdf_path.open("wb") as f:
-		content = await file.read()
-		f.write(content)
-	logger.info("process_resume: saved_pdf bytes=%d", len(content))
+	await _copy_upload_to_run(res, run_dir)
+	logger.info("process_resume: saved_pdf bytes=%d", res.file_bytes)
 
-	# 1) Ingest
-	try:
-		raw_text = extract_text_from_pdf(pdf_path)
-		logger.info("ingest: extracted_chars=%d", len(raw_text))
-	except Exception as e:
-		logger.exception("ingest_failed")
-		raise HTTPException(status_code=500, detail=f"Ingest failed: {e}")
 	if not raw_text.strip():
 		raise HTTPException(status_code=422, detail="No text extracted from PDF. If scanned, OCR is needed.")
+	reporter.stage_done(
+		"ingest",
+		{"upload_id": res.upload_id, "char_count": res.char_count, "page_count": res.page_count, "truncated": res.truncated},
+		_elapsed_ms(t0),
+	)
 
 	# 2) PII scrub
+	t0 = time.perf_counter()
 	scrubbed_text, token_map = scrub_text(raw_text)
 	logger.info("pii: tokens=%d", len(token_map))
+	reporter.stage_done("pii", {"tokens": len(token_map)}, _elapsed_ms(t0))
+	# Split into typed sections once; every later stage reads the parts it needs
+	sections = segment_resume(scrubbed_text)
+	logger.info("sections: %s", ",".join(s.kind for s in sections.sections))
 
-	# 3) LLM extract to Skill Scope JSON
+	# 3) LLM extract to Skill Scope JSON (seniority starts once the work section is in)
+	t0 = time.perf_counter()
 	try:
-		ss_data = extract_to_json(scrubbed_text)
+		ss_data, level = await _extract_streaming(scrubbed_text, sections=sections)
 		logger.info("extraction: success")
 	except Exception as e:
 		logger.exception("extraction_failed")
@@ -216,24 +490,14 @@ async def process_resume(file: UploadFile = File(...)):
 
 	# Transform to internal schema
 	internal = _skill_scope_to_internal(ss_data)
-
-	# 3.1) Seniority inference for upload route
-	try:
-		level = infer_java_full_stack_seniority(ss_data.get("work", []), internal.get("experience", []))
-		if level:
-			base_title = internal.get("candidate_title", "Java Full Stack Developer") or "Java Full Stack Developer"
-			internal["candidate_title"] = f"{level} {base_title}".strip()
-			logger.info("seniority: %s", internal["candidate_title"])
-		else:
-			logger.info("seniority: inference returned empty; keeping default title")
-	except Exception:
-		logger.exception("seniority_infer_failed; keeping default title")
+	reporter.stage_done("extraction", internal, _elapsed_ms(t0))
 
 	# 4) Validate + normalize
 	try:
 		resume = Resume.model_validate(internal)
 		logger.info("validation: ok")
 	except Exception as e:
+		level.cancel()
 		logger.exception("validation_failed data=%s", json.dumps(internal)[:2000])
 		raise HTTPException(status_code=422, detail=f"JSON validation failed: {e}")
 
@@ -242,75 +506,62 @@ async def process_resume(file: UploadFile = File(...)):
 	normalized = normalize_resume_data(resume.model_dump())
 	normalized["honorific"] = honorific if honorific in {"Mr.", "Ms."} else "Mr."
 	logger.info("normalize: done skills=%d roles=%d", len(normalized.get("core_skills", [])), len(normalized.get("experience", [])))
+	reporter.stage_done("normalize", dict(normalized))
+
+	# 4.0) Seniority for upload route: prefix the inferred level onto the base title
+	async def seniority_stage(deps: dict) -> str:
+		base_title = normalized.get("candidate_title", "Java Full Stack Developer") or "Java Full Stack Developer"
+		if deps["level"]:
+			title = f"{deps['level']} {base_title}".strip()
+			logger.info("seniority: %s", title)
+			return title
+		logger.info("seniority: inference returned empty; keeping default title")
+		return normalized.get("candidate_title", "")
 
 	# 4.1) Summary handling: generate if missing; else polish
-	try:
-		if not normalized.get("summary") and normalized.get("candidate_name"):
-			gen = generate_intro_summary(
-				resume_text=scrubbed_text,
-				candidate_name=normalized.get("candidate_name", ""),
-				core_skills=normalized.get("core_skills", []),
-				experience=normalized.get("experience", []),
-				candidate_title=normalized.get("candidate_title", ""),
-			)
-			if gen:
-				normalized["summary"] = gen
-				logger.info("summary: generated new intro summary")
-		elif normalized.get("summary") and normalized.get("candidate_name"):
-			polished = polish_intro_summary(
-				normalized["summary"],
-				normalized["candidate_name"],
-				resume_context=scrubbed_text,
-				candidate_title=normalized.get("candidate_title", ""),
-				core_skills=normalized.get("core_skills", []),
-			)
-			if polished and polished != normalized["summary"]:
-				normalized["summary"] = polished
-				logger.info("summary: polished by LLM")
-		# Enforce SME wording in summary if title is SME
-		if normalized.get("candidate_title"):
-			updated = enforce_sme_in_summary(normalized.get("summary", ""), normalized["candidate_title"])
-			if updated != normalized.get("summary", ""):
-				normalized["summary"] = updated
-				logger.info("summary: SME wording enforced")
-	except Exception:
-		logger.exception("summary_polish_failed; continuing with original summary")
-
-	# 4.2) Skills: prefer candidate-listed skills; else organize extracted skills for role context
-	try:
-		candidate_listed = extract_candidate_skills_from_text(raw_text)
-		if candidate_listed:
-			normalized["core_skills"] = candidate_listed
-			logger.info("skills: using candidate-listed skills count=%d", len(candidate_listed))
-		else:
-			ordered = organize_skills_for_role(normalized.get("core_skills", []), normalized.get("experience", []), normalized.get("candidate_title", ""))
-			normalized["core_skills"] = ordered
-			logger.info("skills: organized for role count=%d", len(ordered))
-	except Exception:
-		logger.exception("skills_handling_failed; continuing with extracted skills as-is")
-
-	# 4.3) Harmonize bullets punctuation and tense via LLM (majority rule, minimal edits)
-	try:
-		roles_before = sum(len(r.get("bullets", [])) for r in normalized.get("experience", []))
-		normalized["experience"] = harmonize_bullets_across_resume(normalized.get("experience", []))
-		roles_after = sum(len(r.get("bullets", [])) for r in normalized.get("experience", []))
-		if roles_after == roles_before:
-			logger.info("bullets: harmonized punctuation/tense across %d bullets", roles_after)
-		else:
-			logger.warning("bullets: count mismatch before=%d after=%d", roles_before, roles_after)
-	except Exception:
-		logger.exception("bullets_harmonization_failed; continuing with original bullets")
+	async def summary_stage(deps: dict) -> str:
+		title = deps["seniority"]
+		summary = normalized.get("summary", "")
+		try:
+			if not summary and normalized.get("candidate_name"):
+				gen = await generate_intro_summary(
+					resume_digest=summary_context(normalized, title),
+					candidate_name=normalized.get("candidate_name", ""),
+					candidate_title=title,
+					on_token=lambda t: reporter.token("summary", t),
+					grounding=resume_corpus(normalized),
+					on_cascade=lambda info: reporter.metric("summary_cascade", info),
+				)
+				if gen:
+					summary = gen
+					logger.info("summary: generated new intro summary")
+			elif summary and normalized.get("candidate_name"):
+				polished = await polish_intro_summary(
+					summary,
+					normalized["candidate_name"],
+					resume_digest=summary_context(normalized, title),
+					candidate_title=title,
+					on_token=lambda t: reporter.token("summary", t),
+					grounding=resume_corpus(normalized),
+					on_cascade=lambda info: reporter.metric("summary_cascade", info),
+				)
+				if polished and polished != summary:
+					summary = polished
+					logger.info("summary: polished by LLM")
+			# Enforce SME wording in summary if title is SME
+			if title:
+				updated = enforce_sme_in_summary(summary, title)
+				if updated != summary:
+					summary = updated
+					logger.info("summary: SME wording enforced")
+		except Exception:
+			logger.exception("summary_polish_failed; continuing with original summary")
+		return summary
 
-	# 4.4) Conservative proofreading for summary and bullets (spelling/spacing/commas only)
-	try:
-		if normalized.get("summary"):
-			pf = proofread_summary_text(normalized["summary"])
-			if pf:
-				normalized["summary"] = pf
-			normalized["experience"] = proofread_bullets_across_resume(normalized.get("experience", []))
-			logger.info("proofread: applied to summary and bullets")
-	except Exception:
-		logger.exception("proofread_failed; continuing without proofreading")
+	stages = _enrichment_stages(normalized, sections, token_map, seniority_stage, summary_stage)
+	results = await run_stages(stages, inputs={"level": level}, on_stage_done=reporter.stage_done)
+	_apply_enrichment(normalized, results)
+	normalized = _restore_pii(normalized, token_map, rehydrate_pii)
 
 	# Persist JSON
 	json_path = run_dir / "resume.json"
@@ -318,55 +569,52 @@ async def process_resume(file: UploadFile = File(...)):
 	logger.info("persist: wrote_json=%s", json_path)
 
 	# 5) Render Markdown and DOCX
+	t0 = time.perf_counter()
 	try:
-		md_path, docx_path = render_markdown_and_docx(normalized, run_dir, REFERENCE_DOCX)
+		md_path, docx_path = await render_markdown_and_docx(normalized, run_dir, resume_template)
 		logger.info("render: md=%s docx=%s", md_path, docx_path)
 	except Exception as e:
 		logger.exception("render_failed")
 		raise HTTPException(status_code=500, detail=f"Render failed: {e}")
+	reporter.stage_done("render", {"docx": docx_path.name}, _elapsed_ms(t0))
 
 	duration_ms = int((datetime.utcnow() - start).total_seconds() * 1000)
 	logger.info("process_resume: complete duration_ms=%d", duration_ms)
-	return JSONResponse({
+	return {
 		"run_dir": str(run_dir),
 		"json_url": f"/files/{run_dir.name}/resume.json",
 		"markdown_url": f"/files/{run_dir.name}/{md_path.name}",
 		"docx_url": f"/files/{run_dir.name}/{docx_path.name}",
-		"reference_found": REFERENCE_DOCX.exists(),
+		"reference_found": resume_template.reference_docx.exists(),
 		"duration_ms": duration_ms,
-	})
+	}
 
 
 @router.post("/ingest")
-async def ingest_resume(file: UploadFile = File(...)):
+async def ingest_resume(file: Optional[UploadFile] = File(None), upload_id: Optional[str] = Form(None)):
 	"""
-	Upload a PDF, extract raw text, and create a run directory.
-	Returns: { run_dir, raw_text, char_count }
+	Upload a PDF (or pass the upload_id from /estimate), extract raw text, and create a run directory.
+	Returns: { run_dir, upload_id, raw_text, char_count, page_count, truncated }
+	truncated is set when RESUME_FORMATTER_PDF_MAX_PAGES/_MAX_CHARS cut the text short.
 	"""
-	if not file.filename.lower().endswith(".pdf"):
-		raise HTTPException(status_code=400, detail="Please upload a PDF file")
+	res = await _resolve_upload(file, upload_id)
+	raw_text = res.text
+	if not raw_text.strip():
+		raise HTTPException(status_code=422, detail="No text extracted from PDF. If scanned, OCR is needed.")
 
 	start = datetime.utcnow()
 	stamp = start.strftime("%Y%m%d-%H%M%S")
 	run_dir = OUTPUT_DIR / stamp
 	run_dir.mkdir(parents=True, exist_ok=True)
-
-	pdf_path = run_dir / file.filename
-	with pdf_path.open("wb") as f:
-		content = await file.read()
-		f.write(content)
-
-	try:
-		raw_text = extract_text_from_pdf(pdf_path)
-	except Exception as e:
-		raise HTTPException(status_code=500, detail=f"Ingest failed: {e}")
-	if not raw_text.strip():
-		raise HTTPException(status_code=422, detail="No text extracted from PDF. If scanned, OCR is needed.")
+	await _copy_upload_to_run(res, run_dir)
 
 	return JSONResponse({
 		"run_dir": str(run_dir),
+		"upload_id": res.upload_id,
 		"raw_text": raw_text,
 		"char_count": len(raw_text),
+		"page_count": res.page_count,
+		"truncated": res.truncated,
 	})
 
 
@@ -377,7 +625,19 @@ async def process_text(payload: dict):
 	- run_dir: string path created by /ingest
 	- text: cleaned text after user deletions
 	- candidate_name: optional override for final document
+	- bypass_cache: optional; skip cached LLM answers for this run
+	- template: optional output template name (see /templates)
+	- rehydrate_pii: optional; put scrubbed contact details back into the output
+	"""
+	return JSONResponse(await run_text_pipeline(payload))
+
+
+async def run_text_pipeline(payload: dict, reporter: Optional[RunReporter] = None) -> dict:
+	"""Reviewed-text flow (see /process_text): PII → extraction → enrichment → render.
+
+	Raises HTTPException on failure; returns the artifact URLs on success.
 	"""
+	reporter = reporter or RunReporter()
 	run_dir_str = (payload or {}).get("run_dir", "").strip()
 	text = (payload or {}).get("text", "")
 	candidate_name_override = (payload or {}).get("candidate_name", "").strip()
@@ -385,6 +645,10 @@ async def process_text(payload: dict):
 	exp_level = (payload or {}).get("experience_level", "").strip()
 	exp_custom = (payload or {}).get("experience_custom", "").strip()
 	honorific = (payload or {}).get("honorific", "Mr.").strip()
+	set_cache_bypass(bool((payload or {}).get("bypass_cache", False)))
+	resume_template = _resolve_template((payload or {}).get("template"))
+	rehydrate_pii = (payload or {}).get("rehydrate_pii")
+	rehydrate_pii = None if rehydrate_pii is None else bool(rehydrate_pii)
 
 	if not run_dir_str:
 		raise HTTPException(status_code=400, detail="run_dir is required")
@@ -399,12 +663,21 @@ async def process_text(payload: dict):
 		raise HTTPException(status_code=404, detail="run_dir not found")
 
 	# 1) PII scrub from the user-reviewed text (still apply conservative scrubbing)
+	t0 = time.perf_counter()
 	scrubbed_text, token_map = scrub_text(text)
 	logger.info("pii: tokens=%d", len(token_map))
-
-	# 2) LLM extract to Skill Scope JSON
+	reporter.stage_done("pii", {"tokens": len(token_map)}, _elapsed_ms(t0))
+	# Split into typed sections once; every later stage reads the parts it needs
+	sections = segment_resume(scrubbed_text)
+	logger.info("sections: %s", ",".join(s.kind for s in sections.sections))
+
+	# 2) LLM extract to Skill Scope JSON (seniority starts once the work section is in,
+	# unless the user chose the title or level)
+	t0 = time.perf_counter()
 	try:
-		ss_data = extract_to_json(scrubbed_text)
+		ss_data, level = await _extract_streaming(
+			scrubbed_text, infer_level=not (title_override or exp_level or exp_custom), sections=sections
+		)
 		logger.info("extraction: success")
 	except Exception as e:
 		logger.exception("extraction_failed")
@@ -412,6 +685,7 @@ async def process_text(payload: dict):
 
 	# Transform to internal schema
 	internal = _skill_scope_to_internal(ss_data)
+	reporter.stage_done("extraction", internal, _elapsed_ms(t0))
 
 	# Optional candidate name override
 	if candidate_name_override:
@@ -421,23 +695,12 @@ async def process_text(payload: dict):
 	if title_override:
 		internal["candidate_title"] = title_override
 
-	# 3.1) Seniority inference (skip if user provided title/level)
-	if not (title_override or exp_level or exp_custom):
-		try:
-			title = infer_java_full_stack_seniority(ss_data.get("work", []), internal.get("experience", []))
-			if title:
-				internal["candidate_title"] = title
-				logger.info("seniority: %s", internal["candidate_title"])
-			else:
-				logger.info("seniority: inference returned empty; keeping default title")
-		except Exception:
-			logger.exception("seniority_infer_failed; keeping default title")
-
 	# 4) Validate + normalize
 	try:
 		resume = Resume.model_validate(internal)
 		logger.info("validation: ok")
 	except Exception as e:
+		level.cancel()
 		logger.exception("validation_failed data=%s", json.dumps(internal)[:2000])
 		raise HTTPException(status_code=422, detail=f"JSON validation failed: {e}")
 
@@ -446,85 +709,66 @@ async def process_text(payload: dict):
 	if exp_level or exp_custom:
 		normalized["experience_level"] = (exp_custom or exp_level).strip()
 	logger.info("normalize: done skills=%d roles=%d", len(normalized.get("core_skills", [])), len(normalized.get("experience", [])))
+	reporter.stage_done("normalize", dict(normalized))
 
-	# 4.1) Summary handling: generate if missing; else polish
-	try:
-		if not normalized.get("summary") and normalized.get("candidate_name"):
-			lvl = (exp_custom or exp_level).strip() if (exp_custom or exp_level) else ""
-			title_for_prompt = normalized.get("candidate_title", "")
-			if lvl and lvl.lower() in {"senior", "sme"}:
-				title_for_prompt = f"{lvl} {title_for_prompt}".strip()
-			gen = generate_intro_summary(
-				resume_text=text,
-				candidate_name=normalized.get("candidate_name", ""),
-				core_skills=normalized.get("core_skills", []),
-				experience=normalized.get("experience", []),
-				candidate_title=title_for_prompt,
-			)
-			if gen:
-				last = (normalized.get("candidate_name", "").strip().split() or [""])[-1]
-				normalized["summary"] = f"{normalized.get('honorific','Mr.')} {last} is {gen.lstrip()}"
-				logger.info("summary: generated new intro summary")
-		elif normalized.get("summary") and normalized.get("candidate_name"):
-			lvl = (exp_custom or exp_level).strip() if (exp_custom or exp_level) else ""
-			title_for_prompt = normalized.get("candidate_title", "")
-			if lvl and lvl.lower() in {"senior", "sme"}:
-				title_for_prompt = f"{lvl} {title_for_prompt}".strip()
-			polished = polish_intro_summary(
-				normalized["summary"],
-				normalized["candidate_name"],
-				resume_context=text,
-				candidate_title=title_for_prompt,
-				core_skills=normalized.get("core_skills", []),
-			)
-			if polished and polished != normalized["summary"]:
-				last = (normalized.get("candidate_name", "").strip().split() or [""])[-1]
-				normalized["summary"] = f"{normalized.get('honorific','Mr.')} {last} is {polished.lstrip()}"
-				logger.info("summary: polished by LLM")
-		lvl = (exp_custom or exp_level).strip() if (exp_custom or exp_level) else ""
-		if lvl.lower() == "sme":
-			updated = enforce_sme_in_summary(normalized.get("summary", ""), "SME")
-			if updated != normalized.get("summary", ""):
-				normalized["summary"] = updated
-				logger.info("summary: SME wording enforced (explicit)")
-	except Exception:
-		logger.exception("summary_polish_failed; continuing with original summary")
+	lvl = (exp_custom or exp_level).strip() if (exp_custom or exp_level) else ""
 
-	# 4.2) Skills handling
-	try:
-		candidate_listed = extract_candidate_skills_from_text(text)
-		if candidate_listed:
-			normalized["core_skills"] = candidate_listed
-			logger.info("skills: using candidate-listed skills count=%d", len(candidate_listed))
-		else:
-			ordered = organize_skills_for_role(normalized.get("core_skills", []), normalized.get("experience", []), normalized.get("candidate_title", ""))
-			normalized["core_skills"] = ordered
-			logger.info("skills: organized for role count=%d", len(ordered))
-	except Exception:
-		logger.exception("skills_handling_failed; continuing with extracted skills as-is")
+	# 4.0) Seniority inference (skipped above if user provided title/level)
+	async def seniority_stage(deps: dict) -> str:
+		if title_override or exp_level or exp_custom:
+			return normalized.get("candidate_title", "")
+		if deps["level"]:
+			logger.info("seniority: %s", deps["level"])
+			return deps["level"]
+		logger.info("seniority: inference returned empty; keeping default title")
+		return normalized.get("candidate_title", "")
 
-	# 4.3) Harmonize bullets
-	try:
-		roles_before = sum(len(r.get("bullets", [])) for r in normalized.get("experience", []))
-		normalized["experience"] = harmonize_bullets_across_resume(normalized.get("experience", []))
-		roles_after = sum(len(r.get("bullets", [])) for r in normalized.get("experience", []))
-		if roles_after == roles_before:
-			logger.info("bullets: harmonized punctuation/tense across %d bullets", roles_after)
-		else:
-			logger.warning("bullets: count mismatch before=%d after=%d", roles_before, roles_after)
-	except Exception:
-		logger.exception("bullets_harmonization_failed; continuing with original bullets")
+	# 4.1) Summary handling: generate if missing; else polish
+	async def summary_stage(deps: dict) -> str:
+		summary = normalized.get("summary", "")
+		title_for_prompt = deps["seniority"]
+		if lvl and lvl.lower() in {"senior", "sme"}:
+			title_for_prompt = f"{lvl} {title_for_prompt}".strip()
+		last = (normalized.get("candidate_name", "").strip().split() or [""])[-1]
+		try:
+			if not summary and normalized.get("candidate_name"):
+				gen = await generate_intro_summary(
+					resume_digest=summary_context(normalized, title_for_prompt),
+					candidate_name=normalized.get("candidate_name", ""),
+					candidate_title=title_for_prompt,
+					on_token=lambda t: reporter.token("summary", t),
+					grounding=resume_corpus(normalized),
+					on_cascade=lambda info: reporter.metric("summary_cascade", info),
+				)
+				if gen:
+					summary = f"{normalized.get('honorific','Mr.')} {last} is {gen.lstrip()}"
+					logger.info("summary: generated new intro summary")
+			elif summary and normalized.get("candidate_name"):
+				polished = await polish_intro_summary(
+					summary,
+					normalized["candidate_name"],
+					resume_digest=summary_context(normalized, title_for_prompt),
+					candidate_title=title_for_prompt,
+					on_token=lambda t: reporter.token("summary", t),
+					grounding=resume_corpus(normalized),
+					on_cascade=lambda info: reporter.metric("summary_cascade", info),
+				)
+				if polished and polished != summary:
+					summary = f"{normalized.get('honorific','Mr.')} {last} is {polished.lstrip()}"
+					logger.info("summary: polished by LLM")
+			if lvl.lower() == "sme":
+				updated = enforce_sme_in_summary(summary, "SME")
+				if updated != summary:
+					summary = updated
+					logger.info("summary: SME wording enforced (explicit)")
+		except Exception:
+			logger.exception("summary_polish_failed; continuing with original summary")
+		return summary
 
-	# 4.4) Proofread
-	try:
-		if normalized.get("summary"):
-			pf = proofread_summary_text(normalized["summary"])
-			if pf:
-				normalized["summary"] = pf
-			normalized["experience"] = proofread_bullets_across_resume(normalized.get("experience", []))
-			logger.info("proofread: applied to summary and bullets")
-	except Exception:
-		logger.exception("proofread_failed; continuing without proofreading")
+	stages = _enrichment_stages(normalized, sections, token_map, seniority_stage, summary_stage)
+	results = await run_stages(stages, inputs={"level": level}, on_stage_done=reporter.stage_done)
+	_apply_enrichment(normalized, results)
+	normalized = _restore_pii(normalized, token_map, rehydrate_pii)
 
 	# Persist JSON
 	json_path = run_dir / "resume.json"
@@ -532,17 +776,19 @@ async def process_text(payload: dict):
 	logger.info("persist: wrote_json=%s", json_path)
 
 	# Render Markdown and DOCX
+	t0 = time.perf_counter()
 	try:
-		md_path, docx_path = render_markdown_and_docx(normalized, run_dir, REFERENCE_DOCX)
+		md_path, docx_path = await render_markdown_and_docx(normalized, run_dir, resume_template)
 		logger.info("render: md=%s docx=%s", md_path, docx_path)
 	except Exception as e:
 		logger.exception("render_failed")
 		raise HTTPException(status_code=500, detail=f"Render failed: {e}")
+	reporter.stage_done("render", {"docx": docx_path.name}, _elapsed_ms(t0))
 
-	return JSONResponse({
+	return {
 		"run_dir": str(run_dir),
 		"json_url": f"/files/{run_dir.name}/resume.json",
 		"markdown_url": f"/files/{run_dir.name}/{md_path.name}",
 		"docx_url": f"/files/{run_dir.name}/{docx_path.name}",
-		"reference_found": REFERENCE_DOCX.exists(),
-	})
+		"reference_found": resume_template.reference_docx.exists(),
+	}
@@ -0,0 +1,112 @@
+from typing import AsyncIterator, Optional
+import json
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from app.routers.convert import run_text_pipeline, run_upload_pipeline
+from app.services.jobs import Job, SUCCEEDED, FINISHED, get_job_manager
+
+router = APIRouter()
+
+
+def _get_job(job_id: str) -> Job:
+	job = get_job_manager().get(job_id)
+	if job is None:
+		raise HTTPException(status_code=404, detail="job not found")
+	return job
+
+
+@router.post("/jobs", status_code=202)
+async def submit_text_job(payload: dict):
+	"""
+	Queue the /process_text flow in the background. Same payload as /process_text.
+	Returns immediately with a job_id to poll.
+	"""
+	if not (payload or {}).get("run_dir", "").strip():
+		raise HTTPException(status_code=400, detail="run_dir is required")
+	if not (payload or {}).get("text", "").strip():
+		raise HTTPException(status_code=400, detail="text is required")
+	job = get_job_manager().submit("text", lambda j: run_text_pipeline(payload, reporter=j))
+	return job.to_dict()
+
+
+@router.post("/jobs/upload", status_code=202)
+async def submit_upload_job(
+	file: Optional[UploadFile] = File(None),
+	upload_id: Optional[str] = Form(None),
+	template: Optional[str] = Form(None),
+	rehydrate_pii: Optional[bool] = Form(None),
+	bypass_cache: bool = False,
+):
+	"""Queue the /process flow (PDF upload or upload_id from /estimate) in the background."""
+	if file is None and not upload_id:
+		raise HTTPException(status_code=400, detail="Please upload a PDF file")
+	if file is not None and not (file.filename or "").lower().endswith(".pdf"):
+		raise HTTPException(status_code=400, detail="Please upload a PDF file")
+	# Read now: the upload is closed once this request returns
+	content = await file.read() if file is not None else None
+	filename = file.filename if file is not None else ""
+	job = get_job_manager().submit(
+		"upload",
+		lambda j: run_upload_pipeline(
+			content, filename, upload_id, bypass_cache=bypass_cache, reporter=j, template=template, rehydrate_pii=rehydrate_pii
+		),
+	)
+	return job.to_dict()
+
+
+@router.get("/jobs/{job_id}")
+async def job_status(job_id: str):
+	return _get_job(job_id).to_dict()
+
+
+@router.post("/jobs/{job_id}/cancel")
+async def cancel_job(job_id: str):
+	job = get_job_manager().cancel(job_id)
+	if job is None:
+		raise HTTPException(status_code=404, detail="job not found")
+	return job.to_dict()
+
+
+@router.get("/jobs/{job_id}/result")
+async def job_result(job_id: str):
+	job = _get_job(job_id)
+	if job.status not in FINISHED:
+		raise HTTPException(status_code=409, detail=f"job is {job.status}")
+	if job.status != SUCCEEDED:
+		return JSONResponse(job.to_dict(), status_code=job.error_status if job.error else 410)
+	return job.result
+
+
+async def _sse_events(request: Request, job: Job, after: int) -> AsyncIterator[str]:
+	sent = after
+	while True:
+		for ev in job.events_after(sent):
+			sent = ev["id"]
+			yield f"id: {ev['id']}\nevent: {ev['event']}\ndata: {json.dumps(ev['data'], default=str)}\n\n"
+		if job.status in FINISHED and sent + 1 >= job.event_count:
+			return
+		if await request.is_disconnected():
+			return
+		if not await job.wait_for_events(sent + 1, timeout_s=15):
+			yield ": keepalive\n\n"
+
+
+@router.get("/jobs/{job_id}/events")
+async def job_events(job_id: str, request: Request):
+	"""
+	Server-Sent Events for a job: 'stage' as each stage finishes (with a preview of its output),
+	'token' for streamed summary text, 'metric' for per-run measurements (the summary cascade
+	outcome), and a final 'status'. Reconnects resume via Last-Event-ID. Once the job has
+	finished, token events and stage previews are no longer replayed.
+	"""
+	job = _get_job(job_id)
+	try:
+		after = int(request.headers.get("last-event-id", "-1"))
+	except ValueError:
+		after = -1
+	return StreamingResponse(
+		_sse_events(request, job, after),
+		media_type="text/event-stream",
+		headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+	)
@@ -2,16 +2,11 @@ from __future__ import annotations
 from typing import List, Dict, Any, Optional, Tuple
 import logging
 import json
-from app.services.llm import get_openai_client
+from app.services.llm import chat_completion
+from app.services.proofread import proofread_bullets_across_resume
 
 logger = logging.getLogger(__name__)
 
-MODEL = "gpt-4o-mini"
-
-
-def _get_client():
-    return get_openai_client()
-
 
 SYSTEM_INSTRUCTIONS = (
     "You are a precise copy editor. You will receive a list of resume bullet points.\n"
@@ -28,7 +23,7 @@ SYSTEM_INSTRUCTIONS = (
 )
 
 
-def harmonize_bullets_across_resume(experience: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+async def harmonize_bullets_across_resume(experience: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """Apply consistent punctuation and tense to all bullets across the resume using LLM majority rule.
 
     Returns a new experience list with bullets minimally edited. On failure, returns the input unchanged.
@@ -44,7 +39,6 @@ def harmonize_bullets_across_resume(experience: List[Dict[str, Any]]) -> List[Di
     if not flat:
         return experience
 
-    client = _get_client()
     user = (
         "Here are the bullets in order as a JSON array. Decide majority punctuation and tense, then minimally edit all to match.\n"
         f"Bullets: {json.dumps(flat, ensure_ascii=False)}\n"
@@ -52,8 +46,8 @@ def harmonize_bullets_across_resume(experience: List[Dict[str, Any]]) -> List[Di
     )
 
     try:
-        resp = client.chat.completions.create(
-            model=MODEL,
+        content = await chat_completion(
+            stage="bullets",
             response_format={"type": "json_object"},
             messages=[
                 {"role": "system", "content": SYSTEM_INSTRUCTIONS},
@@ -61,14 +55,14 @@ def harmonize_bullets_across_resume(experience: List[Dict[str, Any]]) -> List[Di
             ],
             temperature=0,
         )
-        content = resp.choices[0].message.content or "{}"
+        content = content or "{}"
         obj = json.loads(content)
         updated = obj.get("bullets") if isinstance(obj, dict) else None
         if not isinstance(updated, list) or len(updated) != len(flat):
             logger.warning("harmonize_bullets_across_resume: unexpected response; leaving bullets unchanged")
             return experience
         # Rebuild experience with updated bullets
-        new_experience = [dict(r) for r in experience]
+        new_experience = [dict(r, bullets=list(r.get("bullets") or [])) for r in experience]
         for (ri, bi), text in zip(index_map, updated):
             try:
                 new_experience[ri]["bullets"][bi] = str(text)
@@ -81,3 +75,80 @@ def harmonize_bullets_across_resume(experience: List[Dict[str, Any]]) -> List[Di
         return experience
 
 
+FUSED_INSTRUCTIONS = (
+    "You are a precise copy editor and conservative proofreader. You will receive a list of resume bullet points.\n"
+    "Step 1 - decide BOTH of the following using majority rule across the bullets:\n"
+    "(A) Punctuation style: whether bullets should end with a period (.) or not.\n"
+    "(B) Verb tense: whether bullets should be in past or present tense.\n"
+    "Step 2 - minimally edit ALL bullets to conform to the chosen punctuation and tense.\n"
+    "Step 3 - in the same pass, fix ONLY obvious spelling errors and spacing/comma issues.\n"
+    "Rules:\n"
+    "1) MINIMAL edits only. Do not reword, reorder, merge, split, or add content.\n"
+    "2) If a bullet lacks a clear leading verb, leave wording except for trailing period consistency and clear typos.\n"
+    "3) Preserve numbers, proper nouns, acronyms, product names, technical terms, and capitalization exactly.\n"
+    "4) Spacing/comma fixes allowed: remove double spaces, add single space after commas/periods, remove spaces before commas/periods, collapse doubled commas, fix missing space after periods mid-line.\n"
+    "5) If a bullet already matches the chosen style/tense and has no typos, leave it unchanged.\n"
+    "6) Return ONLY valid JSON in the shape: {\"punctuation\": \"period\"|\"none\", \"tense\": \"past\"|\"present\", \"bullets\": [list of strings in input order]}.\n"
+)
+
+
+async def harmonize_and_proofread_bullets(experience: List[Dict[str, Any]]) -> Optional[List[Dict[str, Any]]]:
+    """Single LLM pass doing the work of harmonize_bullets_across_resume + proofread_bullets_across_resume.
+
+    Returns the new experience list, or None when the response fails validation
+    (wrong length, non-string or emptied bullets) so the caller can fall back to two passes.
+    """
+    index_map: List[Tuple[int, int]] = []
+    flat: List[str] = []
+    for ri, role in enumerate(experience or []):
+        for bi, b in enumerate(role.get("bullets", []) or []):
+            index_map.append((ri, bi))
+            flat.append(str(b or "").strip())
+
+    if not flat:
+        return experience
+
+    user = (
+        "Here are the bullets in order as a JSON array. Decide majority punctuation and tense, minimally edit all to match, "
+        "and fix only obvious spelling and spacing/comma errors.\n"
+        f"Bullets: {json.dumps(flat, ensure_ascii=False)}\n"
+        "Return JSON object with keys 'punctuation', 'tense', and 'bullets' (same length/order)."
+    )
+
+    try:
+        content = await chat_completion(
+            stage="bullets",
+            response_format={"type": "json_object"},
+            messages=[
+                {"role": "system", "content": FUSED_INSTRUCTIONS},
+                {"role": "user", "content": user},
+            ],
+            temperature=0,
+        )
+        obj = json.loads(content or "{}")
+    except Exception:
+        logger.exception("harmonize_and_proofread_bullets: LLM call failed")
+        return None
+
+    updated = obj.get("bullets") if isinstance(obj, dict) else None
+    if not isinstance(updated, list) or len(updated) != len(flat):
+        logger.warning("harmonize_and_proofread_bullets: length mismatch; rejecting fused result")
+        return None
+    if any(not isinstance(t, str) or (src and not t.strip()) for src, t in zip(flat, updated)):
+        logger.warning("harmonize_and_proofread_bullets: invalid bullet in response; rejecting fused result")
+        return None
+
+    new_experience = [dict(r, bullets=list(r.get("bullets") or [])) for r in experience]
+    for (ri, bi), text in zip(index_map, updated):
+        new_experience[ri]["bullets"][bi] = text
+    return new_experience
+
+
+async def polish_bullets_across_resume(experience: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Harmonize and proofread bullets in one fused call, falling back to the two-pass path."""
+    fused = await harmonize_and_proofread_bullets(experience)
+    if fused is not None:
+        return fused
+    logger.info("bullets: fused pass rejected; falling back to harmonize + proofread")
+    harmonized = await harmonize_bullets_across_resume(experience)
+    return await proofread_bullets_across_resume(harmonized)
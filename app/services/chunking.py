@@ -0,0 +1,72 @@
+from __future__ import annotations
+from typing import List, Optional
+from app.services.sections import BULLET_RE, is_role_date_line, section_kind
+
+
+def heading_kind(line: str) -> Optional[str]:
+	"""'experience', 'other' or None for a line that is (or is not) a section heading."""
+	s = line.strip()
+	if not s or len(s) > 40:
+		return None
+	kind = section_kind(s)
+	if kind is None:
+		return None
+	return "experience" if kind == "experience" else "other"
+
+
+def _is_role_header_line(line: str) -> bool:
+	s = line.strip()
+	return bool(s) and len(s) <= 80 and not BULLET_RE.match(s) and not s.endswith(".") and heading_kind(s) is None
+
+
+def split_resume_for_extraction(text: str, max_chars: int) -> List[str]:
+	"""Split resume text at section and role boundaries.
+
+	Returns [head, roles_1, roles_2, ...]: head holds everything outside the work
+	history (contact, summary, skills, education, ...); each following chunk holds whole
+	roles in document order, packed up to `max_chars`. Returns [text] when fewer than
+	two roles can be told apart.
+	"""
+	lines = text.splitlines(keepends=True)
+	region_start = 0
+	for i, line in enumerate(lines):
+		if heading_kind(line) == "experience":
+			region_start = i + 1
+			break
+
+	date_lines = [i for i in range(region_start, len(lines)) if is_role_date_line(lines[i])]
+	if len(date_lines) < 2:
+		return [text]
+
+	# The work history ends at the first non-experience heading after the first role
+	region_end = len(lines)
+	for i in range(date_lines[0], len(lines)):
+		if heading_kind(lines[i]) == "other":
+			region_end = i
+			break
+	date_lines = [i for i in date_lines if i < region_end]
+	if len(date_lines) < 2:
+		return [text]
+
+	# A role starts up to two company/title lines above its date line
+	starts: List[int] = []
+	for i in date_lines:
+		floor = starts[-1] + 1 if starts else region_start
+		start = i
+		while start > floor and i - start < 2 and _is_role_header_line(lines[start - 1]):
+			start -= 1
+		starts.append(start)
+
+	head = "".join(lines[: starts[0]] + lines[region_end:])
+	roles = ["".join(lines[a:b]) for a, b in zip(starts, starts[1:] + [region_end])]
+
+	chunks: List[str] = []
+	current = ""
+	for role in roles:
+		if current and len(current) + len(role) > max_chars:
+			chunks.append(current)
+			current = ""
+		current += role
+	if current:
+		chunks.append(current)
+	return [head] + chunks
@@ -0,0 +1,148 @@
+from __future__ import annotations
+from functools import lru_cache
+from typing import Optional, Tuple, Union
+import re
+
+MONTH_NAMES = (
+	"january", "february", "march", "april", "may", "june",
+	"july", "august", "september", "october", "november", "december",
+)
+# Full names and every prefix of 3+ letters ("sep", "sept", "janu"), lower-case
+MONTHS = {
+	name[:n]: i
+	for i, name in enumerate(MONTH_NAMES, start=1)
+	for n in range(3, len(name) + 1)
+}
+
+PRESENT_TERMS = {
+	"present", "current", "now", "till now", "till date", "to date",
+	"until now", "till present", "ongoing"
+}
+
+PRESENT = "Present"
+
+# One anchored alternation over the shapes extraction produces; the branch that
+# matched picks the conversion
+_DATE_RE = re.compile(
+	r"""^(?:
+		(?P<iso_y>\d{4})[-/](?P<iso_m>\d{1,2})(?:[-/]\d{1,2})?      # 2019-03, 2019/3, 2019-03-01
+		| (?P<my_m>\d{1,2})[-/](?P<my_y>\d{4}|\d{2})               # 03/2019, 3-2019, 03/19
+		| (?P<mon>[a-z]{3,9})\.?[\s,'-]*(?P<mon_y>\d{4})             # Mar 2019, march, 2019, Sept. 2019
+		| (?P<mon_y2>\d{4})[\s,-]*(?P<mon2>[a-z]{3,9})\.?            # 2019 March
+		| (?P<year>\d{4})                                            # 2019
+	)$""",
+	re.VERBOSE,
+)
+# Last resort: a month name and a four-digit year anywhere in the string
+_LOOSE_MONTH_RE = re.compile(
+	r"(?<![a-z])(jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?"
+	r"|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)(?![a-z])"
+)
+_YEAR_RE = re.compile(r"(?<!\d)(\d{4})(?!\d)")
+
+# Separators between the two halves of "Jan 2019 – Present"; a bare hyphen is only
+# accepted where both sides parse (see split_date_range)
+_RANGE_SEP_RE = re.compile(r"\s*(?:[–—]|--?|\bto\b|\bthrough\b|\bthru\b|\buntil\b|\btill\b)\s*", re.IGNORECASE)
+_ISO_HEAD_RE = re.compile(r"\d{4}(?:-\d{1,2})?")
+_ISO_PIECE_RE = re.compile(r"\d{1,2}(?:-\d{1,2})?(?!\d)")
+_PRESENT_TAILS = {"date", "now", "present", "current", "today"}
+
+YearMonth = Tuple[int, int]
+
+
+def _clamp_month(mm: int) -> int:
+	return 1 if mm < 1 else 12 if mm > 12 else mm
+
+
+@lru_cache(maxsize=65536)
+def _parse(s: str) -> Union[YearMonth, str, None]:
+	"""(year, month), PRESENT, or None. Memoized: archives repeat the same strings a lot."""
+	low = s.strip().lower()
+	if not low:
+		return None
+	if low in PRESENT_TERMS:
+		return PRESENT
+	clean = low[:-1] if low[-1] in ".," else low
+	m = _DATE_RE.match(clean)
+	if m:
+		kind = m.lastgroup
+		if kind == "iso_m":
+			return int(m.group("iso_y")), _clamp_month(int(m.group("iso_m")))
+		if kind == "my_y":
+			y = m.group("my_y")
+			yyyy = int(y) if len(y) == 4 else (2000 + int(y) if int(y) < 50 else 1900 + int(y))
+			return yyyy, _clamp_month(int(m.group("my_m")))
+		if kind == "mon_y" and m.group("mon") in MONTHS:
+			return int(m.group("mon_y")), MONTHS[m.group("mon")]
+		if kind == "mon2" and m.group("mon2") in MONTHS:
+			return int(m.group("mon_y2")), MONTHS[m.group("mon2")]
+		if kind == "year":
+			return int(m.group("year")), 1
+	mon = _LOOSE_MONTH_RE.search(clean)
+	if mon:
+		y = _YEAR_RE.search(clean)
+		if y:
+			return int(y.group(1)), MONTHS[mon.group(1)]
+	if "present" in low:
+		return PRESENT
+	return None
+
+
+def parse_year_month(s: str) -> Optional[YearMonth]:
+	"""(year, month) for a single date string; None for "Present" or anything unparseable."""
+	parsed = _parse(s or "")
+	return parsed if isinstance(parsed, tuple) else None
+
+
+def norm_date(s: str) -> str:
+	"""A resume date as "MM/YYYY" or "Present"; unparseable input is returned stripped.
+	A bare year means January.
+	"""
+	s = (s or "").strip()
+	parsed = _parse(s)
+	if parsed is None:
+		return s
+	if parsed == PRESENT:
+		return PRESENT
+	return f"{parsed[1]:02d}/{parsed[0]}"
+
+
+def iso_month(s: str) -> str:
+	"""Like norm_date but "YYYY-MM" (the internal schema's format)."""
+	s = (s or "").strip()
+	parsed = _parse(s)
+	if parsed is None:
+		return s
+	if parsed == PRESENT:
+		return PRESENT
+	return f"{parsed[0]}-{parsed[1]:02d}"
+
+
+def _is_single_date(s: str) -> bool:
+	low = s.lower()
+	if low in PRESENT_TERMS:
+		return True
+	clean = low[:-1] if low and low[-1] in ".," else low
+	return _DATE_RE.match(clean) is not None
+
+
+def split_date_range(s: str) -> Optional[Tuple[str, str]]:
+	"""Split "Jan 2019 – Present", "03/2017 - 12/2018" or "2015 to date" into its two
+	date strings (unnormalized). None unless both halves parse, and None for a single
+	date in one of the exact formats ("2019-03-01" is not 2019 to March 2001).
+	"""
+	s = (s or "").strip()
+	if _is_single_date(s):
+		return None
+	for sep in _RANGE_SEP_RE.finditer(s):
+		start, end = s[: sep.start()], s[sep.end():]
+		if not start or not end or _parse(start) in (None, PRESENT):
+			continue
+		# A bare hyphen after "2019" or "2019-03" and before month/day digits is inside an ISO date
+		if sep.group(0) == "-" and _ISO_HEAD_RE.fullmatch(start) and _ISO_PIECE_RE.match(end):
+			continue
+		if end.lower().rstrip(".") in _PRESENT_TAILS:
+			return start, PRESENT
+		if _parse(end) is not None:
+			return start, end
+	return None
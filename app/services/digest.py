@@ -0,0 +1,257 @@
+from __future__ import annotations
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+import re
+import app.config as cfg
+from app.services.dates import parse_year_month
+
+logger = logging.getLogger(__name__)
+
+STRATEGIES = ("recent", "balanced", "tail")
+
+# Industry domains and the words that suggest them in company names, titles and bullets
+# (words common in tech bullets, like "streaming" or "warehouse", are left out)
+DOMAINS = {
+	"finance": ("bank", "banking", "financial", "finance", "fintech", "trading", "payments", "brokerage", "investment", "wealth", "credit card", "lending", "mortgage"),
+	"insurance": ("insurance", "insurer", "claims", "underwriting", "actuarial"),
+	"healthcare": ("healthcare", "health care", "hospital", "clinical", "patient", "hipaa", "medical", "pharma", "pharmaceutical", "ehr"),
+	"telecommunications": ("telecom", "telecommunications", "wireless", "5g", "carrier network"),
+	"retail and e-commerce": ("retail", "e-commerce", "ecommerce", "online store", "point of sale", "merchandising"),
+	"hospitality": ("hospitality", "hotel", "hotels", "travel", "airline", "reservations"),
+	"government": ("government", "federal", "public sector", "dod", "department of defense", "state agency"),
+	"logistics": ("logistics", "supply chain", "shipping", "freight", "fleet"),
+	"energy": ("energy", "utilities", "oil and gas", "power grid"),
+	"education": ("edtech", "university", "learning management"),
+	"media": ("broadcast", "broadcasting", "advertising", "adtech", "video on demand"),
+	"automotive": ("automotive", "vehicle", "connected car"),
+}
+_DOMAIN_RE = re.compile(
+	"|".join(
+		f"(?P<d{i}>(?<![a-z0-9])(?:{'|'.join(re.escape(w) for w in words)})(?![a-z0-9]))"
+		for i, words in enumerate(DOMAINS.values())
+	)
+)
+_DOMAIN_NAMES = list(DOMAINS)
+
+
+def estimate_tokens(text: str) -> int:
+	"""Rough token count (about 4 characters per token, as /estimate assumes)."""
+	return (len(text) + 3) // 4
+
+
+@dataclass
+class _Role:
+	header: str
+	bullets: List[str] = field(default_factory=list)
+
+
+@dataclass
+class ResumeDigest:
+	"""Structured facts for the summary prompts, rendered to fit a token budget."""
+	title: str
+	years: Optional[int]
+	since: Optional[int]
+	roles: List[_Role]
+	technologies: List[Tuple[str, int]]
+	domains: List[str]
+	certifications: List[str]
+	clearances: List[str]
+
+	def render(
+		self,
+		max_roles: Optional[int] = None,
+		bullet_roles: Optional[int] = None,
+		bullets_per_role: Optional[int] = None,
+		max_technologies: Optional[int] = None,
+	) -> str:
+		lines: List[str] = []
+		if self.title:
+			lines.append(f"Target title: {self.title}")
+		if self.years is not None:
+			lines.append(f"Experience: {self.years}+ years (since {self.since})")
+		roles = self.roles if max_roles is None else self.roles[:max_roles]
+		if roles:
+			lines.append("Roles (most recent first):")
+			for i, role in enumerate(roles):
+				lines.append(f"- {role.header}")
+				if bullet_roles is None or i < bullet_roles:
+					bullets = role.bullets if bullets_per_role is None else role.bullets[:bullets_per_role]
+					lines.extend(f"  * {b}" for b in bullets)
+		techs = self.technologies if max_technologies is None else self.technologies[:max_technologies]
+		if techs:
+			lines.append("Top technologies (mentions): " + ", ".join(f"{n} ({c})" if c else n for n, c in techs))
+		if self.domains:
+			lines.append("Domains: " + ", ".join(self.domains))
+		if self.certifications:
+			lines.append("Certifications: " + "; ".join(self.certifications))
+		if self.clearances:
+			lines.append("Clearances: " + "; ".join(self.clearances))
+		return "\n".join(lines)
+
+	def fit(self, budget: int, strategy: str = "recent") -> str:
+		"""Render within `budget` tokens.
+
+		recent: drop bullets from the oldest roles first (keeping the latest role's), then
+		the least-mentioned technologies, then the oldest roles.
+		balanced: trim bullets per role, roles and technologies a step at a time together.
+		tail: render everything and cut whole lines from the end.
+		Whatever the strategy, the result is finally cut to the budget.
+		"""
+		text = self.render()
+		if estimate_tokens(text) <= budget:
+			return text
+		if strategy == "recent":
+			text = self._fit_recent(budget)
+		elif strategy == "balanced":
+			text = self._fit_balanced(budget)
+		return _cut_lines(text, budget)
+
+	def _fit_recent(self, budget: int) -> str:
+		text = self.render()
+		for params in self._recent_steps():
+			text = self.render(**params)
+			if estimate_tokens(text) <= budget:
+				break
+		return text
+
+	def _recent_steps(self):
+		n, techs = len(self.roles), len(self.technologies)
+		# bullets of the oldest roles, down to the most recent role's
+		for bullet_roles in range(n - 1, 0, -1):
+			yield {"bullet_roles": bullet_roles}
+		# the least-mentioned technologies, down to 15
+		while techs > 15:
+			techs = max(15, techs - 5)
+			yield {"bullet_roles": 1, "max_technologies": techs}
+		# the oldest roles, then the last bullets
+		for max_roles in range(n - 1, 0, -1):
+			yield {"max_roles": max_roles, "bullet_roles": 1, "max_technologies": techs}
+		yield {"max_roles": 1, "bullet_roles": 0, "max_technologies": techs}
+
+	def _fit_balanced(self, budget: int) -> str:
+		bullets = max((len(r.bullets) for r in self.roles), default=0)
+		roles, techs = len(self.roles), len(self.technologies)
+		text = self.render()
+		while bullets or roles > 1 or techs > 10:
+			bullets, roles, techs = max(0, bullets - 1), max(1, roles - 1), max(10, techs - 5)
+			text = self.render(max_roles=roles, bullets_per_role=bullets, max_technologies=techs)
+			if estimate_tokens(text) <= budget:
+				break
+		return text
+
+
+def _cut_lines(text: str, budget: int) -> str:
+	if estimate_tokens(text) <= budget:
+		return text
+	limit = budget * 4
+	cut = text[:limit]
+	nl = cut.rfind("\n")
+	return cut[:nl] if nl > 0 else cut
+
+
+def _clip(s: str, limit: int) -> str:
+	s = " ".join(str(s or "").split())
+	return s if len(s) <= limit else s[: limit - 1].rstrip() + "…"
+
+
+def _span(start: str, end: str, today: date) -> Tuple[Optional[Tuple[int, int]], str]:
+	begin = parse_year_month(start)
+	if begin is None:
+		return None, ""
+	finish = parse_year_month(end) or (today.year, today.month)
+	months = max(0, (finish[0] - begin[0]) * 12 + finish[1] - begin[1])
+	years, rest = divmod(months, 12)
+	if years and rest:
+		return begin, f"{years}y {rest}m"
+	return begin, f"{years}y" if years else f"{rest}m"
+
+
+def _technologies(skills: List[str], corpus: str) -> List[Tuple[str, int]]:
+	"""Skills by how often the experience text mentions them (ties keep the listed order)."""
+	names: Dict[str, str] = {}
+	for s in skills:
+		s = str(s).strip()
+		if s and s.lower() not in names:
+			names[s.lower()] = s
+	if not names:
+		return []
+	counts: Counter = Counter()
+	if corpus:
+		pattern = re.compile(
+			"(?<![a-z0-9])(?:" + "|".join(re.escape(k) for k in sorted(names, key=len, reverse=True)) + ")(?![a-z0-9+#])"
+		)
+		counts.update(m.group(0) for m in pattern.finditer(corpus))
+	order = {k: i for i, k in enumerate(names)}
+	ranked = sorted(names, key=lambda k: (-counts[k], order[k]))
+	return [(names[k], counts[k]) for k in ranked]
+
+
+def _domains(corpus: str) -> List[str]:
+	counts: Counter = Counter(m.lastgroup for m in _DOMAIN_RE.finditer(corpus))
+	return [_DOMAIN_NAMES[int(g[1:])] for g, _ in counts.most_common()]
+
+
+def build_resume_digest(data: Dict[str, Any], candidate_title: str = "", today: Optional[date] = None) -> ResumeDigest:
+	"""Digest of a normalized resume (internal schema): roles with date spans, skills
+	ranked by mentions in the experience, industry domains, certifications, clearances."""
+	today = today or date.today()
+	roles: List[_Role] = []
+	starts: List[Tuple[int, int]] = []
+	corpus_parts: List[str] = [str(data.get("summary", ""))]
+	for r in data.get("experience", []) or []:
+		begin, span = _span(str(r.get("start_date", "")), str(r.get("end_date", "")), today)
+		if begin:
+			starts.append(begin)
+		period = f"{r.get('start_date', '')}–{r.get('end_date', '')}".strip("–")
+		header = ", ".join(p for p in (str(r.get("role", "")).strip(), str(r.get("company", "")).strip()) if p)
+		if period:
+			header += f" ({period}{', ' + span if span else ''})"
+		bullets = [_clip(b, cfg.SUMMARY_DIGEST_BULLET_CHARS) for b in (r.get("bullets") or []) if str(b).strip()]
+		if r.get("summary"):
+			bullets.insert(0, _clip(r["summary"], cfg.SUMMARY_DIGEST_BULLET_CHARS))
+		roles.append(_Role(header, bullets[: cfg.SUMMARY_DIGEST_BULLETS]))
+		corpus_parts.extend([str(r.get("company", "")), str(r.get("role", "")), str(r.get("summary", ""))])
+		corpus_parts.extend(str(b) for b in r.get("bullets") or [])
+	corpus = "\n".join(corpus_parts).lower()
+
+	since = min(starts) if starts else None
+	years = None
+	if since:
+		years = max(0, (today.year - since[0]) * 12 + today.month - since[1]) // 12
+	return ResumeDigest(
+		title=candidate_title or str(data.get("candidate_title", "")),
+		years=years,
+		since=since[0] if since else None,
+		roles=roles,
+		technologies=_technologies(list(data.get("core_skills", []) or []), corpus),
+		domains=_domains(corpus),
+		certifications=[str(c) for c in data.get("certifications", []) or [] if str(c).strip()],
+		clearances=[str(c) for c in data.get("clearances", []) or [] if str(c).strip()],
+	)
+
+
+def summary_context(data: Dict[str, Any], candidate_title: str = "") -> str:
+	"""The digest text for the summary prompts, within RESUME_FORMATTER_SUMMARY_DIGEST_TOKENS."""
+	strategy = cfg.SUMMARY_DIGEST_STRATEGY if cfg.SUMMARY_DIGEST_STRATEGY in STRATEGIES else "recent"
+	digest = build_resume_digest(data, candidate_title)
+	text = digest.fit(cfg.SUMMARY_DIGEST_TOKENS, strategy)
+	logger.info(
+		"digest: roles=%d techs=%d domains=%d tokens~%d strategy=%s",
+		len(digest.roles), len(digest.technologies), len(digest.domains), estimate_tokens(text), strategy,
+	)
+	return text
+
+
+def resume_corpus(data: Dict[str, Any]) -> str:
+	"""Lower-cased text of everything a summary may draw on: the current summary, skills,
+	experience and certifications (the digest can leave some of it out to fit its budget)."""
+	parts: List[str] = [str(data.get("summary", "")), str(data.get("candidate_title", ""))]
+	parts.extend(str(s) for s in data.get("core_skills", []) or [])
+	for r in data.get("experience", []) or []:
+		parts.extend([str(r.get("company", "")), str(r.get("role", "")), str(r.get("summary", ""))])
+		parts.extend(str(b) for b in r.get("bullets") or [])
+	parts.extend(str(c) for c in data.get("certifications", []) or [])
+	return "\n".join(parts).lower()
@@ -0,0 +1,109 @@
+from __future__ import annotations
+from pathlib import Path
+from typing import Any, Dict, Optional
+import io
+import docx
+from docx.enum.style import WD_STYLE_TYPE
+from docx.enum.text import WD_TAB_ALIGNMENT
+from docx.enum.text import WD_LINE_SPACING
+from docx.oxml.ns import qn
+from docx.shared import Pt
+from app.services.reference_template import get_reference_template
+from app.services.styles import load_style_names
+
+NBSP = "\u00a0"
+
+
+class _Writer:
+	"""Appends styled paragraphs to a document body emptied of the template's sample content."""
+
+	def __init__(self, doc) -> None:
+		self.doc = doc
+		self._known = {s.name for s in doc.styles if s.type == WD_STYLE_TYPE.PARAGRAPH}
+		body = doc.element.body
+		for child in list(body):
+			if child.tag != qn("w:sectPr"):
+				body.remove(child)
+
+	def _style(self, name: str) -> str:
+		# Same as pandoc for an unknown custom-style: add it, based on Normal
+		if name not in self._known:
+			style = self.doc.styles.add_style(name, WD_STYLE_TYPE.PARAGRAPH)
+			style.base_style = self.doc.styles["Normal"]
+			self._known.add(name)
+		return name
+
+	def para(self, text: str, style: str):
+		return self.doc.add_paragraph(text, style=self._style(style))
+
+
+def build_resume_docx(data: Dict[str, Any], reference_docx: Path, out_path: Path, styles: Optional[Dict[str, str]] = None) -> Path:
+	"""Build the final resume DOCX straight from the normalized resume dict.
+
+	Produces the same paragraphs as resume.md.j2 + pandoc + the legacy post-processing
+	(real tabs with a right tab stop on job headers, tight header spacing, bullet style)
+	in one load and one save. The template comes from the in-memory reference cache with
+	its header placeholders already filled.
+	"""
+	styles = styles or load_style_names()
+	doc = docx.Document(io.BytesIO(get_reference_template(reference_docx).render(data)))
+	w = _Writer(doc)
+
+	section = doc.sections[0]
+	usable_width = section.page_width - section.left_margin - section.right_margin
+
+	def spacer() -> None:
+		w.para(NBSP, styles["spacer"])
+
+	if data.get("summary"):
+		w.para(data["summary"], styles["summary"])
+	spacer()
+
+	w.para("Technical Skills", styles["section_heading"])
+	if data.get("core_skills"):
+		w.para(", ".join(data["core_skills"]), styles["skills_body"])
+	spacer()
+
+	if data.get("education"):
+		w.para("Education and Certifications", styles["section_heading"])
+		for e in data["education"]:
+			line = (e.get("degree") or "")
+			if e.get("school"):
+				line += f", {e['school']}"
+			if e.get("grad_date"):
+				line += f", {e['grad_date']}"
+			w.para(line, styles["summary"])
+	spacer()
+
+	if data.get("certifications"):
+		w.para(", ".join(data["certifications"]), styles["summary"])
+		spacer()
+
+	w.para("Professional Experience", styles["section_heading"])
+	spacer()
+	for i, r in enumerate(data.get("experience") or []):
+		if i:
+			spacer()
+		job = w.para(f"{r.get('company', '')}\t{r.get('start_date', '')} – {r.get('end_date', '')}", styles["job_header"])
+		stops = job.paragraph_format.tab_stops
+		stops.clear_all()
+		stops.add_tab_stop(usable_width, alignment=WD_TAB_ALIGNMENT.RIGHT)
+		if r.get("role"):
+			# Tighten spacing between job header and role header lines
+			pfp = job.paragraph_format
+			pfp.space_after = Pt(0)
+			pfp.line_spacing = None
+			pfp.line_spacing_rule = WD_LINE_SPACING.SINGLE
+			role = w.para(r["role"], styles["role_header"])
+			pfn = role.paragraph_format
+			pfn.space_before = Pt(0)
+			pfn.space_after = Pt(0)
+			pfn.line_spacing = None
+			pfn.line_spacing_rule = WD_LINE_SPACING.SINGLE
+		if r.get("summary"):
+			w.para(r["summary"], styles["body"])
+		for b in r.get("bullets") or []:
+			w.para(b, styles["bullet"])
+
+	doc.save(str(out_path))
+	return out_path
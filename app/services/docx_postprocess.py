@@ -0,0 +1,165 @@
+from __future__ import annotations
+from pathlib import Path
+from typing import Dict, Optional
+import io
+import zipfile
+from lxml import etree
+from app.services.styles import load_style_names
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+
+def _w(tag: str) -> str:
+	return f"{{{W_NS}}}{tag}"
+
+
+W_P, W_R, W_T, W_TAB, W_PPR = _w("p"), _w("r"), _w("t"), _w("tab"), _w("pPr")
+W_VAL = _w("val")
+XML_SPACE = "{http://www.w3.org/XML/1998/namespace}space"
+
+# Schema order of <w:pPr> children; new children must be inserted in this order
+_PPR_ORDER = [_w(t) for t in (
+	"pStyle", "keepNext", "keepLines", "pageBreakBefore", "framePr", "widowControl", "numPr",
+	"suppressLineNumbers", "pBdr", "shd", "tabs", "suppressAutoHyphens", "kinsoku", "wordWrap",
+	"overflowPunct", "topLinePunct", "autoSpaceDE", "autoSpaceDN", "bidi", "adjustRightInd",
+	"snapToGrid", "spacing", "ind", "contextualSpacing", "mirrorIndents", "suppressOverlap", "jc",
+	"textDirection", "textAlignment", "textboxTightWrap", "outlineLvl", "divId", "cnfStyle", "rPr",
+	"sectPr", "pPrChange",
+)]
+_PPR_RANK = {tag: i for i, tag in enumerate(_PPR_ORDER)}
+
+
+def _style_ids(styles_xml: bytes) -> Dict[str, str]:
+	"""Paragraph style name -> styleId, read once per document."""
+	root = etree.fromstring(styles_xml)
+	ids: Dict[str, str] = {}
+	for st in root.iterchildren(_w("style")):
+		if st.get(_w("type")) != "paragraph":
+			continue
+		name = st.find(_w("name"))
+		if name is not None:
+			ids[name.get(W_VAL)] = st.get(_w("styleId"))
+	return ids
+
+
+def _ppr(p) -> etree._Element:
+	ppr = p.find(W_PPR)
+	if ppr is None:
+		ppr = etree.Element(W_PPR)
+		p.insert(0, ppr)
+	return ppr
+
+
+def _ppr_child(ppr, tag: str) -> etree._Element:
+	el = ppr.find(tag)
+	if el is not None:
+		return el
+	el = etree.Element(tag)
+	rank = _PPR_RANK[tag]
+	for i, child in enumerate(ppr):
+		if _PPR_RANK.get(child.tag, len(_PPR_ORDER)) > rank:
+			ppr.insert(i, el)
+			return el
+	ppr.append(el)
+	return el
+
+
+def _single_spacing(ppr, **attrs: str) -> None:
+	spacing = _ppr_child(ppr, _w("spacing"))
+	for k, v in attrs.items():
+		spacing.set(_w(k), v)
+	spacing.set(_w("line"), "240")
+	spacing.set(_w("lineRule"), "auto")
+
+
+def _replace_tab_placeholder(p, text: str) -> None:
+	# One plain run, as the python-docx version did; "\t" becomes <w:tab/>
+	for r in p.findall(W_R):
+		p.remove(r)
+	run = etree.SubElement(p, W_R)
+	for i, piece in enumerate(text.split("\t")):
+		if i:
+			etree.SubElement(run, W_TAB)
+		if piece:
+			t = etree.SubElement(run, W_T)
+			t.text = piece
+			if piece != piece.strip():
+				t.set(XML_SPACE, "preserve")
+
+
+def _usable_width_twips(body) -> Optional[int]:
+	sect = body.find(_w("sectPr"))
+	if sect is None:
+		return None
+	pg_sz, pg_mar = sect.find(_w("pgSz")), sect.find(_w("pgMar"))
+	if pg_sz is None or pg_mar is None:
+		return None
+	try:
+		return int(pg_sz.get(_w("w"))) - int(pg_mar.get(_w("left"), 0)) - int(pg_mar.get(_w("right"), 0))
+	except (TypeError, ValueError):
+		return None
+
+
+def fix_document_xml(document_xml: bytes, style_ids: Dict[str, str], styles: Optional[Dict[str, str]] = None) -> bytes:
+	"""Apply the post-pandoc fixups to word/document.xml in one pass over the body.
+
+	- "[[TAB]]" placeholders (possibly split across runs) become real tabs
+	- job headers get a single right-aligned tab stop at the text margin
+	- a job header directly followed by a role header gets tight single spacing
+	- list paragraphs get the bullet style
+	"""
+	styles = styles or load_style_names()
+	job_id = style_ids.get(styles["job_header"])
+	role_id = style_ids.get(styles["role_header"])
+	bullet_id = style_ids.get(styles["bullet"])
+
+	root = etree.fromstring(document_xml)
+	body = root.find(_w("body"))
+	width = _usable_width_twips(body)
+	prev = None
+	prev_style = None
+	for p in body.iterchildren(W_P):
+		ppr = p.find(W_PPR)
+		ps = ppr.find(_w("pStyle")) if ppr is not None else None
+		style = ps.get(W_VAL) if ps is not None else None
+
+		runs = p.findall(W_R)
+		if runs:
+			text = "".join(t.text or "" for r in runs for t in r.iter(W_T))
+			if "[[TAB]]" in text:
+				_replace_tab_placeholder(p, text.replace("[[TAB]]", "\t"))
+
+		if style is not None and style == job_id and width:
+			ppr = _ppr(p)
+			old = ppr.find(_w("tabs"))
+			if old is not None:
+				ppr.remove(old)
+			tabs = _ppr_child(ppr, _w("tabs"))
+			etree.SubElement(tabs, _w("tab"), {_w("val"): "right", _w("pos"): str(width)})
+
+		if prev is not None and prev_style is not None and prev_style == job_id and style == role_id:
+			_single_spacing(_ppr(prev), after="0")
+			_single_spacing(_ppr(p), before="0", after="0")
+
+		if bullet_id and ppr is not None and ppr.find(_w("numPr")) is not None:
+			ps = _ppr_child(ppr, _w("pStyle"))
+			ps.set(W_VAL, bullet_id)
+
+		prev, prev_style = p, style
+
+	return etree.tostring(root, xml_declaration=True, encoding="UTF-8", standalone=True)
+
+
+def postprocess_docx(docx_file: Path, styles: Optional[Dict[str, str]] = None) -> None:
+	"""Rewrite docx_file in place with fix_document_xml applied; other parts are copied as-is."""
+	docx_file = Path(docx_file)
+	with zipfile.ZipFile(docx_file) as zf:
+		entries = [(info, zf.read(info)) for info in zf.infolist()]
+	parts = {info.filename: raw for info, raw in entries}
+	style_ids = _style_ids(parts["word/styles.xml"]) if "word/styles.xml" in parts else {}
+	fixed = fix_document_xml(parts["word/document.xml"], style_ids, styles)
+	out = io.BytesIO()
+	with zipfile.ZipFile(out, "w") as zf:
+		for info, raw in entries:
+			zf.writestr(info, fixed if info.filename == "word/document.xml" else raw)
+	docx_file.write_bytes(out.getvalue())
@@ -1,13 +1,17 @@
-from typing import Any, Dict, Optional
+from __future__ import annotations
+from typing import Any, Dict, List
+import asyncio
 import json
 import logging
-from app.services.llm import get_openai_client
-from app.services.skill_scope_schema import JSON_RESUME_SCHEMA
+from app.services.llm import chat_completion
+import app.config as cfg
+from app.services.chunking import split_resume_for_extraction
+from app.services.json_stream import JsonSectionParser, SectionCallback
+from app.services.sections import ResumeSections, segment_resume
+from app.services.skill_scope_schema import SCHEMA_TEXT, schema_text
 
 logger = logging.getLogger(__name__)
 
-_client: Optional[object] = None
-
 SYSTEM_PROMPT = (
     "You are an expert resume parser. Extract the entire resume into a single JSON object strictly matching the provided schema.\n"
     "Rules for 'work':\n"
@@ -27,36 +31,185 @@ SYSTEM_PROMPT = (
     "Return only valid JSON. If a value is not found, use empty string or empty list."
 )
 
-MODEL = "gpt-4o-mini"
 
+# System prompt per schema profile, built once at import
+_SYSTEM_PROMPTS = {
+	profile: f"""
+{SYSTEM_PROMPT}
 
-def _get_client():
-	global _client
-	if _client is None:
-		_client = get_openai_client()
-	return _client
+JSON Schema:
+{text}
+"""
+	for profile, text in SCHEMA_TEXT.items()
+}
 
 
-def extract_to_json(scrubbed_text: str) -> Dict[str, Any]:
-	client = _get_client()
-	system_prompt = f"""
-{SYSTEM_PROMPT}
+def _system_prompt(profile: str | None) -> str:
+	profile = profile or cfg.EXTRACTION_SCHEMA_PROFILE
+	if profile not in _SYSTEM_PROMPTS:
+		schema_text(profile)  # raises with the list of valid profiles
+	return _SYSTEM_PROMPTS[profile]
 
-Full JSON Schema:
-{json.dumps(JSON_RESUME_SCHEMA, indent=2)}
-"""
-	resp = client.chat.completions.create(
-		model=MODEL,
+
+async def extract_to_json(
+	scrubbed_text: str,
+	schema_profile: str | None = None,
+	on_section: SectionCallback | None = None,
+	on_item: SectionCallback | None = None,
+	sections: ResumeSections | None = None,
+) -> Dict[str, Any]:
+	"""Extract the resume into Skill Scope JSON.
+
+	schema_profile: 'minimal' (only fields the internal transform reads) or 'full';
+	defaults to RESUME_FORMATTER_EXTRACTION_SCHEMA.
+	on_section(key, value): called for each top-level section ('basics', 'work', 'skills',
+	'education', ...) as soon as it has streamed in; on_item('work', entry) for each role.
+	Texts longer than RESUME_FORMATTER_EXTRACTION_CHUNK_THRESHOLD are split at role and
+	section boundaries and the parts are extracted concurrently, then merged; the
+	callbacks then fire once the merge is done.
+	sections: the run's segmentation of scrubbed_text, if already computed.
+	"""
+	system_prompt = _system_prompt(schema_profile)
+	scrubbed_text = _extraction_text(scrubbed_text, schema_profile or cfg.EXTRACTION_SCHEMA_PROFILE, sections)
+	if cfg.EXTRACTION_CHUNKING and len(scrubbed_text) > cfg.EXTRACTION_CHUNK_THRESHOLD:
+		chunks = split_resume_for_extraction(scrubbed_text, cfg.EXTRACTION_CHUNK_CHARS)
+		if len(chunks) > 1:
+			logger.info("extraction: chunked chars=%d chunks=%d", len(scrubbed_text), len(chunks))
+			n = len(chunks)
+			parts = await asyncio.gather(*(
+				_extract_once(
+					system_prompt,
+					f"This is part {i} of {n} of a long resume, split at section and role boundaries. "
+					f"Extract only what appears in this part; use empty values for anything not present.\n\n{chunk}",
+				)
+				for i, chunk in enumerate(chunks, start=1)
+			))
+			merged = merge_extractions(parts)
+			_replay_sections(merged, on_section, on_item)
+			return merged
+	parser = None
+	if on_section is not None or on_item is not None:
+		parser = JsonSectionParser(on_section, on_item, item_keys=("work",))
+	return await _extract_once(system_prompt, f"Here is the full resume text:\n\n{scrubbed_text}", parser)
+
+
+def _extraction_text(text: str, profile: str, sections: ResumeSections | None) -> str:
+	"""Leave references, hobbies and interests out of the minimal-schema prompt. Projects,
+	languages and the like stay: their technologies end up in the skills."""
+	if profile != "minimal":
+		return text
+	sections = sections or segment_resume(text)
+	dropped = sections.of("personal")
+	if not dropped:
+		return text
+	kept = "".join(text[s.start:s.end] for s in sections.sections if s.kind != "personal")
+	logger.info("extraction: dropped sections=%s chars=%d", ",".join(s.heading for s in dropped), len(text) - len(kept))
+	return kept
+
+
+def _replay_sections(data: Dict[str, Any], on_section: SectionCallback | None, on_item: SectionCallback | None) -> None:
+	if on_item is not None:
+		for entry in data.get("work") or []:
+			on_item("work", entry)
+	if on_section is not None:
+		for key, value in data.items():
+			on_section(key, value)
+
+
+async def _extract_once(system_prompt: str, user_content: str, parser: JsonSectionParser | None = None) -> Dict[str, Any]:
+	content = await chat_completion(
+		stage="extraction",
 		response_format={"type": "json_object"},
 		messages=[
 			{"role": "system", "content": system_prompt},
-			{"role": "user", "content": f"Here is the full resume text:\n\n{scrubbed_text}"},
+			{"role": "user", "content": user_content},
 		],
 		temperature=0,
+		on_delta=parser.feed if parser is not None else None,
 	)
-	content = resp.choices[0].message.content or "{}"
+	content = content or "{}"
 	try:
-		return json.loads(content)
+		obj = json.loads(content)
 	except Exception:
 		logger.error("extraction: invalid JSON returned by model; returning empty object. snip=%s", content[:1000])
-		return {} 
\ No newline at end of file
+		return {}
+	return obj if isinstance(obj, dict) else {}
+
+
+def _dedupe(items: List[Any], key) -> List[Any]:
+	seen = set()
+	out = []
+	for it in items:
+		k = key(it)
+		if k in seen:
+			continue
+		seen.add(k)
+		out.append(it)
+	return out
+
+
+def _norm(v: Any) -> str:
+	return str(v or "").strip().lower()
+
+
+def merge_extractions(parts: List[Dict[str, Any]]) -> Dict[str, Any]:
+	"""Merge per-chunk extractions (in document order) into one Skill Scope object.
+
+	basics: first non-empty value per field. work: chunk order, then each chunk's
+	role_order, renumbered 1..n. Skills, education and certificates are de-duplicated
+	case-insensitively, keeping first-seen order.
+	"""
+	merged: Dict[str, Any] = {}
+
+	basics: Dict[str, Any] = {}
+	for p in parts:
+		for k, v in (p.get("basics") or {}).items():
+			if isinstance(v, dict):
+				dst = basics.setdefault(k, {})
+				if isinstance(dst, dict):
+					for kk, vv in v.items():
+						if vv and not dst.get(kk):
+							dst[kk] = vv
+			elif v and not basics.get(k):
+				basics[k] = v
+	merged["basics"] = basics
+
+	work: List[Dict[str, Any]] = []
+	for p in parts:
+		entries = [w for w in (p.get("work") or []) if isinstance(w, dict)]
+		entries.sort(key=lambda w: w.get("role_order") if isinstance(w.get("role_order"), int) else len(entries))
+		work.extend(entries)
+	work = _dedupe(work, lambda w: (_norm(w.get("name")), _norm(w.get("position")), _norm(w.get("startDate"))))
+	for i, w in enumerate(work, start=1):
+		w["role_order"] = i
+	merged["work"] = work
+
+	education = [e for p in parts for e in (p.get("education") or []) if isinstance(e, dict)]
+	merged["education"] = _dedupe(education, lambda e: (_norm(e.get("institution")), _norm(e.get("area")), _norm(e.get("studyType"))))
+
+	certificates = [c for p in parts for c in (p.get("certificates") or []) if isinstance(c, dict) and c.get("name")]
+	merged["certificates"] = _dedupe(certificates, lambda c: _norm(c.get("name")))
+
+	keywords: List[str] = []
+	for p in parts:
+		for s in p.get("skills") or []:
+			if not isinstance(s, dict):
+				continue
+			# keywords if present, else the entry's name (as the internal transform reads them)
+			if s.get("keywords"):
+				keywords.extend(str(k).strip() for k in s["keywords"] if str(k).strip())
+			elif str(s.get("name") or "").strip():
+				keywords.append(str(s["name"]).strip())
+	merged["skills"] = [{"name": "Technical Skills", "keywords": _dedupe(keywords, _norm)}] if keywords else []
+
+	# Any other top-level lists (full schema profile): concatenate; other values: first wins
+	handled = set(merged)
+	for p in parts:
+		for k, v in p.items():
+			if k in handled:
+				continue
+			if isinstance(v, list) and isinstance(merged.get(k), list):
+				merged[k].extend(v)
+			elif k not in merged:
+				merged[k] = list(v) if isinstance(v, list) else v
+	return merged
@@ -0,0 +1,200 @@
+from __future__ import annotations
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+import asyncio
+import hashlib
+import json
+import logging
+import re
+import app.config as cfg
+from app.services.pdf_ingest import extract_pdf_async
+
+logger = logging.getLogger(__name__)
+
+_UPLOAD_ID_RE = re.compile(r"^[0-9a-f]{64}$")
+
+
+@dataclass
+class IngestResult:
+    upload_id: str  # SHA-256 of the uploaded bytes
+    filename: str
+    text: str
+    page_count: int  # pages in the PDF, including any past the extraction budget
+    char_count: int
+    file_bytes: int
+    truncated: bool = False  # the page/char budget cut the text short
+    budget: str = ""  # _budget_key() at extraction time
+
+
+    @property
+    def pdf_path(self) -> Path:
+        return _cache_dir() / f"{self.upload_id}.pdf"
+
+
+def _cache_dir() -> Path:
+    d = cfg.USER_DATA_DIR / "cache" / "ingest"
+    d.mkdir(parents=True, exist_ok=True)
+    return d
+
+
+def _budget_key() -> str:
+    # Part of the cache key: text extracted under another budget is re-extracted
+    return f"pages={int(cfg.PDF_MAX_PAGES)};chars={int(cfg.PDF_MAX_CHARS)}"
+
+
+class IngestCache:
+    """Extracted PDF text keyed by the SHA-256 of the upload and the extraction budget.
+
+    Entries live on disk (<sha>.pdf + <sha>.json) with a small in-memory LRU in front.
+    Concurrent requests for the same bytes share one extraction.
+    """
+
+    def __init__(self, max_entries: int, memory_entries: int = 32) -> None:
+        self.max_entries = max(1, int(max_entries))
+        self.memory_entries = max(1, int(memory_entries))
+        self._memory: "OrderedDict[str, IngestResult]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    def _remember(self, res: IngestResult) -> None:
+        self._memory[res.upload_id] = res
+        self._memory.move_to_end(res.upload_id)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _read_entry(self, upload_id: str, touch: bool = False) -> Optional[IngestResult]:
+        # Blocking disk access; called through asyncio.to_thread
+        meta = _cache_dir() / f"{upload_id}.json"
+        if not meta.exists() or not (_cache_dir() / f"{upload_id}.pdf").exists():
+            return None
+        try:
+            res = IngestResult(**json.loads(meta.read_text()))
+        except Exception:
+            logger.warning("ingest_cache: unreadable entry %s; ignoring", meta.name)
+            return None
+        if touch and res.budget == _budget_key():
+            # The mtime orders entries for _prune
+            meta.touch()
+        return res
+
+    async def lookup(self, upload_id: str) -> Optional[IngestResult]:
+        """The cached extraction, or None if missing or made under a different budget."""
+        upload_id = (upload_id or "").strip().lower()
+        if not _UPLOAD_ID_RE.match(upload_id):
+            return None
+        budget = _budget_key()
+        res = self._memory.get(upload_id)
+        if res is not None and res.budget == budget:
+            self._memory.move_to_end(upload_id)
+            return res
+        res = await asyncio.to_thread(self._read_entry, upload_id, True)
+        if res is None or res.budget != budget:
+            return None
+        self._remember(res)
+        return res
+
+    async def get(self, upload_id: str) -> Optional[IngestResult]:
+        """lookup(), re-extracting the stored PDF if the budget changed since it was read."""
+        res = await self.lookup(upload_id)
+        if res is not None:
+            return res
+        upload_id = (upload_id or "").strip().lower()
+        if not _UPLOAD_ID_RE.match(upload_id):
+            return None
+        stale = await asyncio.to_thread(self._read_entry, upload_id)
+        if stale is None:
+            return None
+        try:
+            content = await asyncio.to_thread(stale.pdf_path.read_bytes)
+        except FileNotFoundError:
+            return None
+        return await self.ingest(content, stale.filename)
+
+    async def ingest(self, content: bytes, filename: str) -> IngestResult:
+        """Return the cached extraction for these bytes, extracting at most once.
+
+        Callers that arrive during an extraction wait for it; if the caller running it
+        is cancelled, the next waiter takes the extraction over instead of failing too.
+        """
+        upload_id = hashlib.sha256(content).hexdigest()
+        while True:
+            cached = await self.lookup(upload_id)
+            if cached is not None:
+                logger.info("ingest_cache: hit id=%s", upload_id[:12])
+                return cached
+            pending = self._inflight.get(upload_id)
+            if pending is None:
+                break
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                task = asyncio.current_task()
+                if not pending.cancelled() or (task is not None and task.cancelling()):
+                    raise
+                logger.info("ingest_cache: extraction id=%s was cancelled; retrying", upload_id[:12])
+
+        fut = asyncio.get_running_loop().create_future()
+        self._inflight[upload_id] = fut
+        try:
+            res = await self._extract(upload_id, content, filename)
+            fut.set_result(res)
+            return res
+        except asyncio.CancelledError:
+            # Only this caller was cancelled; waiters see a cancelled future and retry
+            fut.cancel()
+            raise
+        except BaseException as e:
+            fut.set_exception(e)
+            fut.exception()  # mark retrieved; waiters re-raise it themselves
+            raise
+        finally:
+            self._inflight.pop(upload_id, None)
+
+    async def _extract(self, upload_id: str, content: bytes, filename: str) -> IngestResult:
+        d = _cache_dir()
+        pdf_path = d / f"{upload_id}.pdf"
+        await asyncio.to_thread(pdf_path.write_bytes, content)
+        pdf = await extract_pdf_async(pdf_path)
+        res = IngestResult(
+            upload_id=upload_id,
+            filename=filename,
+            text=pdf.text,
+            page_count=pdf.page_count,
+            char_count=len(pdf.text),
+            file_bytes=len(content),
+            truncated=pdf.truncated,
+            budget=_budget_key(),
+        )
+        await asyncio.to_thread((d / f"{upload_id}.json").write_text, json.dumps(asdict(res)))
+        self._remember(res)
+        # Disk scan on a worker thread; the in-memory LRU is only touched on the event loop
+        for stale in await asyncio.to_thread(self._prune):
+            self._memory.pop(stale, None)
+        logger.info(
+            "ingest_cache: stored id=%s pages=%d chars=%d truncated=%s",
+            upload_id[:12], res.page_count, res.char_count, res.truncated,
+        )
+        return res
+
+    def _prune(self) -> List[str]:
+        """Delete the oldest entries beyond max_entries from disk; returns their ids."""
+        metas = sorted(_cache_dir().glob("*.json"), key=lambda p: p.stat().st_mtime)
+        stale = metas[: max(0, len(metas) - self.max_entries)]
+        for meta in stale:
+            for p in (meta, meta.with_suffix(".pdf")):
+                try:
+                    p.unlink()
+                except FileNotFoundError:
+                    pass
+        return [meta.stem for meta in stale]
+
+
+_cache: Optional[IngestCache] = None
+
+
+def get_ingest_cache() -> IngestCache:
+    global _cache
+    if _cache is None:
+        _cache = IngestCache(max_entries=cfg.INGEST_CACHE_MAX_ENTRIES)
+    return _cache
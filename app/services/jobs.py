@@ -0,0 +1,204 @@
+from __future__ import annotations
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+import asyncio
+import bisect
+import logging
+import uuid
+from fastapi import HTTPException
+import app.config as cfg
+from app.services.pipeline import RunReporter
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED = {SUCCEEDED, FAILED, CANCELLED}
+
+# Graph stages published under a shared public event name
+_EVENT_STAGES = {
+	"proofread_summary": ("proofread", "summary"),
+	"proofread_bullets": ("proofread", "bullets"),
+}
+
+
+def _now() -> str:
+	return datetime.utcnow().isoformat(timespec="milliseconds") + "Z"
+
+
+class Job(RunReporter):
+	"""One submitted pipeline run. Doubles as the run's progress reporter."""
+
+	def __init__(self, kind: str) -> None:
+		self.id = uuid.uuid4().hex
+		self.kind = kind
+		self.status = QUEUED
+		self.created_at = _now()
+		self.started_at: Optional[str] = None
+		self.finished_at: Optional[str] = None
+		self.stages: List[Dict[str, Any]] = []
+		self.metrics: Dict[str, Any] = {}
+		self.result: Optional[Dict[str, Any]] = None
+		self.error: Optional[str] = None
+		self.error_status = 500
+		self.task: Optional[asyncio.Task] = None
+		# Event log for streaming clients, replayable by id (SSE Last-Event-ID); ids keep
+		# counting up after compact_events drops entries
+		self.events: List[Dict[str, Any]] = []
+		self.event_count = 0
+		self._changed = asyncio.Event()
+
+	def publish(self, event: str, data: Dict[str, Any]) -> None:
+		self.events.append({"id": self.event_count, "event": event, "data": data})
+		self.event_count += 1
+		changed, self._changed = self._changed, asyncio.Event()
+		changed.set()
+
+	def events_after(self, event_id: int) -> List[Dict[str, Any]]:
+		"""Retained events with an id above `event_id`, in order."""
+		return self.events[bisect.bisect_right(self.events, event_id, key=lambda ev: ev["id"]):]
+
+	def compact_events(self) -> None:
+		"""Drop token events and stage previews, which only matter while the job runs;
+		the result carries the final text. Keeps retained jobs small."""
+		self.events = [
+			ev if ev["event"] != "stage" else {**ev, "data": {k: v for k, v in ev["data"].items() if k != "preview"}}
+			for ev in self.events
+			if ev["event"] != "token"
+		]
+
+	async def wait_for_events(self, after: int, timeout_s: float) -> bool:
+		"""Wait until more than `after` events have been published; False on timeout."""
+		changed = self._changed
+		if self.event_count > after:
+			return True
+		try:
+			await asyncio.wait_for(changed.wait(), timeout=timeout_s)
+		except asyncio.TimeoutError:
+			return False
+		return True
+
+	def stage_done(self, name: str, result: Any = None, duration_ms: int = 0) -> None:
+		self.stages.append({"stage": name, "duration_ms": duration_ms, "finished_at": _now()})
+		event, part = _EVENT_STAGES.get(name, (name, None))
+		data: Dict[str, Any] = {"stage": event, "duration_ms": duration_ms, "preview": result}
+		if part:
+			data["part"] = part
+		self.publish("stage", data)
+
+	def token(self, stage: str, text: str) -> None:
+		self.publish("token", {"stage": stage, "text": text})
+
+	def metric(self, name: str, data: Dict[str, Any]) -> None:
+		self.metrics[name] = data
+		self.publish("metric", {"name": name, "data": data})
+
+	def to_dict(self) -> Dict[str, Any]:
+		return {
+			"job_id": self.id,
+			"kind": self.kind,
+			"status": self.status,
+			"created_at": self.created_at,
+			"started_at": self.started_at,
+			"finished_at": self.finished_at,
+			"stages": list(self.stages),
+			"metrics": dict(self.metrics),
+			"error": self.error,
+		}
+
+
+JobRunner = Callable[[Job], Awaitable[Dict[str, Any]]]
+
+
+class JobManager:
+	"""Runs submitted jobs in the background with at most `max_workers` at once.
+
+	Finished jobs are kept (up to `max_retained`) so clients can poll status and results.
+	"""
+
+	def __init__(self, max_workers: int, max_retained: int = 200) -> None:
+		self.max_workers = max(1, int(max_workers))
+		self.max_retained = max(1, int(max_retained))
+		self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+		self._slots: Optional[asyncio.Semaphore] = None
+		self._accepting = True
+
+	def submit(self, kind: str, runner: JobRunner) -> Job:
+		if not self._accepting:
+			raise HTTPException(status_code=503, detail="Server is shutting down")
+		if self._slots is None:
+			self._slots = asyncio.Semaphore(self.max_workers)
+		job = Job(kind)
+		self._jobs[job.id] = job
+		job.task = asyncio.create_task(self._run(job, runner), name=f"job:{job.id}")
+		self._prune()
+		logger.info("jobs: submitted id=%s kind=%s", job.id, kind)
+		return job
+
+	async def _run(self, job: Job, runner: JobRunner) -> None:
+		try:
+			async with self._slots:
+				job.status = RUNNING
+				job.started_at = _now()
+				job.result = await runner(job)
+				job.status = SUCCEEDED
+		except asyncio.CancelledError:
+			job.status = CANCELLED
+		except HTTPException as e:
+			job.status = FAILED
+			job.error = str(e.detail)
+			job.error_status = e.status_code
+		except Exception as e:
+			logger.exception("jobs: id=%s failed", job.id)
+			job.status = FAILED
+			job.error = str(e)
+		finally:
+			job.finished_at = _now()
+			job.compact_events()
+			job.publish("status", {"status": job.status, "error": job.error, "result": job.result})
+			logger.info("jobs: finished id=%s status=%s", job.id, job.status)
+
+	def _prune(self) -> None:
+		finished = [j for j in self._jobs.values() if j.status in FINISHED]
+		for job in finished[: max(0, len(self._jobs) - self.max_retained)]:
+			self._jobs.pop(job.id, None)
+
+	def get(self, job_id: str) -> Optional[Job]:
+		return self._jobs.get(job_id)
+
+	def cancel(self, job_id: str) -> Optional[Job]:
+		job = self._jobs.get(job_id)
+		if job is not None and job.status not in FINISHED and job.task is not None:
+			job.task.cancel()
+		return job
+
+	async def shutdown(self, timeout_s: float) -> None:
+		"""Stop accepting jobs, drop queued ones and wait for running ones to finish."""
+		self._accepting = False
+		for job in self._jobs.values():
+			if job.status == QUEUED and job.task is not None:
+				job.task.cancel()
+		pending = [j.task for j in self._jobs.values() if j.task is not None and not j.task.done()]
+		if not pending:
+			return
+		logger.info("jobs: waiting for %d in-flight jobs", len(pending))
+		done, still_running = await asyncio.wait(pending, timeout=timeout_s)
+		for task in still_running:
+			task.cancel()
+		if still_running:
+			logger.warning("jobs: cancelled %d jobs still running after %.0fs", len(still_running), timeout_s)
+			await asyncio.gather(*still_running, return_exceptions=True)
+
+
+_manager: Optional[JobManager] = None
+
+
+def get_job_manager() -> JobManager:
+	global _manager
+	if _manager is None:
+		_manager = JobManager(max_workers=cfg.JOB_WORKERS, max_retained=cfg.JOB_MAX_RETAINED)
+	return _manager
@@ -0,0 +1,124 @@
+from __future__ import annotations
+from typing import Any, Callable, Dict, Iterable, Optional
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+SectionCallback = Callable[[str, Any], None]
+
+
+class JsonSectionParser:
+	"""Incremental scanner for a JSON object that arrives in fragments.
+
+	Calls on_section(key, value) as soon as each top-level value is complete, and
+	on_item(key, value) for every element of the arrays named in `item_keys` as soon
+	as that element closes. Only the new characters of each fragment are scanned.
+	Values that fail to parse are skipped; the caller still gets the full text at the end.
+	"""
+
+	def __init__(
+		self,
+		on_section: Optional[SectionCallback] = None,
+		on_item: Optional[SectionCallback] = None,
+		item_keys: Iterable[str] = (),
+	) -> None:
+		self.on_section = on_section
+		self.on_item = on_item
+		self.item_keys = set(item_keys)
+		self.sections: Dict[str, Any] = {}
+		self._buf = ""
+		self._pos = 0
+		self._depth = 0
+		self._in_string = False
+		self._escape = False
+		self._string_start = 0
+		self._expect_key = False
+		self._after_colon = False
+		self._key: Optional[str] = None
+		self._value_start: Optional[int] = None
+		self._in_items = False
+		self._item_start: Optional[int] = None
+
+	@property
+	def text(self) -> str:
+		return self._buf
+
+	def feed(self, fragment: str) -> None:
+		if not fragment:
+			return
+		self._buf += fragment
+		buf = self._buf
+		for i in range(self._pos, len(buf)):
+			c = buf[i]
+			if self._in_string:
+				if self._escape:
+					self._escape = False
+				elif c == "\\":
+					self._escape = True
+				elif c == '"':
+					self._in_string = False
+					if self._depth == 1 and self._expect_key:
+						self._key = self._loads(buf[self._string_start:i + 1])
+						self._expect_key = False
+				continue
+			if c.isspace():
+				continue
+			if self._depth == 1 and self._after_colon:
+				self._value_start = i
+				self._after_colon = False
+			if self._depth == 2 and self._in_items and self._item_start is None and c not in ",]":
+				self._item_start = i
+
+			if c == '"':
+				self._in_string = True
+				self._string_start = i
+			elif c in "{[":
+				self._depth += 1
+				if self._depth == 1:
+					self._expect_key = True
+				elif self._depth == 2 and c == "[" and self._key in self.item_keys:
+					self._in_items = True
+			elif c in "}]":
+				self._depth -= 1
+				if self._depth == 2 and self._in_items and self._item_start is not None:
+					self._emit_item(buf[self._item_start:i + 1])
+					self._item_start = None
+				elif self._depth == 1:
+					self._emit_section(buf[self._value_start:i + 1])
+				elif self._depth == 0 and self._value_start is not None:
+					self._emit_section(buf[self._value_start:i])
+			elif c == ":" and self._depth == 1:
+				self._after_colon = True
+			elif c == "," and self._depth == 1:
+				if self._value_start is not None:
+					self._emit_section(buf[self._value_start:i])
+				self._expect_key = True
+			elif c == "," and self._depth == 2 and self._in_items:
+				# scalar array element: not reported
+				self._item_start = None
+		self._pos = len(buf)
+
+	def _loads(self, raw: str) -> Any:
+		try:
+			return json.loads(raw)
+		except ValueError:
+			logger.debug("json_stream: unparseable fragment %r", raw[:200])
+			return None
+
+	def _emit_section(self, raw: str) -> None:
+		key = self._key
+		self._value_start = None
+		self._in_items = False
+		self._item_start = None
+		if key is None:
+			return
+		value = self._loads(raw.strip())
+		self.sections[key] = value
+		if self.on_section is not None:
+			self.on_section(key, value)
+
+	def _emit_item(self, raw: str) -> None:
+		value = self._loads(raw)
+		if value is not None and self.on_item is not None:
+			self.on_item(self._key, value)
@@ -1,22 +1,159 @@
 from __future__ import annotations
-from typing import Optional
-from openai import OpenAI
-from app.config import OPENAI_API_KEY
+from typing import Any, Callable, Dict, List, Optional
+import asyncio
+import logging
+import httpx
+import openai
+from openai import OpenAI, AsyncOpenAI, DefaultAsyncHttpxClient
+import app.config as cfg
+from app.services.llm_cache import cache_key, get_llm_cache, is_bypassed
+from app.services.model_registry import StageModel, get_stage_model
+
+logger = logging.getLogger(__name__)
 
 _client: Optional[OpenAI] = None
+_async_client: Optional[AsyncOpenAI] = None
+
+
+def _api_key() -> str:
+    # Read through the module so keys saved at runtime (/api/openai_key) take effect after a reset
+    if not cfg.OPENAI_API_KEY:
+        raise RuntimeError("OpenAI key missing. Set RESUME_FORMATTER_OPENAI_API_KEY in .env")
+    return cfg.OPENAI_API_KEY
 
 
 def get_openai_client() -> OpenAI:
     global _client
     if _client is None:
-        if not OPENAI_API_KEY:
-            raise RuntimeError("OpenAI key missing. Set RESUME_FORMATTER_OPENAI_API_KEY in .env")
-        _client = OpenAI(api_key=OPENAI_API_KEY)
+        _client = OpenAI(api_key=_api_key())
     return _client
 
 
+def get_async_openai_client() -> AsyncOpenAI:
+    """Shared async client; all services reuse one keep-alive connection pool."""
+    global _async_client
+    if _async_client is None:
+        http_client = DefaultAsyncHttpxClient(
+            limits=httpx.Limits(
+                max_connections=cfg.LLM_MAX_CONNECTIONS,
+                max_keepalive_connections=cfg.LLM_MAX_KEEPALIVE,
+                keepalive_expiry=cfg.LLM_KEEPALIVE_EXPIRY_S,
+            ),
+            timeout=httpx.Timeout(cfg.LLM_READ_TIMEOUT_S, connect=cfg.LLM_CONNECT_TIMEOUT_S),
+        )
+        _async_client = AsyncOpenAI(
+            api_key=_api_key(),
+            http_client=http_client,
+            max_retries=cfg.LLM_MAX_RETRIES,
+        )
+    return _async_client
+
+
 def reset_openai_client() -> None:
-    global _client
+    global _client, _async_client
+    _client = None
+    old, _async_client = _async_client, None
+    if old is not None:
+        # Close the old pool in the background when called from the event loop
+        try:
+            asyncio.get_running_loop().create_task(old.close())
+        except RuntimeError:
+            pass
+
+
+async def aclose_openai_clients() -> None:
+    global _client, _async_client
+    old, _async_client = _async_client, None
     _client = None
+    if old is not None:
+        await old.close()
+
+
+# Worth another try on the same model; timeouts go straight to the next model instead
+_RETRYABLE = (openai.RateLimitError, openai.InternalServerError, openai.APIConnectionError)
+_RETRY_BACKOFF_S = 0.5
+
+
+async def _create(request: Dict[str, Any], spec: StageModel, on_delta: Optional[Callable[[str], None]]) -> str:
+    client = get_async_openai_client().with_options(
+        timeout=httpx.Timeout(spec.timeout_s, connect=cfg.LLM_CONNECT_TIMEOUT_S),
+        max_retries=0,
+    )
+    if on_delta is None:
+        resp = await client.chat.completions.create(**request)
+        return resp.choices[0].message.content or ""
+    parts: List[str] = []
+    stream = await client.chat.completions.create(**request, stream=True)
+    async for chunk in stream:
+        delta = chunk.choices[0].delta.content if chunk.choices else None
+        if delta:
+            parts.append(delta)
+            on_delta(delta)
+    return "".join(parts)
+
+
+async def chat_completion(
+    *,
+    stage: str,
+    messages: List[Dict[str, Any]],
+    response_format: Optional[Dict[str, Any]] = None,
+    temperature: float = 0,
+    on_delta: Optional[Callable[[str], None]] = None,
+) -> str:
+    """Run a chat completion for a pipeline stage and return the message content.
+
+    The stage's model, max tokens, timeout, retries and fallback models come from the
+    model registry (app/services/model_registry.py). A timeout, or a model the API does
+    not know, moves on to the next fallback; the last error is raised when none is left.
+    Deterministic (temperature=0) requests go through the on-disk response cache.
+    With `on_delta`, the response is streamed and each text fragment is passed to it
+    as it arrives (a cache hit is delivered as a single fragment). Once fragments have
+    been delivered, a failure is raised rather than retried, so they are never repeated.
+    """
+    spec = get_stage_model(stage)
+    cache = get_llm_cache() if temperature == 0 else None
+    streamed = False
+
+    def forward(delta: str) -> None:
+        nonlocal streamed
+        streamed = True
+        on_delta(delta)
+
+    last_error: Optional[Exception] = None
+    for model in spec.chain:
+        request: Dict[str, Any] = {"model": model, "messages": messages, "temperature": temperature}
+        if spec.max_tokens:
+            request["max_tokens"] = spec.max_tokens
+        if response_format is not None:
+            request["response_format"] = response_format
 
+        key = cache_key(request) if cache is not None else None
+        if key is not None and not is_bypassed():
+            cached = await asyncio.to_thread(cache.get, key)
+            if cached is not None:
+                if on_delta is not None:
+                    on_delta(cached)
+                return cached
 
+        for attempt in range(spec.retries + 1):
+            try:
+                content = await _create(request, spec, forward if on_delta is not None else None)
+            except (openai.APITimeoutError, openai.NotFoundError) as exc:
+                if streamed:
+                    raise
+                logger.warning("llm: %s on %s failed (%s); trying the next model", stage, model, type(exc).__name__)
+                last_error = exc
+                break
+            except _RETRYABLE as exc:
+                if streamed:
+                    raise
+                last_error = exc
+                if attempt < spec.retries:
+                    await asyncio.sleep(_RETRY_BACKOFF_S * 2 ** attempt)
+                continue
+            if key is not None and content:
+                await asyncio.to_thread(cache.put, key, content)
+            return content
+        else:
+            logger.warning("llm: %s on %s failed after %d attempt(s); trying the next model", stage, model, spec.retries + 1)
+    raise last_error if last_error is not None else RuntimeError(f"No model configured for stage {stage}")
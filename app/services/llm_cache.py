@@ -0,0 +1,149 @@
+from __future__ import annotations
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Dict, Optional
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+import app.config as cfg
+
+logger = logging.getLogger(__name__)
+
+# Per-request bypass: set in a handler, inherited by every task it spawns
+_bypass: ContextVar[bool] = ContextVar("llm_cache_bypass", default=False)
+
+
+def cache_key(request: Dict[str, Any]) -> str:
+    """Content address for a chat request (model, messages, response_format, temperature)."""
+    blob = json.dumps(request, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def set_cache_bypass(enabled: bool) -> None:
+    """Skip cache reads for the current request task and the tasks it spawns.
+
+    Fresh answers still overwrite stored entries.
+    """
+    _bypass.set(bool(enabled))
+
+
+def is_bypassed() -> bool:
+    return _bypass.get() or bool(cfg.LLM_CACHE_BYPASS)
+
+
+class LLMCache:
+    """SQLite-backed response store with a byte cap (LRU eviction) and a TTL.
+
+    Thread-safe; callers on the event loop should use asyncio.to_thread.
+    """
+
+    def __init__(self, path: Path, max_bytes: int, ttl_s: float) -> None:
+        self.path = Path(path)
+        self.max_bytes = max(0, int(max_bytes))
+        self.ttl_s = float(ttl_s)
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, "
+            "created REAL NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries(accessed)")
+        self._total = int(self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0])
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT value, size, created FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            value, size, created = row
+            if self.ttl_s > 0 and now - created > self.ttl_s:
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._total -= size
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE entries SET accessed = ? WHERE key = ?", (now, key))
+            self.hits += 1
+            return value
+
+    def put(self, key: str, value: str) -> None:
+        size = len(value.encode("utf-8"))
+        if self.max_bytes and size > self.max_bytes:
+            return
+        now = time.time()
+        with self._lock:
+            old = self._conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, created, accessed) VALUES (?, ?, ?, ?, ?)",
+                (key, value, size, now, now),
+            )
+            self._total += size - (old[0] if old else 0)
+            self.writes += 1
+            self._evict_locked()
+
+    def _evict_locked(self) -> None:
+        if not self.max_bytes or self._total <= self.max_bytes:
+            return
+        rows = self._conn.execute("SELECT key, size FROM entries ORDER BY accessed ASC").fetchall()
+        for key, size in rows:
+            if self._total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._total -= size
+            self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+            self._total = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            lookups = self.hits + self.misses
+            return {
+                "enabled": True,
+                "entries": entries,
+                "bytes": self._total,
+                "max_bytes": self.max_bytes,
+                "ttl_s": self.ttl_s,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "writes": self.writes,
+                "evictions": self.evictions,
+            }
+
+
+_cache: Optional[LLMCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> Optional[LLMCache]:
+    """Process-wide cache under USER_DATA_DIR, or None when disabled or unavailable."""
+    global _cache
+    if not cfg.LLM_CACHE_ENABLED:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            try:
+                _cache = LLMCache(
+                    cfg.USER_DATA_DIR / "cache" / "llm.sqlite3",
+                    max_bytes=int(cfg.LLM_CACHE_MAX_MB * 1024 * 1024),
+                    ttl_s=cfg.LLM_CACHE_TTL_S,
+                )
+            except Exception:
+                logger.exception("llm_cache: failed to open; continuing without cache")
+                return None
+        return _cache
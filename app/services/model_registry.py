@@ -0,0 +1,123 @@
+from __future__ import annotations
+from dataclasses import asdict, dataclass, fields, replace
+from typing import Any, Dict, Optional, Tuple
+import json
+import logging
+import app.config as cfg
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class StageModel:
+    """How one pipeline stage calls the LLM.
+
+    timeout_s bounds each request (for streamed requests, the wait for the response to
+    start); a timed-out request moves straight to the next model in `fallbacks`.
+    Rate limits, connection errors and 5xx responses are retried up to `retries` times
+    on the same model first (default RESUME_FORMATTER_LLM_MAX_RETRIES).
+    max_tokens=None leaves the model's own limit.
+    """
+    model: str
+    max_tokens: Optional[int] = None
+    timeout_s: float = 60.0
+    retries: int = cfg.LLM_MAX_RETRIES
+    fallbacks: Tuple[str, ...] = ()
+
+    @property
+    def chain(self) -> Tuple[str, ...]:
+        return (self.model,) + tuple(m for m in self.fallbacks if m != self.model)
+
+
+# Defaults keep the models each service used before the registry and send no
+# max_tokens, so requests (and their cache keys) are the same as before; set one
+# per stage in RESUME_FORMATTER_LLM_STAGES to cap output
+DEFAULT_STAGE_MODELS: Dict[str, StageModel] = {
+    "extraction": StageModel("gpt-4o-mini", timeout_s=90.0, fallbacks=("gpt-4o",)),
+    "summary": StageModel("gpt-4o-2024-05-13", timeout_s=45.0, fallbacks=("gpt-4o", "gpt-4o-mini")),
+    # Cheap first try of the summary cascade; a failure escalates to "summary" instead
+    "summary_draft": StageModel("gpt-4o-mini", timeout_s=20.0, retries=1),
+    "skills": StageModel("gpt-4o-mini", timeout_s=45.0, fallbacks=("gpt-4o",)),
+    "bullets": StageModel("gpt-4o-mini", timeout_s=90.0, fallbacks=("gpt-4o",)),
+    "proofread": StageModel("gpt-4o-mini", timeout_s=60.0, fallbacks=("gpt-4o",)),
+    "seniority": StageModel("gpt-4o-mini", timeout_s=20.0, fallbacks=("gpt-4o",)),
+}
+
+_FIELDS = {f.name for f in fields(StageModel)}
+
+
+def _stage_override(stage: str, base: StageModel, raw: Any) -> StageModel:
+    if isinstance(raw, str):
+        # Shorthand: {"summary": "gpt-4o-mini"} only swaps the model
+        raw = {"model": raw}
+    if not isinstance(raw, dict):
+        logger.warning("model registry: ignoring override for %s: %r", stage, raw)
+        return base
+    changes: Dict[str, Any] = {}
+    for key, value in raw.items():
+        if key not in _FIELDS:
+            logger.warning("model registry: unknown field %s.%s", stage, key)
+            continue
+        try:
+            if key == "model":
+                value = str(value).strip() or base.model
+            elif key == "max_tokens":
+                value = int(value) if value not in (None, "", 0) else None
+            elif key == "timeout_s":
+                value = float(value)
+            elif key == "retries":
+                value = max(0, int(value))
+            elif key == "fallbacks":
+                value = tuple(str(m).strip() for m in ([value] if isinstance(value, str) else value or []) if str(m).strip())
+        except (TypeError, ValueError):
+            logger.warning("model registry: invalid value for %s.%s: %r", stage, key, value)
+            continue
+        changes[key] = value
+    return replace(base, **changes)
+
+
+def load_stage_models(overrides: Any = None) -> Dict[str, StageModel]:
+    """The defaults merged with RESUME_FORMATTER_LLM_STAGES (a JSON object per stage,
+    e.g. {"summary": {"model": "gpt-4o-mini", "timeout_s": 20}}), field by field."""
+    if overrides is None:
+        overrides = cfg.LLM_STAGES
+    if isinstance(overrides, str):
+        try:
+            overrides = json.loads(overrides)
+        except ValueError:
+            logger.warning("model registry: RESUME_FORMATTER_LLM_STAGES is not valid JSON; using defaults")
+            overrides = {}
+    stages = dict(DEFAULT_STAGE_MODELS)
+    for stage, raw in (overrides or {}).items() if isinstance(overrides, dict) else ():
+        if stage not in stages:
+            logger.warning("model registry: unknown stage %s (known: %s)", stage, ", ".join(stages))
+            continue
+        stages[stage] = _stage_override(stage, stages[stage], raw)
+    return stages
+
+
+_stage_models: Optional[Dict[str, StageModel]] = None
+
+
+def _registry() -> Dict[str, StageModel]:
+    global _stage_models
+    if _stage_models is None:
+        _stage_models = load_stage_models()
+    return _stage_models
+
+
+def get_stage_model(stage: str) -> StageModel:
+    try:
+        return _registry()[stage]
+    except KeyError:
+        raise ValueError(f"Unknown LLM stage: {stage}") from None
+
+
+def stage_models() -> Dict[str, Dict[str, Any]]:
+    """The effective registry, for /llm_stages."""
+    return {stage: asdict(spec) for stage, spec in _registry().items()}
+
+
+def reset_stage_models() -> None:
+    global _stage_models
+    _stage_models = None
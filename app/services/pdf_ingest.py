@@ -1,9 +1,180 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
 from pathlib import Path
 from io import StringIO
+from typing import Dict, List, Tuple
+import asyncio
+import logging
+from pdfminer.converter import TextConverter
 from pdfminer.high_level import extract_text_to_fp
+from pdfminer.pdfdocument import PDFDocument
+from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+from pdfminer.pdfpage import PDFPage
+from pdfminer.pdfparser import PDFParser
+import app.config as cfg
+from app.services.workers import run_in_process
+
+logger = logging.getLogger(__name__)
 
 def extract_text_from_pdf(pdf_path: Path) -> str:
 	output = StringIO()
 	with open(pdf_path, "rb") as f:
 		extract_text_to_fp(f, output, laparams=None)
 	return output.getvalue()
+
+
+class PdfBackend(ABC):
+	"""A text extraction engine. Pages are returned in order, each ending in a form feed."""
+
+	name = ""
+
+	def available(self) -> bool:
+		return True
+
+	@abstractmethod
+	def extract_pages(self, pdf_path: Path, first: int, last: int) -> Tuple[int, List[str]]:
+		"""Text of pages [first, last) and the document's page count."""
+
+
+class PdfminerBackend(PdfBackend):
+	name = "pdfminer"
+
+	def extract_pages(self, pdf_path: Path, first: int, last: int) -> Tuple[int, List[str]]:
+		# Same converter settings as extract_text_from_pdf, so the pages join to identical text
+		rsrcmgr = PDFResourceManager(caching=True)
+		output = StringIO()
+		device = TextConverter(rsrcmgr, output, laparams=None)
+		interpreter = PDFPageInterpreter(rsrcmgr, device)
+		texts: List[str] = []
+		page_count = 0
+		with open(pdf_path, "rb") as f:
+			doc = PDFDocument(PDFParser(f))
+			for i, page in enumerate(PDFPage.create_pages(doc)):
+				page_count += 1
+				if first <= i < last:
+					start = output.tell()
+					interpreter.process_page(page)
+					texts.append(output.getvalue()[start:])
+		device.close()
+		return page_count, texts
+
+
+class PdfiumBackend(PdfBackend):
+	"""PDFium via the optional pypdfium2 package; much faster on large files."""
+
+	name = "pypdfium2"
+
+	def available(self) -> bool:
+		try:
+			import pypdfium2  # noqa: F401
+		except ImportError:
+			return False
+		return True
+
+	def extract_pages(self, pdf_path: Path, first: int, last: int) -> Tuple[int, List[str]]:
+		import pypdfium2 as pdfium
+
+		pdf = pdfium.PdfDocument(str(pdf_path))
+		try:
+			page_count = len(pdf)
+			texts: List[str] = []
+			for i in range(first, min(last, page_count)):
+				page = pdf[i]
+				textpage = page.get_textpage()
+				try:
+					text = textpage.get_text_range()
+				finally:
+					textpage.close()
+					page.close()
+				texts.append(text.replace("\r\n", "\n").replace("\r", "\n") + "\f")
+			return page_count, texts
+		finally:
+			pdf.close()
+
+
+BACKENDS: Dict[str, PdfBackend] = {b.name: b for b in (PdfminerBackend(), PdfiumBackend())}
+DEFAULT_BACKEND = "pdfminer"
+
+
+def choose_backend(pdf_path: Path) -> str:
+	"""Backend name for this file per RESUME_FORMATTER_PDF_BACKEND.
+
+	"pdfminer" / "pypdfium2" force an engine (falling back to pdfminer if it is not
+	installed); "auto" uses pypdfium2 for files of at least PDF_AUTO_FAST_BYTES.
+	"""
+	wanted = cfg.PDF_BACKEND
+	if wanted == "auto":
+		try:
+			large = Path(pdf_path).stat().st_size >= int(cfg.PDF_AUTO_FAST_BYTES)
+		except OSError:
+			large = False
+		wanted = "pypdfium2" if large else DEFAULT_BACKEND
+	backend = BACKENDS.get(wanted)
+	if backend is None:
+		logger.warning("pdf_ingest: unknown backend %r; using %s", wanted, DEFAULT_BACKEND)
+		return DEFAULT_BACKEND
+	if not backend.available():
+		logger.warning("pdf_ingest: backend %s not installed; using %s", wanted, DEFAULT_BACKEND)
+		return DEFAULT_BACKEND
+	return backend.name
+
+
+def _extract_pages(backend: str, pdf_path: Path, first: int, last: int) -> Tuple[int, List[str]]:
+	# Module-level so it can be sent to the process pool
+	return BACKENDS[backend].extract_pages(pdf_path, first, last)
+
+
+@dataclass
+class PdfText:
+	text: str
+	page_count: int  # pages in the document, whether or not they were read
+	pages_read: int
+
+	@property
+	def truncated(self) -> bool:
+		"""True when the page/char budget stopped extraction before the last page."""
+		return self.pages_read < self.page_count
+
+
+async def extract_pdf_async(pdf_path: Path) -> PdfText:
+	"""Extract text page-parallel in the shared process pool, off the event loop.
+
+	The engine comes from choose_backend (pdfminer unless configured otherwise).
+	The first RESUME_FORMATTER_PDF_PROBE_PAGES pages are read first; if they hold no text
+	the PDF is treated as scanned and "" is returned without touching the rest. Remaining
+	pages go out in ranges of RESUME_FORMATTER_PDF_PAGES_PER_TASK, one wave per pool worker,
+	and are reassembled in page order. Extraction stops after RESUME_FORMATTER_PDF_MAX_PAGES
+	pages or once RESUME_FORMATTER_PDF_MAX_CHARS characters exist (0 = no limit, the default);
+	the result then has truncated set.
+	"""
+	pdf_path = Path(pdf_path)
+	backend = choose_backend(pdf_path)
+	probe = max(1, int(cfg.PDF_PROBE_PAGES))
+	page_count, texts = await run_in_process(_extract_pages, backend, pdf_path, 0, probe)
+	if page_count and not "".join(texts).strip():
+		logger.info("pdf_ingest: no text layer on first %d pages of %d; skipping the rest", len(texts), page_count)
+		return PdfText("", page_count, page_count)
+
+	max_pages = int(cfg.PDF_MAX_PAGES)
+	max_chars = int(cfg.PDF_MAX_CHARS)
+	last = min(page_count, max_pages) if max_pages > 0 else page_count
+	step = max(1, int(cfg.PDF_PAGES_PER_TASK))
+	wave = max(1, int(cfg.PDF_WORKERS))
+	chars = sum(len(t) for t in texts)
+	done = len(texts)
+	while done < last and not (max_chars and chars >= max_chars):
+		ranges = [(a, min(a + step, last)) for a in range(done, last, step)][:wave]
+		results = await asyncio.gather(*(run_in_process(_extract_pages, backend, pdf_path, a, b) for a, b in ranges))
+		for _, page_texts in results:
+			texts.extend(page_texts)
+			chars += sum(len(t) for t in page_texts)
+		done = ranges[-1][1]
+	if done < page_count:
+		logger.warning("pdf_ingest: budget reached; extracted %d of %d pages chars=%d", done, page_count, chars)
+	logger.info("pdf_ingest: backend=%s pages=%d chars=%d", backend, done, chars)
+	return PdfText("".join(texts), page_count, done)
+
+
+async def extract_text_from_pdf_async(pdf_path: Path) -> str:
+	"""Text only; see extract_pdf_async."""
+	return (await extract_pdf_async(pdf_path)).text
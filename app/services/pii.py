@@ -1,32 +1,72 @@
 import re
-from typing import Tuple, Dict
+from typing import Any, Tuple, Dict
 
 EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
 PHONE_RE = re.compile(r"(?:(?:\+?1[ .-]?)?(?:\(\d{3}\)|\d{3})[ .-]?\d{3}[ .-]?\d{4})")
-ADDRESS_HINT = re.compile(r"\d+\s+[^\n,]+(?:Street|St\.|Avenue|Ave\.|Road|Rd\.|Boulevard|Blvd\.|Lane|Ln\.|Drive|Dr\.)", re.IGNORECASE)
+_STREET_SUFFIX = r"(?:Street|St\.|Avenue|Ave\.|Road|Rd\.|Boulevard|Blvd\.|Lane|Ln\.|Drive|Dr\.)"
+ADDRESS_HINT = re.compile(r"\d+\s+[^\n,]+" + _STREET_SUFFIX, re.IGNORECASE)
 URL_RE = re.compile(r"(?:(?:https?://)[^\s)]+|(?:www\.[^\s)]+)|\b[a-zA-Z0-9.-]+\.(?:com|org|net|io|ai|co|edu|gov|us|uk|ca|de|fr|au|in|nz)(?:/[\w\-./?%&=+#]*)?)")
 
+# One alternation, in priority order: where several kinds match at the same position
+# the earlier kind wins (address is heuristic; it is tried last and kept conservative).
+# Unlike the old pass-per-kind scrub, a match that starts earlier in the text wins over
+# an overlapping one of a higher-priority kind.
+# The zero-width guards only reject start positions where a kind cannot match, or where
+# its match would already have been found one position earlier, so the matches are the
+# same as the plain patterns; they keep the scan from entering every branch at every
+# character.
+_START = r"(?=[A-Za-z0-9._%+\-(])"
+_GUARDS = {
+	"EMAIL": r"(?<![A-Za-z0-9._%+-])",
+	"PHONE": r"(?=[+(\d])",
+	"URL": "",
+	"ADDR": r"(?<!\d)(?=\d)",
+}
+_KINDS = (
+	("EMAIL", EMAIL_RE.pattern),
+	("PHONE", PHONE_RE.pattern),
+	("URL", URL_RE.pattern),
+	# ADDRESS_HINT with a first-letter check before the suffix alternation, which makes
+	# the backtracking over the rest of the line cheap
+	("ADDR", r"(?i:\d+\s+[^\n,]+(?=[sarbld])" + _STREET_SUFFIX + ")"),
+)
+PII_RE = re.compile(_START + "(?:" + "|".join(f"(?P<{kind}>{_GUARDS[kind]}{pattern})" for kind, pattern in _KINDS) + ")")
 
-def _tokenize(text: str, pattern: re.Pattern, token_prefix: str, token_map: Dict[str, str]) -> str:
-	idx = 1
-	def repl(m: re.Match) -> str:
-		nonlocal idx
-		val = m.group(0)
-		token = f"[[{token_prefix}_{idx}]]"
-		token_map[token] = val
-		idx += 1
-		return token
-	return pattern.sub(repl, text)
+# Tokens produced by scrub_text; deliberately does not match the [[TAB]] render marker
+TOKEN_RE = re.compile(r"\[\[(?:EMAIL|PHONE|URL|ADDR)_\d+\]\]")
 
 
 def scrub_text(text: str) -> Tuple[str, Dict[str, str]]:
-	"""Return scrubbed text and a token->original map."""
+	"""Return scrubbed text and a token->original map.
+
+	Single left-to-right pass; tokens are numbered per kind in order of appearance.
+	"""
 	token_map: Dict[str, str] = {}
-	scrubbed = text
-	scrubbed = _tokenize(scrubbed, EMAIL_RE, "EMAIL", token_map)
-	scrubbed = _tokenize(scrubbed, PHONE_RE, "PHONE", token_map)
-	scrubbed = _tokenize(scrubbed, URL_RE, "URL", token_map)
-	# Address is heuristic; keep it conservative
-	scrubbed = _tokenize(scrubbed, ADDRESS_HINT, "ADDR", token_map)
-	return scrubbed, token_map
+	counts = dict.fromkeys((kind for kind, _ in _KINDS), 0)
+
+	def repl(m: re.Match) -> str:
+		kind = m.lastgroup
+		counts[kind] += 1
+		token = f"[[{kind}_{counts[kind]}]]"
+		token_map[token] = m.group(0)
+		return token
+
+	return PII_RE.sub(repl, text), token_map
+
 
+def rehydrate(value: Any, token_map: Dict[str, str]) -> Any:
+	"""Put the original values back for any scrub tokens in a string, or in the strings
+	of a JSON-like structure (dicts and lists are rebuilt, other values returned as-is).
+	Unknown tokens are left in place.
+	"""
+	if not token_map:
+		return value
+	if isinstance(value, str):
+		if "[[" not in value:
+			return value
+		return TOKEN_RE.sub(lambda m: token_map.get(m.group(0), m.group(0)), value)
+	if isinstance(value, dict):
+		return {k: rehydrate(v, token_map) for k, v in value.items()}
+	if isinstance(value, list):
+		return [rehydrate(v, token_map) for v in value]
+	return value
@@ -0,0 +1,129 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Stage:
+    """One node of the processing graph.
+
+    name: unique key; the stage's return value is published under it.
+    run: coroutine function called with a dict holding the values named in `requires`.
+    requires: names of other stages (or initial inputs) that must be resolved first.
+    """
+    name: str
+    run: Callable[[Dict[str, Any]], Awaitable[Any]]
+    requires: Tuple[str, ...] = ()
+
+
+StageCallback = Callable[[str, Any, int], Any]
+
+
+def _check_graph(stages: Iterable[Stage], inputs: Dict[str, Any]) -> None:
+    names = set(inputs)
+    for st in stages:
+        if st.name in names:
+            raise ValueError(f"duplicate stage/input name: {st.name}")
+        names.add(st.name)
+    for st in stages:
+        missing = [r for r in st.requires if r not in names]
+        if missing:
+            raise ValueError(f"stage '{st.name}' requires unknown inputs: {missing}")
+    # Cycle check (Kahn)
+    pending = {st.name: set(r for r in st.requires if r not in inputs) for st in stages}
+    while pending:
+        ready = [n for n, deps in pending.items() if not deps]
+        if not ready:
+            raise ValueError(f"stage graph has a cycle among: {sorted(pending)}")
+        for n in ready:
+            pending.pop(n)
+        for deps in pending.values():
+            deps.difference_update(ready)
+
+
+async def run_stages(
+    stages: List[Stage],
+    inputs: Optional[Dict[str, Any]] = None,
+    on_stage_done: Optional[StageCallback] = None,
+) -> Dict[str, Any]:
+    """Run `stages` as a dependency graph, starting each one as soon as its inputs resolve.
+
+    Independent stages run concurrently. Returns a dict of every input and stage result.
+    An input may be an asyncio future (or task) that is still running; stages that
+    require it wait for it, so work started before the graph can feed into it.
+    An exception in any stage cancels the stages still running and is re-raised.
+    `on_stage_done(name, result, duration_ms)` is called after each stage completes.
+    """
+    inputs = dict(inputs or {})
+    _check_graph(stages, inputs)
+
+    loop = asyncio.get_running_loop()
+    futures: Dict[str, asyncio.Future] = {}
+    for name, value in inputs.items():
+        if asyncio.isfuture(value):
+            futures[name] = value
+            continue
+        fut = loop.create_future()
+        fut.set_result(value)
+        futures[name] = fut
+    for st in stages:
+        futures[st.name] = loop.create_future()
+
+    async def _run(st: Stage) -> None:
+        try:
+            args = {r: await futures[r] for r in st.requires}
+            t0 = time.perf_counter()
+            result = await st.run(args)
+            duration_ms = int((time.perf_counter() - t0) * 1000)
+            logger.info("pipeline: stage=%s duration_ms=%d", st.name, duration_ms)
+            futures[st.name].set_result(result)
+            if on_stage_done is not None:
+                cb = on_stage_done(st.name, result, duration_ms)
+                if asyncio.iscoroutine(cb):
+                    await cb
+        except asyncio.CancelledError:
+            if not futures[st.name].done():
+                futures[st.name].cancel()
+            raise
+        except BaseException as e:
+            if not futures[st.name].done():
+                futures[st.name].set_exception(e)
+            raise
+
+    tasks = [asyncio.create_task(_run(st), name=f"stage:{st.name}") for st in stages]
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        # Silence "exception never retrieved" for futures nobody awaited
+        for fut in futures.values():
+            if fut.done() and not fut.cancelled():
+                fut.exception()
+        raise
+
+    return {name: fut.result() for name, fut in futures.items()}
+
+
+class RunReporter:
+    """Receives progress from one pipeline run. The base class ignores everything.
+
+    stage_done(name, result, duration_ms) is called once per finished stage;
+    token(stage, text) receives streamed model output while a stage is running;
+    metric(name, data) receives per-run measurements (e.g. the summary cascade outcome).
+    """
+
+    def stage_done(self, name: str, result: Any = None, duration_ms: int = 0) -> None:
+        pass
+
+    def token(self, stage: str, text: str) -> None:
+        pass
+
+    def metric(self, name: str, data: Dict[str, Any]) -> None:
+        pass
@@ -2,16 +2,10 @@ from __future__ import annotations
 from typing import List, Dict, Any, Optional
 import logging
 import json
-from app.services.llm import get_openai_client
+from app.services.llm import chat_completion
 
 logger = logging.getLogger(__name__)
 
-MODEL = "gpt-4o-mini"
-
-
-def _get_client():
-    return get_openai_client()
-
 
 SUMMARY_RULES = (
     "You are a conservative proofreader. Fix ONLY clear spelling mistakes and spacing/comma errors.\n"
@@ -24,21 +18,20 @@ SUMMARY_RULES = (
 )
 
 
-def proofread_summary_text(text: str) -> str:
+async def proofread_summary_text(text: str) -> str:
     text = (text or "").strip()
     if not text:
         return text
-    client = _get_client()
     try:
-        resp = client.chat.completions.create(
-            model=MODEL,
+        content = await chat_completion(
+            stage="proofread",
             messages=[
                 {"role": "system", "content": SUMMARY_RULES},
                 {"role": "user", "content": f"Correct this paragraph conservatively:\n{text}"},
             ],
             temperature=0,
         )
-        content = (resp.choices[0].message.content or "").strip()
+        content = (content or "").strip()
         return content or text
     except Exception:
         logger.exception("proofread_summary_text: LLM call failed; returning original text")
@@ -58,7 +51,7 @@ BULLETS_RULES = (
 )
 
 
-def proofread_bullets_across_resume(experience: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+async def proofread_bullets_across_resume(experience: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     # Flatten bullets
     index_map: List[tuple[int, int]] = []
     flat: List[str] = []
@@ -70,15 +63,14 @@ def proofread_bullets_across_resume(experience: List[Dict[str, Any]]) -> List[Di
     if not flat:
         return experience
 
-    client = _get_client()
     user = (
         "Here are resume bullets as a JSON array. Fix only obvious spelling and spacing/comma errors.\n"
         "Do NOT alter end punctuation. Return JSON with key 'bullets'.\n"
         f"Bullets: {json.dumps(flat, ensure_ascii=False)}"
     )
     try:
-        resp = client.chat.completions.create(
-            model=MODEL,
+        content = await chat_completion(
+            stage="proofread",
             response_format={"type": "json_object"},
             messages=[
                 {"role": "system", "content": BULLETS_RULES},
@@ -86,13 +78,13 @@ def proofread_bullets_across_resume(experience: List[Dict[str, Any]]) -> List[Di
             ],
             temperature=0,
         )
-        content = resp.choices[0].message.content or "{}"
+        content = content or "{}"
         obj = json.loads(content)
         updated = obj.get("bullets") if isinstance(obj, dict) else None
         if not isinstance(updated, list) or len(updated) != len(flat):
             logger.warning("proofread_bullets_across_resume: unexpected response; leaving bullets unchanged")
             return experience
-        new_experience = [dict(r) for r in experience]
+        new_experience = [dict(r, bullets=list(r.get("bullets") or [])) for r in experience]
         for (ri, bi), text in zip(index_map, updated):
             try:
                 new_experience[ri]["bullets"][bi] = str(text)
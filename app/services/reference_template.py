@@ -0,0 +1,83 @@
+from __future__ import annotations
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from xml.sax.saxutils import escape
+import io
+import logging
+import re
+import threading
+import zipfile
+
+logger = logging.getLogger(__name__)
+
+_HEADER_PART_RE = re.compile(r"^word/header\d*\.xml$")
+
+
+def header_title_line(data: Dict[str, Any]) -> str:
+	# We expect the template's Custom Header 2 to look like: "<LEVEL> <TITLE>"
+	exp_level = ""
+	if data.get("experience_level"):
+		exp_level = data["experience_level"].strip()
+	# If a custom level is provided, prefer it
+	if data.get("experience_custom"):
+		exp_level = data["experience_custom"].strip()
+	full_title_line = data.get("candidate_title", "")
+	if exp_level:
+		full_title_line = f"{exp_level} {full_title_line}".strip()
+	return full_title_line
+
+
+class ReferenceTemplate:
+	"""A reference .docx held in memory as its zip entries.
+
+	Per-run copies are produced by replacing the header placeholders in the raw header
+	XML and writing the entries back out; the document is never parsed as a whole.
+	"""
+
+	def __init__(self, path: Path) -> None:
+		self.path = Path(path)
+		self.mtime = self.path.stat().st_mtime
+		self.entries: List[Tuple[zipfile.ZipInfo, bytes]] = []
+		self.header_parts: Dict[str, bytes] = {}
+		with zipfile.ZipFile(self.path) as zf:
+			for info in zf.infolist():
+				data = zf.read(info)
+				self.entries.append((info, data))
+				if _HEADER_PART_RE.match(info.filename):
+					self.header_parts[info.filename] = data
+
+	def render(self, data: Dict[str, Any]) -> bytes:
+		"""Return the template bytes with {{CANDIDATE_NAME}} / {{CANDIDATE_TITLE}} filled in."""
+		replacements = [
+			(b"{{CANDIDATE_NAME}}", escape(data.get("candidate_name", "")).encode("utf-8")),
+			(b"{{CANDIDATE_TITLE}}", escape(header_title_line(data)).encode("utf-8")),
+		]
+		out = io.BytesIO()
+		with zipfile.ZipFile(out, "w") as zf:
+			for info, raw in self.entries:
+				if info.filename in self.header_parts:
+					for key, value in replacements:
+						raw = raw.replace(key, value)
+				zf.writestr(info, raw)
+		return out.getvalue()
+
+	def write(self, data: Dict[str, Any], out_path: Path) -> Path:
+		Path(out_path).write_bytes(self.render(data))
+		return Path(out_path)
+
+
+_templates: Dict[Path, ReferenceTemplate] = {}
+_lock = threading.Lock()
+
+
+def get_reference_template(path: Path) -> ReferenceTemplate:
+	"""Cached template for `path`, reloaded when the file's mtime changes."""
+	path = Path(path)
+	mtime = path.stat().st_mtime
+	with _lock:
+		tpl: Optional[ReferenceTemplate] = _templates.get(path)
+		if tpl is None or tpl.mtime != mtime:
+			tpl = ReferenceTemplate(path)
+			_templates[path] = tpl
+			logger.info("reference_template: loaded %s parts=%d", path.name, len(tpl.entries))
+		return tpl
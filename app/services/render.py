@@ -1,73 +1,48 @@
 from __future__ import annotations
 from pathlib import Path
+import asyncio
 import subprocess
-from typing import Dict, Any, Tuple
-import docx
-from docx.enum.text import WD_TAB_ALIGNMENT
-from docx.enum.text import WD_LINE_SPACING
-from docx.shared import Pt
-from jinja2 import Environment, FileSystemLoader, select_autoescape
-from app.config import VIEWS_DIR, get_pandoc_executable
-from app.services.styles import load_style_names
+from typing import Dict, Any, Optional, Tuple
+import app.config as cfg
+from app.config import get_pandoc_executable
+from app.services.docx_builder import build_resume_docx
+from app.services.docx_postprocess import postprocess_docx
+from app.services.reference_template import get_reference_template
+from app.services.template_registry import ResumeTemplate, get_template_registry
+from app.services.workers import render_slots
 
 
-def _env() -> Environment:
-	env = Environment(
-		loader=FileSystemLoader(str(VIEWS_DIR)),
-		autoescape=select_autoescape(["html", "xml", "md"]),
-		trim_blocks=True,
-		lstrip_blocks=True,
-	)
-	# Keep globals, but we'll also pass explicitly
-	env.globals["styles"] = load_style_names()
-	return env
-
-
-def render_markdown_and_docx(data: Dict[str, Any], run_dir: Path, reference_docx: Path) -> Tuple[Path, Path]:
-	# Create a custom reference_docx for this run with the dynamic header.
-	custom_reference_docx = run_dir / "Reference-custom.docx"
-	doc = docx.Document(str(reference_docx))
+async def render_markdown_and_docx(data: Dict[str, Any], run_dir: Path, template: Optional[ResumeTemplate] = None) -> Tuple[Path, Path]:
+	"""Render resume.md and resume.docx into run_dir using `template` (default when None).
 
-	# Define the placeholder mappings, including experience level prefix
-	experience_prefix = data.get("candidate_title", "").strip()
-	exp_level = ""
-	# We expect the template's Custom Header 2 to look like: "<LEVEL> <TITLE>"
-	# We'll place the level (if any) before the title.
-	if data.get("experience_level"):
-		exp_level = data["experience_level"].strip()
-	# If a custom level is provided, prefer it
-	if data.get("experience_custom"):
-		exp_level = data["experience_custom"].strip()
+	RESUME_FORMATTER_RENDER_BACKEND selects how the DOCX is made: "docx" (default) builds
+	it directly into the reference template with python-docx; "pandoc" converts resume.md
+	and fixes the result up afterwards. resume.md is written either way.
 
-	full_title_line = data.get("candidate_title", "")
-	if exp_level:
-		full_title_line = f"{exp_level} {full_title_line}".strip()
-
-	# Placeholders in the header
-	replacements = {
-		"{{CANDIDATE_NAME}}": data.get("candidate_name", ""),
-		"{{CANDIDATE_TITLE}}": full_title_line,
-	}
+	Renders are bounded by a shared semaphore; callers queue for a slot. The python-docx
+	work runs in a thread and pandoc runs as an async subprocess, so the event loop stays free.
+	"""
+	template = template or get_template_registry().get()
+	docx_file = run_dir / "resume.docx"
+	async with render_slots():
+		if cfg.RENDER_BACKEND == "pandoc":
+			custom_reference_docx, md_path = await asyncio.to_thread(_prepare_inputs, data, run_dir, template)
+			await _run_pandoc(md_path, docx_file, custom_reference_docx)
+			await asyncio.to_thread(postprocess_docx, docx_file, template.style_names())
+		else:
+			md_path = await asyncio.to_thread(_render_native, data, run_dir, template, docx_file)
+	return md_path, docx_file
 
-	# Find and replace placeholder text in the header
-	header = doc.sections[0].header
-	for p in header.paragraphs:
-		for run in p.runs:
-			for key, value in replacements.items():
-				if key in run.text:
-					run.text = run.text.replace(key, value)
 
-	doc.save(str(custom_reference_docx))
+def _render_native(data: Dict[str, Any], run_dir: Path, template: ResumeTemplate, docx_file: Path) -> Path:
+	styles = template.style_names()
+	md_path = _write_markdown(data, run_dir, template, styles)
+	build_resume_docx(data, template.reference_docx, docx_file, styles)
+	return md_path
 
-	# Now, proceed with Pandoc rendering, using the custom reference doc
-	styles = load_style_names()
-	tpl = _env().get_template("resume.md.j2")
-	md_str = tpl.render(data=data, styles=styles)
-	md_path = run_dir / "resume.md"
-	md_path.write_text(md_str)
 
+async def _run_pandoc(md_path: Path, docx_file: Path, custom_reference_docx: Path) -> None:
 	# Convert Markdown to DOCX using Pandoc
-	docx_file = run_dir / "resume.docx"
 	command = [
 		get_pandoc_executable(),
 		str(md_path),
@@ -77,57 +52,38 @@ def render_markdown_and_docx(data: Dict[str, Any], run_dir: Path, reference_docx
 		str(docx_file),
 		f"--reference-doc={custom_reference_docx}",
 	]
-	subprocess.run(command, check=True)
+	proc = await asyncio.create_subprocess_exec(
+		*command,
+		stdout=asyncio.subprocess.PIPE,
+		stderr=asyncio.subprocess.PIPE,
+	)
+	try:
+		stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=cfg.PANDOC_TIMEOUT_S)
+	except asyncio.TimeoutError:
+		proc.kill()
+		await proc.wait()
+		raise RuntimeError(f"pandoc timed out after {cfg.PANDOC_TIMEOUT_S}s") from None
+	except asyncio.CancelledError:
+		proc.kill()
+		await proc.wait()
+		raise
+	if proc.returncode != 0:
+		raise subprocess.CalledProcessError(proc.returncode, command, output=stdout, stderr=stderr)
 
-	# Ensure right-aligned tab stop for employer/date lines (Custom Header 2)
-	post_doc = docx.Document(str(docx_file))
-	section = post_doc.sections[0]
-	usable_width = section.page_width - section.left_margin - section.right_margin
-	for p in post_doc.paragraphs:
-		# Replace placeholder with a real tab (spanning multiple runs if needed)
-		text = ''.join(run.text for run in p.runs)
-		if '[[TAB]]' in text:
-			new_text = text.replace('[[TAB]]', '\t')
-			# Clear runs and set a single run with replaced text
-			for _ in range(len(p.runs)):
-				p.runs[0].clear()
-				p._element.remove(p._element.r_lst[0]) if hasattr(p._element, 'r_lst') else None
-			p.add_run(new_text)
-		try:
-			if p.style and p.style.name == "Custom Header 2":
-				stops = p.paragraph_format.tab_stops
-				stops.clear_all()
-				stops.add_tab_stop(usable_width, alignment=WD_TAB_ALIGNMENT.RIGHT)
-		except Exception:
-			pass
 
-	# Tighten spacing between job header and role header lines
-	paras = post_doc.paragraphs
-	for i in range(len(paras) - 1):
-		p = paras[i]
-		n = paras[i + 1]
-		if (p.style and p.style.name == "Custom Header 2") and (n.style and n.style.name == "Custom Heading 1"):
-			pfp = p.paragraph_format
-			pfn = n.paragraph_format
-			if pfp is not None:
-				pfp.space_after = Pt(0)
-				pfp.line_spacing = None
-				pfp.line_spacing_rule = WD_LINE_SPACING.SINGLE
-			if pfn is not None:
-				pfn.space_before = Pt(0)
-				pfn.space_after = Pt(0)
-				pfn.line_spacing = None
-				pfn.line_spacing_rule = WD_LINE_SPACING.SINGLE
+def _prepare_inputs(data: Dict[str, Any], run_dir: Path, template: ResumeTemplate) -> Tuple[Path, Path]:
+	# Create a custom reference_docx for this run with the dynamic header
+	# (patched from the in-memory template; no python-docx load/save)
+	custom_reference_docx = get_reference_template(template.reference_docx).write(data, run_dir / "Reference-custom.docx")
 
-	# Ensure bullet paragraphs use the Custom Bullets 1 style (Calibri 11 per template)
-	for p in post_doc.paragraphs:
-		try:
-			ppr = getattr(p._p, 'pPr', None)
-			is_list = ppr is not None and getattr(ppr, 'numPr', None) is not None
-			if is_list:
-				p.style = "Custom Bullets 1"
-		except Exception:
-			pass
-	post_doc.save(str(docx_file))
+	# Now, proceed with Pandoc rendering, using the custom reference doc
+	return custom_reference_docx, _write_markdown(data, run_dir, template)
 
-	return md_path, docx_file
+
+def _write_markdown(data: Dict[str, Any], run_dir: Path, template: ResumeTemplate, styles: Optional[Dict[str, str]] = None) -> Path:
+	styles = styles or template.style_names()
+	tpl = get_template_registry().markdown_template(template)
+	md_str = tpl.render(data=data, styles=styles)
+	md_path = run_dir / "resume.md"
+	md_path.write_text(md_str)
+	return md_path
@@ -0,0 +1,123 @@
+from __future__ import annotations
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from typing import List, Optional, Tuple
+import re
+
+SECTION_KINDS = (
+	"contact", "summary", "skills", "experience", "education", "certifications", "clearances",
+	"projects", "languages", "personal", "other",
+)
+
+# Section headings seen in our resumes, by kind. A heading is a whole line; case and a
+# trailing colon are ignored. Text before the first heading is the contact block.
+_HEADINGS = (
+	("contact", r"contact(?:\s+(?:info(?:rmation)?|details))?|personal\s+(?:info(?:rmation)?|details)"),
+	("summary",
+		r"(?:professional\s+|executive\s+|career\s+)?summary(?:\s+of\s+qualifications)?|(?:professional\s+)?profile"
+		r"|(?:career\s+)?objective|about\s+me|(?:professional\s+)?overview"),
+	("skills",
+		r"(?:technical\s+|key\s+|core\s+)?skills(?:\s+summary)?|(?:technical\s+)?skill\s*set|core\s+competenc(?:y|ies)"
+		r"|technical\s+proficienc(?:y|ies)|technology\s+summary|tools\s*(?:&|and)\s*technologies"
+		r"|technical\s+expertise|areas\s+of\s+expertise"),
+	("experience",
+		r"(?:professional\s+|work\s+|relevant\s+|employment\s+|career\s+)?(?:experience|history|background)"
+		r"|employment(?:\s+history)?"),
+	("education",
+		r"education(?:\s+(?:and|&)\s+(?:training|certifications?))?|academic\s+(?:background|qualifications)"
+		r"|educational\s+background"),
+	("certifications", r"(?:licenses?\s+(?:and|&)\s+)?certifications?|(?:professional\s+)?certificates|credentials"),
+	("clearances", r"(?:security\s+)?clearances?"),
+	("projects", r"(?:key\s+|personal\s+|academic\s+)?projects"),
+	("languages", r"(?:programming\s+)?languages"),
+	# References, hobbies and interests: nothing a resume summary or skill list draws on
+	("personal", r"references|(?:hobbies|interests)(?:\s+(?:and|&)\s+(?:hobbies|interests))?|hobbies|interests"),
+	("other",
+		r"awards(?:\s+(?:and|&)\s+honou?rs)?|honou?rs|publications|volunteer(?:ing|\s+experience)?"
+		r"|achievements|accomplishments"),
+)
+_HEADING_RE = re.compile(
+	r"^[^\S\n]*(?:" + "|".join(f"(?P<{kind}>{pattern})" for kind, pattern in _HEADINGS) + r")[^\S\n]*:?[^\S\n]*$",
+	re.IGNORECASE | re.MULTILINE,
+)
+
+_MONTH = r"(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?"
+_DATE = rf"(?:{_MONTH}\s*,?\s*\d{{4}}|\d{{1,2}}/\d{{2,4}}|\d{{4}}-\d{{1,2}}|\d{{4}})"
+_RANGE_RE = re.compile(
+	rf"{_DATE}\s*(?:-|–|—|to|until|through|thru)\s*(?:{_DATE}|present|current|now|to\s+date|till\s+date)",
+	re.IGNORECASE,
+)
+BULLET_RE = re.compile(r"^\s*[-•·*▪●◦]")
+
+
+def is_role_date_line(line: str) -> bool:
+	"""A short non-bullet line with a date range: the date line of a role."""
+	s = line.strip()
+	return bool(s) and len(s) <= 160 and not BULLET_RE.match(s) and bool(_RANGE_RE.search(s))
+
+
+@dataclass(frozen=True)
+class Section:
+	"""One section of the resume text: [start, end) covers the heading line and the
+	body, which starts at body_start. The leading contact block has no heading."""
+	kind: str
+	heading: str
+	start: int
+	body_start: int
+	end: int
+
+
+@dataclass(frozen=True)
+class ResumeSections:
+	text: str
+	sections: Tuple[Section, ...]
+
+	def of(self, kind: str) -> List[Section]:
+		return [s for s in self.sections if s.kind == kind]
+
+	def has(self, kind: str) -> bool:
+		return any(s.kind == kind for s in self.sections)
+
+	def body(self, section: Section) -> str:
+		return self.text[section.body_start:section.end]
+
+	def text_of(self, *kinds: str, headings: bool = True) -> str:
+		"""The sections of the given kinds, in document order ("" when there are none)."""
+		return "".join(
+			self.text[s.start if headings else s.body_start:s.end] for s in self.sections if s.kind in kinds
+		)
+
+
+def section_kind(line: str) -> Optional[str]:
+	"""The section kind if `line` is a section heading, else None."""
+	m = _HEADING_RE.match(line.strip())
+	return m.lastgroup if m else None
+
+
+@lru_cache(maxsize=32)
+def segment_resume(text: str) -> ResumeSections:
+	"""Split resume text into typed sections in one scan for heading lines.
+
+	A heading like "Projects" inside the work history, followed by more dated roles,
+	is kept as part of the experience section. Memoized on the text, so every stage
+	of a run shares the same result.
+	"""
+	sections: List[Section] = []
+	for m in _HEADING_RE.finditer(text):
+		if sections:
+			sections[-1] = replace(sections[-1], end=m.start())
+		sections.append(Section(m.lastgroup, m.group(0).strip(), m.start(), min(m.end() + 1, len(text)), len(text)))
+	first = sections[0].start if sections else len(text)
+	merged: List[Section] = []
+	for sec in sections:
+		prev = merged[-1] if merged else None
+		if (
+			prev is not None and prev.kind == "experience" and sec.kind in ("projects", "other")
+			and any(is_role_date_line(line) for line in text[sec.body_start:sec.end].splitlines())
+		):
+			merged[-1] = replace(prev, end=sec.end)
+		else:
+			merged.append(sec)
+	if text[:first].strip():
+		merged.insert(0, Section("contact", "", 0, 0, first))
+	return ResumeSections(text, tuple(merged))
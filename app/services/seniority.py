@@ -1,18 +1,15 @@
 from __future__ import annotations
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 import json
 import logging
+import re
 from datetime import date
-from app.services.llm import get_openai_client
+import app.config as cfg
+from app.services.dates import parse_year_month
+from app.services.llm import chat_completion
 
 logger = logging.getLogger(__name__)
 
-MODEL = "gpt-4o-mini"
-
-
-def _get_client():
-    return get_openai_client()
-
 
 SYSTEM_PROMPT = (
     "You are an expert resume analyst. Determine the correct seniority LEVEL using ONLY the oldest work start date.\n"
@@ -24,14 +21,77 @@ SYSTEM_PROMPT = (
 )
 
 
-def infer_java_full_stack_seniority(ss_work: List[Dict[str, Any]] | None, internal_experience: List[Dict[str, Any]] | None) -> str:
-    """Ask the LLM to choose the seniority title from the oldest start date.
+# YYYY-MM-DD / YYYY-MM / YYYY (skill-scope and internal schema) keep the day; anything
+# else ("MM/YYYY" from normalize, "Jan 2019") goes through the shared date parser
+_ISO_RE = re.compile(r"^(\d{4})(?:[-/](\d{1,2})(?:[-/](\d{1,2}))?)?$")
+
+
+def _parse_start(value: Any) -> Optional[Tuple[int, int, int]]:
+    s = str(value or "").strip()
+    m = _ISO_RE.match(s)
+    if m:
+        y, mo, d = int(m.group(1)), int(m.group(2) or 1), int(m.group(3) or 1)
+    else:
+        ym = parse_year_month(s)
+        if not ym:
+            return None
+        y, mo, d = ym[0], ym[1], 1
+    if not (1900 <= y <= 2100 and 1 <= mo <= 12 and 1 <= d <= 31):
+        return None
+    return y, mo, d
+
+
+def _oldest(values: Iterable[Any]) -> Optional[Tuple[int, int, int]]:
+    parsed = [p for p in (_parse_start(v) for v in values) if p]
+    return min(parsed) if parsed else None
+
+
+def level_for_years(years: int) -> str:
+    """Thresholds from SYSTEM_PROMPT, on whole years: 11+ SME, 6-10 Senior, 0-5 Journeyman."""
+    if years >= 11:
+        return "SME"
+    if years >= 6:
+        return "Senior"
+    return "Journeyman"
+
+
+def infer_seniority_locally(ss_work: List[Dict[str, Any]] | None, internal_experience: List[Dict[str, Any]] | None, today: date | None = None) -> str:
+    """Deterministic version of the LLM rule: bucket whole years since the oldest start date.
+
+    Prefers ss_work 'startDate'; falls back to internal_experience 'start_date'.
+    Returns '' when neither list has a parseable date.
+    """
+    today = today or date.today()
+    oldest = _oldest(w.get("startDate") for w in (ss_work or []))
+    if oldest is None:
+        oldest = _oldest(r.get("start_date") for r in (internal_experience or []))
+    if oldest is None:
+        return ""
+    y, m, d = oldest
+    months = (today.year - y) * 12 + (today.month - m) - (1 if today.day < d else 0)
+    return level_for_years(max(0, months) // 12)
+
+
+async def infer_java_full_stack_seniority(ss_work: List[Dict[str, Any]] | None, internal_experience: List[Dict[str, Any]] | None) -> str:
+    """Choose the seniority title from the oldest start date.
 
     ss_work: list of skill-scope 'work' entries with 'startDate' (YYYY-MM-DD) if available.
     internal_experience: list of normalized roles with 'start_date' like 'MM/YYYY' or 'YYYY-MM'.
+    Uses the local rule engine; the LLM is asked only when no usable date exists
+    (or when RESUME_FORMATTER_SENIORITY_MODE is 'llm').
     Returns a plain title string or empty string on failure.
     """
-    client = _get_client()
+    if cfg.SENIORITY_MODE != "llm":
+        level = infer_seniority_locally(ss_work, internal_experience)
+        if level:
+            logger.info("seniority_local: %s", level)
+            return level
+        logger.info("seniority_local: no parseable start date; asking the LLM")
+    return await infer_seniority_with_llm(ss_work, internal_experience)
+
+
+async def infer_seniority_with_llm(ss_work: List[Dict[str, Any]] | None, internal_experience: List[Dict[str, Any]] | None) -> str:
+    """Ask the LLM to choose the seniority title from the oldest start date."""
     today = date.today().isoformat()
     payload = {
         "today": today,
@@ -39,8 +99,8 @@ def infer_java_full_stack_seniority(ss_work: List[Dict[str, Any]] | None, intern
         "internal_experience": internal_experience or [],
     }
     try:
-        resp = client.chat.completions.create(
-            model=MODEL,
+        content = await chat_completion(
+            stage="seniority",
             messages=[
                 {"role": "system", "content": SYSTEM_PROMPT},
                 {"role": "user", "content": (
@@ -52,7 +112,7 @@ def infer_java_full_stack_seniority(ss_work: List[Dict[str, Any]] | None, intern
             ],
             temperature=0,
         )
-        title = (resp.choices[0].message.content or "").strip()
+        title = (content or "").strip()
         # Basic whitelist to avoid odd outputs
         allowed = {"Journeyman", "Senior", "SME"}
         if title in allowed:
@@ -1,3 +1,5 @@
+import json
+
 JSON_RESUME_SCHEMA = {
 	"source_file": "string",
 	"basics": {
@@ -108,3 +110,58 @@ JSON_RESUME_SCHEMA = {
 	}]
 }
 
+
+# Fields that convert._skill_scope_to_internal reads (plus work.role_order, which the
+# extraction rules ask for). True keeps the schema value as-is; a dict recurses, and
+# for list-of-object fields it applies to the element.
+INTERNAL_FIELDS = {
+	"basics": {
+		"name": True,
+		"summary": True,
+		"location": {"city": True},
+	},
+	"work": {
+		"name": True,
+		"position": True,
+		"startDate": True,
+		"endDate": True,
+		"is_current": True,
+		"role_order": True,
+		"summary": True,
+		"highlights": True,
+	},
+	"education": {
+		"institution": True,
+		"area": True,
+		"studyType": True,
+		"endDate": True,
+	},
+	"certificates": {"name": True},
+	"skills": {"name": True, "keywords": True},
+}
+
+
+def project_schema(schema, fields):
+	"""Return the part of `schema` selected by `fields`, keeping the schema's key order."""
+	if fields is True:
+		return schema
+	if isinstance(schema, list):
+		return [project_schema(schema[0], fields)] if schema else []
+	if isinstance(schema, dict):
+		return {k: project_schema(v, fields[k]) for k, v in schema.items() if k in fields}
+	return schema
+
+
+SCHEMA_PROFILES = {
+	"full": JSON_RESUME_SCHEMA,
+	"minimal": project_schema(JSON_RESUME_SCHEMA, INTERNAL_FIELDS),
+}
+
+# Serialized once; compact separators keep the prompt small
+SCHEMA_TEXT = {name: json.dumps(schema, separators=(",", ":")) for name, schema in SCHEMA_PROFILES.items()}
+
+
+def schema_text(profile: str) -> str:
+	if profile not in SCHEMA_TEXT:
+		raise ValueError(f"unknown schema profile '{profile}' (expected one of {sorted(SCHEMA_TEXT)})")
+	return SCHEMA_TEXT[profile]
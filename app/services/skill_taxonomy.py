@@ -0,0 +1,177 @@
+from __future__ import annotations
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import json
+import logging
+import math
+import re
+import threading
+from rapidfuzz import fuzz, process
+import app.config as cfg
+
+logger = logging.getLogger(__name__)
+
+FUZZY_CUTOFF = 90
+# Shorter skills only match exactly: partial_ratio scores "R" or "Go" 100 against any
+# alias that contains the letters
+FUZZY_MIN_CHARS = 4
+# Alphabetic aliases this short ("go", "r") are ordinary words in prose and are not
+# scanned for ("c#" still is)
+MENTION_MIN_CHARS = 3
+_MEMO_MAX = 20000
+
+
+def _key(s: str) -> str:
+	return " ".join(s.lower().split())
+
+
+_PAREN_RE = re.compile(r"\([^)]*\)")
+_VERSION_RE = re.compile(r"v?\d+(?:\.(?:\d+|x))*\+?")
+_GENERIC_WORDS = {"framework", "development", "programming", "language", "platform"}
+
+
+def _starts_sentence(text: str, pos: int) -> bool:
+	before = text[:pos].rstrip()
+	return not before or before[-1] in ".!?:;"
+
+
+def _has_version(key: str) -> bool:
+	return any(_VERSION_RE.fullmatch(t) for t in _PAREN_RE.sub(" ", key).split())
+
+
+def _core(key: str) -> str:
+	"""The skill without notes or generic words ("react development (advanced)" -> "react")."""
+	tokens = [t for t in _PAREN_RE.sub(" ", key).split() if t not in _GENERIC_WORDS]
+	return " ".join(tokens) or key
+
+
+class SkillTaxonomy:
+	"""Canonical skill names and their aliases, with a memoized lookup.
+
+	Aliases are spelling variants only ("k8s", "ReactJS"); editions and versions are
+	skills of their own. Exact (case- and whitespace-insensitive) hits come from a dict.
+	A skill with a version number ("Python 2.7", "Spring Boot 2.x") is matched exactly
+	or not at all, so the version is never lost. Otherwise the skill
+	is looked up again without parenthesized notes and generic words ("framework",
+	"development"), then matched with a whole-string fuzz.ratio >= FUZZY_CUTOFF, which
+	tolerates typos but never lets a shorter alias stand in for a longer skill ("NoSQL"
+	is not "SQL"). Unmatched skills are returned stripped, unchanged.
+	"""
+
+	def __init__(self, skills: Dict[str, List[str]], ambiguous: Iterable[str] = ()) -> None:
+		self._exact: Dict[str, str] = {}
+		for canonical, aliases in skills.items():
+			for alias in (canonical, *aliases):
+				self._exact.setdefault(_key(alias), canonical)
+		# Longest first, so the length window is one slice and ties go to the longer alias
+		self._aliases = sorted(self._exact, key=len, reverse=True)
+		self._neg_lengths = [-len(a) for a in self._aliases]
+		self._memo: Dict[str, Optional[str]] = {}
+		# Aliases that are also ordinary words ("react", "spring", "rest"); see mentions
+		self._ambiguous = {_key(a) for a in ambiguous}
+		self._mention_res: Dict[bool, re.Pattern] = {}
+
+	def __len__(self) -> int:
+		return len(self._exact)
+
+	def _fuzzy(self, key: str) -> Optional[str]:
+		n = len(key)
+		if n < FUZZY_MIN_CHARS:
+			return None
+		# ratio = 2 * matches / (len(a) + len(b)), so only aliases of a similar length can reach the cutoff
+		r = FUZZY_CUTOFF / 100
+		lo = bisect_left(self._neg_lengths, -int(n * (2 - r) / r))
+		hi = bisect_right(self._neg_lengths, -math.ceil(n * r / (2 - r)))
+		best = process.extractOne(
+			key, self._aliases[lo:hi], scorer=fuzz.ratio, processor=None, score_cutoff=FUZZY_CUTOFF
+		)
+		return self._exact[best[0]] if best else None
+
+	def _match(self, key: str) -> Optional[str]:
+		hit = self._exact.get(key)
+		if hit or _has_version(key):
+			return hit
+		core = _core(key)
+		return self._exact.get(core) or self._fuzzy(core)
+
+	def canonicalize(self, skills: Iterable[str]) -> List[str]:
+		"""Canonical form of each skill, in order; each distinct unseen skill is matched once."""
+		skills = list(skills)
+		keys = [_key(s) for s in skills]
+		memo = self._memo
+		for key in dict.fromkeys(keys):
+			if key in memo:
+				continue
+			if len(memo) >= _MEMO_MAX:
+				memo.clear()
+			memo[key] = self._match(key)
+		return [memo.get(key) or s.strip() for s, key in zip(skills, keys)]
+
+	def _mention_pattern(self, strict: bool) -> re.Pattern:
+		pattern = self._mention_res.get(strict)
+		if pattern is None:
+			alternatives = []
+			for a in self._aliases:
+				if strict and a in self._ambiguous:
+					alternatives.append(f"(?:{re.escape(a.capitalize())}|{re.escape(a.upper())})")
+				elif len(a) >= MENTION_MIN_CHARS or not a.isalpha():
+					alternatives.append("(?i:" + re.escape(a).replace(r"\ ", r"\s+") + ")")
+			pattern = re.compile(r"(?<![A-Za-z0-9])(?:" + ("|".join(alternatives) or "(?!)") + r")(?![A-Za-z0-9+#])")
+			self._mention_res[strict] = pattern
+		return pattern
+
+	def mentions(self, text: str, strict: bool = True) -> Set[str]:
+		"""Canonical names of the skills whose aliases appear in free text (whole words,
+		longest alias first). Aliases are case-insensitive, except (when `strict`) the
+		ambiguous ones: those count only capitalized or upper-case ("React", "REST") and
+		not as the first word of a sentence, so "can react quickly" is not a technology.
+		Use strict=False for text that is known to be about skills, or lower-cased."""
+		found: Set[str] = set()
+		for m in self._mention_pattern(strict).finditer(text):
+			key = _key(m.group(0))
+			if strict and key in self._ambiguous and _starts_sentence(text, m.start()):
+				continue
+			found.add(self._exact[key])
+		return found
+
+
+def _taxonomy_path() -> Path:
+	return Path(cfg.SKILL_TAXONOMY) if cfg.SKILL_TAXONOMY else cfg.DATA_DIR / "skill_taxonomy.json"
+
+
+def _load(path: Path) -> SkillTaxonomy:
+	try:
+		data = json.loads(path.read_text(encoding="utf-8"))
+		skills, ambiguous = data.get("skills", {}), data.get("ambiguous", [])
+	except Exception:
+		logger.exception("skill_taxonomy: could not read %s; canonicalization disabled", path)
+		skills, ambiguous = {}, []
+	taxonomy = SkillTaxonomy(
+		{str(k): [str(a) for a in v] for k, v in skills.items() if isinstance(v, list)},
+		ambiguous=[str(a) for a in ambiguous],
+	)
+	logger.info("skill_taxonomy: loaded %s aliases=%d", path, len(taxonomy))
+	return taxonomy
+
+
+_cached: Optional[Tuple[Path, Optional[float], SkillTaxonomy]] = None
+_lock = threading.Lock()
+
+
+def get_skill_taxonomy() -> SkillTaxonomy:
+	"""The configured taxonomy; re-read (and its memo dropped) when the file's mtime changes."""
+	global _cached
+	path = _taxonomy_path()
+	try:
+		mtime: Optional[float] = path.stat().st_mtime
+	except OSError:
+		mtime = None
+	with _lock:
+		if _cached is None or _cached[0] != path or _cached[1] != mtime:
+			_cached = (path, mtime, _load(path))
+		return _cached[2]
+
+
+def canonicalize_skills(skills: Iterable[str]) -> List[str]:
+	return get_skill_taxonomy().canonicalize(skills)
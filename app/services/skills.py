@@ -2,55 +2,37 @@ from __future__ import annotations
 from typing import List, Optional, Dict, Any
 import logging
 import re
-from app.services.llm import get_openai_client
+from app.services.llm import chat_completion
+from app.services.sections import ResumeSections, segment_resume
 
 logger = logging.getLogger(__name__)
 
-MODEL = "gpt-4o-mini"
 
-
-def _get_client():
-    return get_openai_client()
-
-
-_SKILLS_HEADINGS = [
-    r"^skills$",
-    r"^technical\s+skills$",
-    r"^core\s+competenc(?:y|ies)$",
-    r"^technical\s+proficienc(?:y|ies)$",
-    r"^technology\s+summary$",
-    r"^tools\s*&\s*technologies$",
-]
-_HEADING_RE = re.compile("|".join(_SKILLS_HEADINGS), re.IGNORECASE)
-
-
-def extract_candidate_skills_from_text(raw_text: str) -> List[str]:
+def extract_candidate_skills_from_text(raw_text: str, sections: Optional[ResumeSections] = None) -> List[str]:
     """Heuristically parse a candidate-provided skills section from raw resume text.
 
+    sections: the run's segmentation of raw_text, if already computed.
     Returns a list of skill tokens if a dedicated skills section is found; else [].
     """
     if not raw_text:
         return []
+    sections = sections or segment_resume(raw_text)
+    body = sections.text_of("skills", headings=False)
+    if not body:
+        return []
 
-    lines = [l.strip() for l in raw_text.splitlines()]
     skills_lines: List[str] = []
-    in_section = False
-    for line in lines:
-        if not in_section:
-            if _HEADING_RE.search(line.lower()):
-                in_section = True
-                continue
-        else:
-            if not line or len(line) > 200:
-                # stop on blank or suspiciously long line (likely next section)
-                if skills_lines:
-                    break
-                else:
-                    continue
-            # Stop if line looks like a new section heading (all caps wordy line)
-            if re.match(r"^[A-Z][A-Z\s&/-]{3,}$", line) and not re.search(r"[,;]", line):
+    for line in (l.strip() for l in body.splitlines()):
+        if not line or len(line) > 200:
+            # stop on blank or suspiciously long line (likely next section)
+            if skills_lines:
                 break
-            skills_lines.append(line)
+            else:
+                continue
+        # Stop if line looks like a new section heading (all caps wordy line)
+        if re.match(r"^[A-Z][A-Z\s&/-]{3,}$", line) and not re.search(r"[,;]", line):
+            break
+        skills_lines.append(line)
 
     # Tokenize collected lines
     tokens: List[str] = []
@@ -79,7 +61,7 @@ def extract_candidate_skills_from_text(raw_text: str) -> List[str]:
     return ordered if len(ordered) >= 4 else []
 
 
-def organize_skills_for_role(skills: List[str], experience: List[Dict[str, Any]], candidate_title: str = "") -> List[str]:
+async def organize_skills_for_role(skills: List[str], experience: List[Dict[str, Any]], candidate_title: str = "") -> List[str]:
     """Use the LLM to reorder/group the given skills appropriately for the candidate's context.
 
     - No new skills may be added; no unrelated deletions.
@@ -89,7 +71,6 @@ def organize_skills_for_role(skills: List[str], experience: List[Dict[str, Any]]
     if not skills:
         return skills
 
-    client = _get_client()
     exp_roles = ", ".join([e.get("role", "").strip() for e in (experience or []) if e.get("role")])
     sys = (
         "You are a resume editor. Reorder the provided list of skills to group similar items adjacently and to prioritize what makes sense for the candidate's likely role (e.g., Java full stack vs. cloud engineer).\n"
@@ -103,8 +84,8 @@ def organize_skills_for_role(skills: List[str], experience: List[Dict[str, Any]]
     )
 
     try:
-        resp = client.chat.completions.create(
-            model=MODEL,
+        content = await chat_completion(
+            stage="skills",
             response_format={"type": "json_object"},
             messages=[
                 {"role": "system", "content": sys},
@@ -112,7 +93,7 @@ def organize_skills_for_role(skills: List[str], experience: List[Dict[str, Any]]
             ],
             temperature=0,
         )
-        content = resp.choices[0].message.content or "{}"
+        content = content or "{}"
         import json
         obj = json.loads(content)
         # Accept either {"skills": [...]} or just {"result": [...]} or direct [...]
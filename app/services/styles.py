@@ -1,5 +1,7 @@
 import json
+import threading
 from pathlib import Path
+from typing import Dict, Optional, Tuple
 from app.config import TEMPLATES_DIR
 
 DEFAULT_STYLE_NAMES = {
@@ -15,15 +17,46 @@ DEFAULT_STYLE_NAMES = {
 	"spacer": "Spacer",
 }
 
+# Merged maps keyed by the style_map.json paths and their mtimes (None = file missing)
+_merged: Dict[Tuple, dict] = {}
+_lock = threading.Lock()
 
-def load_style_names() -> dict:
-	path: Path = TEMPLATES_DIR / "style_map.json"
-	names = DEFAULT_STYLE_NAMES.copy()
-	if path.exists():
-		try:
-			user_map = json.loads(path.read_text())
-			if isinstance(user_map, dict):
-				names.update(user_map)
-		except Exception:
-			pass
-	return names
+
+def _mtime(path: Path) -> Optional[float]:
+	try:
+		return path.stat().st_mtime
+	except OSError:
+		return None
+
+
+def _read_map(path: Path) -> dict:
+	try:
+		user_map = json.loads(path.read_text())
+		if isinstance(user_map, dict):
+			return user_map
+	except Exception:
+		pass
+	return {}
+
+
+def load_style_names(override: Optional[Path] = None) -> dict:
+	"""Style names: defaults, then templates/style_map.json, then `override` (a named
+	template's style_map.json). Files are re-read only when their mtime changes.
+	Returns a copy; callers may modify it.
+	"""
+	paths = [TEMPLATES_DIR / "style_map.json"]
+	if override is not None:
+		paths.append(Path(override))
+	key = tuple((p, _mtime(p)) for p in paths)
+	with _lock:
+		names = _merged.get(key)
+		if names is None:
+			names = DEFAULT_STYLE_NAMES.copy()
+			for p, mtime in key:
+				if mtime is not None:
+					names.update(_read_map(p))
+			# Drop entries for older versions of the same files
+			for old in [k for k in _merged if tuple(p for p, _ in k) == tuple(paths)]:
+				_merged.pop(old)
+			_merged[key] = names
+	return dict(names)
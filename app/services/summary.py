@@ -1,17 +1,14 @@
 from __future__ import annotations
-from typing import Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 import re
 import logging
-from app.services.llm import get_openai_client
+import time
+import app.config as cfg
+from app.services.llm import chat_completion
+from app.services.skill_taxonomy import get_skill_taxonomy
 
 logger = logging.getLogger(__name__)
 
-MODEL = "gpt-4o-2024-05-13"
-
-
-def _get_client():
-    return get_openai_client()
-
 
 INSTRUCTIONS = (
     "You are a precise copy editor. Rewrite the provided intro paragraph to strictly satisfy all rules with PURPOSEFUL edits.\n"
@@ -31,9 +28,189 @@ TEMPLATE_GUIDE = (
 )
 
 
-def polish_intro_summary(original_summary: str, candidate_name: str, resume_context: str | None = None, candidate_title: str | None = None, core_skills: list[str] | None = None) -> str:
+# Local checks on a summary draft (see validate_summary)
+GENERATE_SENTENCES = (3, 5)
+# Polishing matches the template's length (about seven sentences) loosely
+POLISH_SENTENCES = (2, 8)
+FORBIDDEN_PHRASES = (
+    "variety of", "various", "numerous", "wide range of", "wide array of", "a number of",
+    "many different", "and more", "and so on", "etc",
+)
+_FORBIDDEN_RE = re.compile(
+    r"(?<![a-z])(?:" + "|".join(re.escape(p) for p in FORBIDDEN_PHRASES) + r")(?![a-z])", re.IGNORECASE
+)
+_HONORIFIC_RE = re.compile(r"^\W*(?:mr|ms|mrs|miss|mx|dr)\b\.?", re.IGNORECASE)
+_SENTENCE_END_RE = re.compile(r"[.!?]+(?=\s+[A-Z0-9(]|\s*$)")
+
+
+def count_sentences(text: str) -> int:
+    return len(_SENTENCE_END_RE.findall(text.strip())) or (1 if text.strip() else 0)
+
+
+def validate_summary(
+    text: str, grounding: str, candidate_name: str = "", sentences: Tuple[int, int] = GENERATE_SENTENCES
+) -> List[str]:
+    """Problems with a summary draft; empty when it can be used as is.
+
+    Checks: no Mr./Ms. or name prefix (the pipeline adds its own), a sentence count
+    within `sentences`, none of FORBIDDEN_PHRASES, and no technology from the skill
+    taxonomy that the grounding text (the resume) does not mention. Taxonomy aliases
+    that are ordinary words ("react", "rest") only count as technologies in the draft
+    when written like one (see SkillTaxonomy.mentions).
+    """
+    text = (text or "").strip()
+    if not text:
+        return ["empty"]
+    problems: List[str] = []
+    first = text.split(None, 1)[0].strip(",.:;").lower()
+    names = {p.lower() for p in (candidate_name or "").split() if len(p) > 1}
+    if _HONORIFIC_RE.match(text) or first in names:
+        problems.append("name prefix")
+    n = count_sentences(text)
+    if not sentences[0] <= n <= sentences[1]:
+        problems.append(f"{n} sentences")
+    vague = sorted({m.group(0).lower() for m in _FORBIDDEN_RE.finditer(text)})
+    if vague:
+        problems.append("vague: " + ", ".join(vague))
+    taxonomy = get_skill_taxonomy()
+    unknown = sorted(taxonomy.mentions(text) - taxonomy.mentions(grounding or "", strict=False))
+    if unknown:
+        problems.append("not in resume: " + ", ".join(unknown))
+    return problems
+
+
+class CascadeStats:
+    """Running totals for the summary cascade (see /summary_cascade/stats).
+
+    Latency saved by an accepted draft is the average latency of the large model (from
+    escalations and non-cascade calls) minus the draft's; an escalation costs the draft.
+    """
+
+    def __init__(self) -> None:
+        self.runs = 0
+        self.escalations = 0
+        self.draft_ms = 0
+        self.large_calls = 0
+        self.large_ms = 0
+        self.saved_ms = 0
+
+    def large_avg_ms(self) -> Optional[int]:
+        return self.large_ms // self.large_calls if self.large_calls else None
+
+    def record_large(self, ms: int) -> None:
+        self.large_calls += 1
+        self.large_ms += ms
+
+    def record(self, draft_ms: int, escalated: bool, large_ms: Optional[int] = None) -> Optional[int]:
+        """Count one cascade run; returns the latency it saved (negative: lost), if known."""
+        self.runs += 1
+        self.draft_ms += draft_ms
+        if escalated:
+            self.escalations += 1
+            if large_ms is not None:
+                self.record_large(large_ms)
+            saved: Optional[int] = -draft_ms
+        else:
+            avg = self.large_avg_ms()
+            saved = avg - draft_ms if avg is not None else None
+        self.saved_ms += saved or 0
+        return saved
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "enabled": bool(cfg.SUMMARY_CASCADE),
+            "runs": self.runs,
+            "escalations": self.escalations,
+            "escalation_rate": round(self.escalations / self.runs, 3) if self.runs else 0.0,
+            "draft_ms_avg": self.draft_ms // self.runs if self.runs else None,
+            "large_ms_avg": self.large_avg_ms(),
+            "saved_ms_total": self.saved_ms,
+        }
+
+
+_stats = CascadeStats()
+
+
+def cascade_stats() -> CascadeStats:
+    return _stats
+
+
+def _ms_since(t0: float) -> int:
+    return int((time.perf_counter() - t0) * 1000)
+
+
+async def summary_completion(
+    messages: List[Dict[str, Any]],
+    grounding: str,
+    candidate_name: str = "",
+    sentences: Tuple[int, int] = GENERATE_SENTENCES,
+    on_token: Optional[Callable[[str], None]] = None,
+    on_cascade: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> str:
+    """The summary text for a prompt; cheap model first when RESUME_FORMATTER_SUMMARY_CASCADE is on.
+
+    With the cascade off (the default) the "summary" stage streams straight to on_token.
+    With it on, the "summary_draft" stage writes a draft, which is used when
+    validate_summary finds nothing wrong with it (against `grounding`, the resume text);
+    otherwise the prompt goes to the "summary" stage. The draft is not streamed, since
+    it can only be checked once complete: an accepted draft reaches on_token in one
+    piece, an escalated one never does. on_cascade receives this run's outcome (model
+    used, reasons, latencies, latency saved).
+    """
+    if not cfg.SUMMARY_CASCADE:
+        t0 = time.perf_counter()
+        content = await chat_completion(stage="summary", messages=messages, temperature=0, on_delta=on_token)
+        _stats.record_large(_ms_since(t0))
+        return (content or "").strip()
+
+    t0 = time.perf_counter()
+    try:
+        draft = (await chat_completion(stage="summary_draft", messages=messages, temperature=0) or "").strip()
+    except Exception:
+        logger.exception("summary cascade: draft failed; escalating")
+        draft = ""
+    draft_ms = _ms_since(t0)
+    problems = validate_summary(draft, grounding, candidate_name, sentences) if draft else ["draft failed"]
+    if not problems:
+        if on_token is not None:
+            on_token(draft)
+        large_ms: Optional[int] = None
+        saved = _stats.record(draft_ms, escalated=False)
+        logger.info("summary cascade: draft accepted draft_ms=%d saved_ms=%s", draft_ms, saved)
+    else:
+        logger.info("summary cascade: escalating (%s)", "; ".join(problems))
+        t1 = time.perf_counter()
+        content = await chat_completion(stage="summary", messages=messages, temperature=0, on_delta=on_token)
+        large_ms = _ms_since(t1)
+        saved = _stats.record(draft_ms, escalated=True, large_ms=large_ms)
+        draft = (content or "").strip()
+    if on_cascade is not None:
+        on_cascade({
+            "stage": "summary" if problems else "summary_draft",
+            "escalated": bool(problems),
+            "reasons": problems,
+            "draft_ms": draft_ms,
+            "large_ms": large_ms,
+            "saved_ms": saved,
+        })
+    return draft
+
+
+async def polish_intro_summary(
+    original_summary: str,
+    candidate_name: str,
+    resume_digest: str | None = None,
+    candidate_title: str | None = None,
+    on_token: Optional[Callable[[str], None]] = None,
+    grounding: str | None = None,
+    on_cascade: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> str:
     """Use the LLM to minimally rewrite the intro paragraph.
 
+    resume_digest: compact resume facts for grounding (see digest.summary_context).
+    on_token: optional callback receiving the rewritten text as it streams in.
+    grounding / on_cascade: see summary_completion.
+
     - Ensures third person
     - Prefixes with Mr./Ms. <LastName> is ...
     - Chooses Mr./Ms. by inferring gender from name
@@ -43,16 +220,11 @@ def polish_intro_summary(original_summary: str, candidate_name: str, resume_cont
     if not summary:
         return original_summary
 
-    client = _get_client()
     context_bits = []
     if candidate_title:
         context_bits.append(f"Likely role/title: {candidate_title}")
-    if core_skills:
-        # Keep to a reasonable length
-        top = ", ".join(core_skills[:40])
-        context_bits.append(f"Top technologies from resume: {top}")
-    if resume_context:
-        context_bits.append(f"Resume context (verbatim):\n{resume_context}")
+    if resume_digest:
+        context_bits.append(f"Resume digest:\n{resume_digest}")
 
     prompt = (
         ("\n".join(context_bits) + "\n\n" if context_bits else "")
@@ -62,43 +234,49 @@ def polish_intro_summary(original_summary: str, candidate_name: str, resume_cont
     )
 
     try:
-        resp = client.chat.completions.create(
-            model=MODEL,
-            messages=[
+        content = await summary_completion(
+            [
                 {"role": "system", "content": INSTRUCTIONS},
                 {"role": "user", "content": prompt},
             ],
-            temperature=0,
+            grounding=grounding or "\n".join([summary, resume_digest or ""]),
+            candidate_name=candidate_name,
+            sentences=POLISH_SENTENCES,
+            on_token=on_token,
+            on_cascade=on_cascade,
         )
-        content = (resp.choices[0].message.content or "").strip()
         return content or original_summary
     except Exception:
         logger.exception("polish_intro_summary: LLM call failed; returning original summary")
         return original_summary
 
 
-def generate_intro_summary(
-    resume_text: str,
+async def generate_intro_summary(
+    resume_digest: str,
     candidate_name: str,
-    core_skills: list[str] | None = None,
-    experience: list[dict] | None = None,
     candidate_title: str | None = None,
+    on_token: Optional[Callable[[str], None]] = None,
+    grounding: str | None = None,
+    on_cascade: Optional[Callable[[Dict[str, Any]], None]] = None,
 ) -> str:
     """Generate a new intro summary from the resume content when none exists.
 
+    resume_digest: compact resume facts (roles, technologies, domains; see digest.summary_context).
+    on_token: optional callback receiving the summary text as it streams in.
+    grounding / on_cascade: see summary_completion.
+
     Requirements:
     - Third person only, prefixed with Mr./Ms. <LastName> is ...
     - Use the provided template ONLY as a stylistic guide; do not copy wording.
-    - Base ALL facts strictly on the resume input (text, skills, experience, title).
+    - Base ALL facts strictly on the resume input (digest and title).
     - 3–5 concise sentences; no markdown or quotes.
     - Preserve technical terms as they appear in the resume.
     """
-    text = (resume_text or "").strip()
+    text = (resume_digest or "").strip()
     # Name stays local; do not send it
     if not text:
         return ""
 
-    client = _get_client()
     sys = (
         "You are a resume writer. Create a concise professional summary using ONLY the provided resume data.\n"
         "Style guide (do not copy wording):\n"
@@ -106,34 +284,32 @@ def generate_intro_summary(
         "- Structure: 3–5 sentences, third-person, start with 'Mr./Ms. <LastName> is'.\n"
         "- After the first sentence, minimize pronouns; prefer action/noun-phrase structures like 'Implemented X', 'Expert in Y'.\n"
         "- Target the likely role (use provided title if present; otherwise infer from experience).\n"
-        "- Content sources: strictly from resume text, skills, experience, and title provided.\n"
+        "- Content sources: strictly from the resume digest and title provided.\n"
         "- Forbidden: inventing numbers, technologies, domains, or vague phrasing (e.g., 'variety of', 'various things').\n"
         "- Keep product and technology names exactly as found.\n"
         "- Match the style, tone, and approximate length of the template guide; do not copy exact sentences.\n"
         "- No markdown, no quotes. Return plain text only.\n"
         f"\n{TEMPLATE_GUIDE}"
     )
-    # Provide structured hints, but the model must rely only on them and the raw text
     user = (
-        f"Candidate title (optional): {candidate_title or ''}\n"
-        f"Skills list (optional): {', '.join(core_skills or [])}\n"
-        f"Experience roles (optional): {', '.join([str(r.get('role','')) for r in (experience or []) if r.get('role')])}\n\n"
-        "Resume text (verbatim):\n"
+        f"Candidate title (optional): {candidate_title or ''}\n\n"
+        "Resume digest:\n"
         f"{text}\n\n"
         "Write the 3–5 sentence summary now, following the style guide and using only information available above. Do NOT include any name/prefix; return only the body text."
     )
 
     try:
-        resp = client.chat.completions.create(
-            model=MODEL,
-            messages=[
+        return await summary_completion(
+            [
                 {"role": "system", "content": sys},
                 {"role": "user", "content": user},
             ],
-            temperature=0,
+            grounding=grounding or text,
+            candidate_name=candidate_name,
+            sentences=GENERATE_SENTENCES,
+            on_token=on_token,
+            on_cascade=on_cascade,
         )
-        content = (resp.choices[0].message.content or "").strip()
-        return content
     except Exception:
         logger.exception("generate_intro_summary: LLM call failed")
         return ""
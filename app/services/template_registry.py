@@ -0,0 +1,97 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+import logging
+import re
+import threading
+from jinja2 import ChoiceLoader, Environment, FileSystemLoader, Template, select_autoescape
+from app.config import REFERENCE_DOCX, TEMPLATES_DIR, VIEWS_DIR
+from app.services.styles import load_style_names
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TEMPLATE = "default"
+
+_NAME_RE = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_-]{0,63}$")
+
+
+@dataclass(frozen=True)
+class ResumeTemplate:
+	"""A selectable output template.
+
+	"default" is templates/Reference.docx with templates/style_map.json. A named template
+	lives in templates/<name>/: its own Reference.docx, and optionally a style_map.json
+	(merged over the shared one) and a resume.md.j2 (else the one in app/views is used).
+	"""
+	name: str
+	reference_docx: Path
+	style_map: Optional[Path] = None
+
+	def style_names(self) -> dict:
+		return load_style_names(self.style_map)
+
+
+class TemplateRegistry:
+	"""Resolves template names and holds one compiled Jinja environment per template.
+
+	Jinja re-checks a template file's mtime on use (auto_reload) and recompiles it only
+	when it changed; style maps and reference docs are cached the same way by their modules.
+	"""
+
+	def __init__(self, root: Path = TEMPLATES_DIR) -> None:
+		self.root = Path(root)
+		self._envs: Dict[str, Environment] = {}
+		self._lock = threading.Lock()
+
+	def get(self, name: Optional[str] = None) -> ResumeTemplate:
+		"""The template called `name` (default when empty). ValueError if unknown."""
+		name = (name or "").strip() or DEFAULT_TEMPLATE
+		if name == DEFAULT_TEMPLATE:
+			return ResumeTemplate(DEFAULT_TEMPLATE, REFERENCE_DOCX)
+		if not _NAME_RE.match(name):
+			raise ValueError(f"invalid template name: {name!r}")
+		d = self.root / name
+		for candidate in ("Reference.docx", "reference.docx"):
+			if (d / candidate).is_file():
+				return ResumeTemplate(name, d / candidate, d / "style_map.json")
+		raise ValueError(f"unknown template: {name!r}; available: {', '.join(self.names())}")
+
+	def names(self) -> List[str]:
+		names = [DEFAULT_TEMPLATE]
+		if self.root.is_dir():
+			for d in sorted(self.root.iterdir()):
+				if d.is_dir() and _NAME_RE.match(d.name) and any((d / c).is_file() for c in ("Reference.docx", "reference.docx")):
+					names.append(d.name)
+		return names
+
+	def _env(self, template: ResumeTemplate) -> Environment:
+		with self._lock:
+			env = self._envs.get(template.name)
+			if env is None:
+				loaders = [FileSystemLoader(str(VIEWS_DIR))]
+				if template.name != DEFAULT_TEMPLATE:
+					loaders.insert(0, FileSystemLoader(str(template.reference_docx.parent)))
+				env = Environment(
+					loader=ChoiceLoader(loaders),
+					autoescape=select_autoescape(["html", "xml", "md"]),
+					trim_blocks=True,
+					lstrip_blocks=True,
+					auto_reload=True,
+				)
+				self._envs[template.name] = env
+				logger.info("template_registry: environment ready for %s", template.name)
+			return env
+
+	def markdown_template(self, template: ResumeTemplate, filename: str = "resume.md.j2") -> Template:
+		return self._env(template).get_template(filename)
+
+
+_registry: Optional[TemplateRegistry] = None
+
+
+def get_template_registry() -> TemplateRegistry:
+	global _registry
+	if _registry is None:
+		_registry = TemplateRegistry()
+	return _registry
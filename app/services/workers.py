@@ -0,0 +1,56 @@
+from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import Any, Callable, Optional
+import asyncio
+import logging
+import app.config as cfg
+
+logger = logging.getLogger(__name__)
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+_render_slots: Optional[asyncio.Semaphore] = None
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """Shared pool for CPU-bound work (pdfminer). Sized by RESUME_FORMATTER_PDF_WORKERS."""
+    global _process_pool
+    if _process_pool is None:
+        workers = max(1, int(cfg.PDF_WORKERS))
+        _process_pool = ProcessPoolExecutor(max_workers=workers)
+        logger.info("workers: process pool started workers=%d", workers)
+    return _process_pool
+
+
+async def run_in_process(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Run a picklable function in the process pool; callers queue when all workers are busy."""
+    global _process_pool
+    loop = asyncio.get_running_loop()
+    call = partial(fn, *args, **kwargs)
+    pool = get_process_pool()
+    try:
+        return await loop.run_in_executor(pool, call)
+    except BrokenProcessPool:
+        # A worker died (e.g. OOM on a huge PDF); start a fresh pool and retry once.
+        # Concurrent callers may all see the same broken pool; only the first replaces it.
+        if _process_pool is pool:
+            logger.warning("workers: process pool broken; restarting")
+            _process_pool = None
+            pool.shutdown(wait=False, cancel_futures=True)
+        return await loop.run_in_executor(get_process_pool(), call)
+
+
+def render_slots() -> asyncio.Semaphore:
+    """Bound on concurrent DOCX renders (pandoc processes). Sized by RESUME_FORMATTER_RENDER_CONCURRENCY."""
+    global _render_slots
+    if _render_slots is None:
+        _render_slots = asyncio.Semaphore(max(1, int(cfg.RENDER_CONCURRENCY)))
+    return _render_slots
+
+
+def shutdown_workers() -> None:
+    global _process_pool
+    pool, _process_pool = _process_pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
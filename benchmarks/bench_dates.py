@@ -0,0 +1,154 @@
+"""Throughput of the compiled date parser against the old regex-per-format version.
+
+Usage (from the repository root):
+	python -m benchmarks.bench_dates [--count N] [--repeat N]
+
+Builds N resume date strings in the shapes extraction and old runs contain (ISO,
+MM/YYYY, month names, bare years, "Present" variants, ranges and some noise), then
+times the old _norm_date, the new parser without its memo, norm_date with an empty
+memo and norm_date with a warm memo (re-normalizing the same archive). Reports where
+old and new disagree and how many "start – end" ranges split_date_range recovers.
+First checks split_date_range on known inputs (single ISO dates must not split) and
+exits 1 if any result is wrong.
+"""
+import argparse
+import random
+import re
+import statistics
+import sys
+import time
+from collections import Counter
+
+from app.services import dates
+from app.services.dates import norm_date, split_date_range
+
+_MONTHS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+_FULL = ("January", "February", "March", "April", "May", "June", "July", "August", "September", "October", "November", "December")
+
+_LEGACY_MONTHS = {
+	"jan": "01", "january": "01", "feb": "02", "february": "02", "mar": "03", "march": "03",
+	"apr": "04", "april": "04", "may": "05", "jun": "06", "june": "06", "jul": "07", "july": "07",
+	"aug": "08", "august": "08", "sep": "09", "sept": "09", "september": "09",
+	"oct": "10", "october": "10", "nov": "11", "november": "11", "dec": "12", "december": "12",
+}
+
+
+def _legacy_norm_date(s: str) -> str:
+	# normalize._norm_date before the shared parser
+	s = (s or "").strip()
+	if not s:
+		return s
+	low = s.lower()
+	if low in dates.PRESENT_TERMS:
+		return "Present"
+	clean = re.sub(r"[\.,]$", "", low)
+	m = re.match(r"^(\d{4})[\-/](\d{1,2})(?:[\-/]\d{1,2})?$", clean)
+	if m:
+		yyyy, mm = int(m.group(1)), int(m.group(2))
+		mm = 1 if mm < 1 else 12 if mm > 12 else mm
+		return f"{mm:02d}/{yyyy}"
+	m = re.match(r"^(\d{1,2})[\-/](\d{2,4})$", clean)
+	if m:
+		mm, y = int(m.group(1)), m.group(2)
+		yyyy = int(y) if len(y) == 4 else (2000 + int(y) if int(y) < 50 else 1900 + int(y))
+		mm = 1 if mm < 1 else 12 if mm > 12 else mm
+		return f"{mm:02d}/{yyyy}"
+	m = re.match(r"^(\w{3,9})\s+(\d{4})$", clean)
+	if m:
+		mon = _LEGACY_MONTHS.get(m.group(1)[:3]) or _LEGACY_MONTHS.get(m.group(1))
+		if mon:
+			return f"{mon}/{m.group(2)}"
+	m = re.match(r"^(\d{4})$", clean)
+	if m:
+		return f"01/{m.group(1)}"
+	m = re.search(r"(jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|jun(?:e)?|jul(?:y)?|aug(?:ust)?|sep(?:t|tember)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)", clean)
+	y = re.search(r"(\d{4})", clean)
+	if m and y:
+		mon = _LEGACY_MONTHS.get(m.group(1)) or _LEGACY_MONTHS.get(m.group(1)[:3])
+		if mon:
+			return f"{mon}/{y.group(1)}"
+	return "Present" if "present" in low else s
+
+
+# input -> expected split_date_range result
+_RANGE_CHECKS = {
+	"2019-03-01": None,
+	"2019-03": None,
+	"03/2019": None,
+	"Mar 2019": None,
+	"Present": None,
+	"2019-03-01 - Present": ("2019-03-01", "Present"),
+	"2019-03-01-2021-02-01": ("2019-03-01", "2021-02-01"),
+	"2019-2020": ("2019", "2020"),
+	"Jan 2019 – Present": ("Jan 2019", "Present"),
+	"03/2017 - 12/2018": ("03/2017", "12/2018"),
+	"03/2017-12/2018": ("03/2017", "12/2018"),
+	"2015 to date": ("2015", "Present"),
+}
+
+
+def _one(rng: random.Random) -> str:
+	y, m = rng.randint(1985, 2025), rng.randint(1, 12)
+	return rng.choice((
+		lambda: f"{y}-{m:02d}",
+		lambda: f"{y}-{m:02d}-01",
+		lambda: f"{m:02d}/{y}",
+		lambda: f"{m}/{y}",
+		lambda: f"{_MONTHS[m - 1]} {y}",
+		lambda: f"{_MONTHS[m - 1]}. {y}",
+		lambda: f"{_FULL[m - 1]} {y}",
+		lambda: f"{_FULL[m - 1]}, {y}",
+		lambda: str(y),
+		lambda: rng.choice(("Present", "present", "Current", "Till Date", "Ongoing")),
+		lambda: f"{_MONTHS[m - 1]} {y} – Present",
+		lambda: f"{m:02d}/{y} - {min(m + 3, 12):02d}/{y + 1}",
+		lambda: rng.choice(("Summer internship", "N/A", "")),
+	))()
+
+
+def _time(fn, items, repeat: int, before=None):
+	samples = []
+	for _ in range(repeat):
+		if before:
+			before()
+		t0 = time.perf_counter()
+		for s in items:
+			fn(s)
+		samples.append(time.perf_counter() - t0)
+	return statistics.median(samples)
+
+
+def main() -> int:
+	ap = argparse.ArgumentParser()
+	ap.add_argument("--count", type=int, default=300000)
+	ap.add_argument("--repeat", type=int, default=3)
+	args = ap.parse_args()
+
+	wrong = [(s, want, split_date_range(s)) for s, want in _RANGE_CHECKS.items() if split_date_range(s) != want]
+	for s, want, got in wrong:
+		print(f"check failed: split_date_range({s!r}) = {got!r} (expected {want!r})")
+	if wrong:
+		return 1
+
+	rng = random.Random(5)
+	items = [_one(rng) for _ in range(args.count)]
+	legacy_s = _time(_legacy_norm_date, items, args.repeat)
+	# the parser alone, as if every string were new
+	bare_s = _time(dates._parse.__wrapped__, items, args.repeat)
+	cold_s = _time(norm_date, items, args.repeat, before=dates._parse.cache_clear)
+	norm_date(items[0])
+	warm_s = _time(norm_date, items, args.repeat)
+
+	diffs = Counter((s, _legacy_norm_date(s), norm_date(s)) for s in set(items) if _legacy_norm_date(s) != norm_date(s))
+	ranges = sum(1 for s in items if split_date_range(s))
+	print(f"strings={len(items)} distinct={len(set(items))} ranges_split={ranges}")
+	for name, secs in (("legacy", legacy_s), ("no memo", bare_s), ("cold memo", cold_s), ("warm memo", warm_s)):
+		print(f"{name:10s} seconds={secs:6.3f} strings/s={len(items) / secs:12,.0f}  speedup={legacy_s / secs:5.1f}x")
+	print(f"different_results={len(diffs)} (distinct strings)")
+	for (s, old, new), _ in diffs.most_common(5):
+		print(f"  {s!r}: {old!r} -> {new!r}")
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
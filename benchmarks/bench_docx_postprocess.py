@@ -0,0 +1,162 @@
+"""Time the single-pass lxml DOCX post-processor against the legacy python-docx one.
+
+Usage (from the repository root):
+	python -m benchmarks.bench_docx_postprocess [--roles N] [--bullets N] [--repeat N]
+
+Builds a pandoc-shaped DOCX from the reference template (job headers with a split
+[[TAB]] placeholder, role headers, list paragraphs with direct numbering; the
+defaults come to roughly 15 pages), runs both post-processors on fresh copies,
+checks that they produce the same paragraphs and prints the timings.
+"""
+import argparse
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import docx
+from docx.enum.text import WD_LINE_SPACING, WD_TAB_ALIGNMENT
+from docx.oxml import OxmlElement
+from docx.oxml.ns import qn
+from docx.shared import Pt
+
+import app.config as cfg
+from app.services.docx_postprocess import postprocess_docx
+
+
+def _legacy_postprocess(docx_file: Path) -> None:
+	# The python-docx fixups render.py ran before docx_postprocess.postprocess_docx,
+	# kept here as the baseline for timing and output comparison
+	# Ensure right-aligned tab stop for employer/date lines (Custom Header 2)
+	post_doc = docx.Document(str(docx_file))
+	section = post_doc.sections[0]
+	usable_width = section.page_width - section.left_margin - section.right_margin
+	for p in post_doc.paragraphs:
+		# Replace placeholder with a real tab (spanning multiple runs if needed)
+		text = ''.join(run.text for run in p.runs)
+		if '[[TAB]]' in text:
+			new_text = text.replace('[[TAB]]', '\t')
+			# Clear runs and set a single run with replaced text
+			for _ in range(len(p.runs)):
+				p.runs[0].clear()
+				p._element.remove(p._element.r_lst[0]) if hasattr(p._element, 'r_lst') else None
+			p.add_run(new_text)
+		try:
+			if p.style and p.style.name == "Custom Header 2":
+				stops = p.paragraph_format.tab_stops
+				stops.clear_all()
+				stops.add_tab_stop(usable_width, alignment=WD_TAB_ALIGNMENT.RIGHT)
+		except Exception:
+			pass
+
+	# Tighten spacing between job header and role header lines
+	paras = post_doc.paragraphs
+	for i in range(len(paras) - 1):
+		p = paras[i]
+		n = paras[i + 1]
+		if (p.style and p.style.name == "Custom Header 2") and (n.style and n.style.name == "Custom Heading 1"):
+			pfp = p.paragraph_format
+			pfn = n.paragraph_format
+			if pfp is not None:
+				pfp.space_after = Pt(0)
+				pfp.line_spacing = None
+				pfp.line_spacing_rule = WD_LINE_SPACING.SINGLE
+			if pfn is not None:
+				pfn.space_before = Pt(0)
+				pfn.space_after = Pt(0)
+				pfn.line_spacing = None
+				pfn.line_spacing_rule = WD_LINE_SPACING.SINGLE
+
+	# Ensure bullet paragraphs use the Custom Bullets 1 style (Calibri 11 per template)
+	for p in post_doc.paragraphs:
+		try:
+			ppr = getattr(p._p, 'pPr', None)
+			is_list = ppr is not None and getattr(ppr, 'numPr', None) is not None
+			if is_list:
+				p.style = "Custom Bullets 1"
+		except Exception:
+			pass
+	post_doc.save(str(docx_file))
+
+
+def _build_input(path: Path, roles: int, bullets: int) -> None:
+	doc = docx.Document(str(cfg.REFERENCE_DOCX))
+	body = doc.element.body
+	for child in list(body):
+		if child.tag != qn("w:sectPr"):
+			body.remove(child)
+	doc.add_paragraph("A results-driven engineer with broad experience. " * 6, style="Custom Paragraph 1")
+	doc.add_paragraph("Professional Experience", style="Custom Heading 1")
+	for i in range(roles):
+		p = doc.add_paragraph(style="Custom Header 2")
+		# pandoc splits the placeholder over several runs
+		for piece in (f"Company {i} [[", "TAB", f"]]01/20{i % 20:02d} – Present"):
+			p.add_run(piece)
+		doc.add_paragraph(f"Senior Developer {i}", style="Custom Heading 1")
+		for j in range(bullets):
+			b = doc.add_paragraph(f"Delivered feature {j} for team {i}, improving throughput and reliability.")
+			num_pr = OxmlElement("w:numPr")
+			ilvl, num_id = OxmlElement("w:ilvl"), OxmlElement("w:numId")
+			ilvl.set(qn("w:val"), "0")
+			num_id.set(qn("w:val"), "1")
+			num_pr.extend([ilvl, num_id])
+			b._p.get_or_add_pPr().append(num_pr)
+	doc.save(str(path))
+
+
+def _signature(path: Path):
+	doc = docx.Document(str(path))
+	out = []
+	for p in doc.paragraphs:
+		pf = p.paragraph_format
+		out.append((
+			p.style.name,
+			p.text,
+			[(t.position, t.alignment) for t in pf.tab_stops],
+			pf.space_before,
+			pf.space_after,
+			pf.line_spacing,
+		))
+	return out
+
+
+def _time(fn, src: Path, work: Path, repeat: int):
+	samples = []
+	for _ in range(repeat):
+		shutil.copyfile(src, work)
+		t0 = time.perf_counter()
+		fn(work)
+		samples.append((time.perf_counter() - t0) * 1000)
+	return samples
+
+
+def main() -> int:
+	ap = argparse.ArgumentParser()
+	ap.add_argument("--roles", type=int, default=16)
+	ap.add_argument("--bullets", type=int, default=28)
+	ap.add_argument("--repeat", type=int, default=20)
+	args = ap.parse_args()
+
+	tmp = Path(tempfile.mkdtemp(prefix="bench-postprocess-"))
+	try:
+		src = tmp / "input.docx"
+		_build_input(src, args.roles, args.bullets)
+		legacy_out, lxml_out = tmp / "legacy.docx", tmp / "lxml.docx"
+		legacy = _time(_legacy_postprocess, src, legacy_out, args.repeat)
+		single = _time(postprocess_docx, src, lxml_out, args.repeat)
+
+		same = _signature(legacy_out) == _signature(lxml_out)
+		paragraphs = len(docx.Document(str(src)).paragraphs)
+		print(f"paragraphs={paragraphs} repeat={args.repeat} identical_output={same}")
+		for name, samples in (("python-docx", legacy), ("lxml", single)):
+			print(f"{name:12s} median_ms={statistics.median(samples):8.1f} min_ms={min(samples):8.1f}")
+		print(f"speedup={statistics.median(legacy) / statistics.median(single):.1f}x")
+		return 0 if same else 1
+	finally:
+		shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+	sys.exit(main())
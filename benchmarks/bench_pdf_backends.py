@@ -0,0 +1,114 @@
+"""Compare the PDF text backends on a local corpus.
+
+Usage (from the repository root):
+	python -m benchmarks.bench_pdf_backends <dir> [--limit N] [--backends pdfminer,pypdfium2]
+
+Every *.pdf under <dir> is extracted by each installed backend in a fresh child
+process (so peak RSS is per backend). Reports pages/s, MB/s, peak memory and, for
+each non-default backend, how closely its text matches pdfminer's: word-level
+similarity after whitespace normalisation (100 = same words in the same order).
+"""
+import argparse
+import multiprocessing as mp
+import queue
+import resource
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from rapidfuzz import fuzz
+
+from app.services.pdf_ingest import BACKENDS, DEFAULT_BACKEND
+
+
+def _run_backend(name: str, paths, out) -> None:
+	backend = BACKENDS[name]
+	texts, pages = [], 0
+	t0 = time.perf_counter()
+	for path in paths:
+		try:
+			count, page_texts = backend.extract_pages(path, 0, 1 << 30)
+		except Exception as e:
+			print(f"{name}: failed on {path}: {e}", file=sys.stderr)
+			count, page_texts = 0, []
+		pages += count
+		texts.append("".join(page_texts))
+	elapsed = time.perf_counter() - t0
+	# ru_maxrss is KiB on Linux, bytes on macOS
+	rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+	rss_mb = rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+	out.put((elapsed, pages, rss_mb, texts))
+
+
+def _words(text: str) -> str:
+	return " ".join(text.split())
+
+
+def _wait_result(proc, out, poll_s: float = 1.0):
+	# The child puts one result just before exiting; a crash (segfault, OOM kill) never does
+	while True:
+		try:
+			return out.get(timeout=poll_s)
+		except queue.Empty:
+			if proc.exitcode is not None:
+				try:
+					return out.get(timeout=poll_s)
+				except queue.Empty:
+					return None
+
+
+def main() -> int:
+	ap = argparse.ArgumentParser()
+	ap.add_argument("root", type=Path)
+	ap.add_argument("--limit", type=int, default=0)
+	ap.add_argument("--backends", default=",".join(BACKENDS))
+	args = ap.parse_args()
+
+	paths = sorted(args.root.rglob("*.pdf"))
+	if args.limit:
+		paths = paths[: args.limit]
+	if not paths:
+		print(f"no PDFs under {args.root}")
+		return 1
+	total_mb = sum(p.stat().st_size for p in paths) / (1024 * 1024)
+
+	names = [n.strip() for n in args.backends.split(",") if n.strip()]
+	if DEFAULT_BACKEND not in names:
+		names.insert(0, DEFAULT_BACKEND)
+	ctx = mp.get_context("spawn")
+	results = {}
+	for name in names:
+		if name not in BACKENDS or not BACKENDS[name].available():
+			print(f"{name:10s} not installed; skipped")
+			continue
+		out = ctx.Queue()
+		proc = ctx.Process(target=_run_backend, args=(name, paths, out))
+		proc.start()
+		result = _wait_result(proc, out)
+		proc.join()
+		if result is None:
+			print(f"{name:10s} child process exited with code {proc.exitcode}; skipped")
+			continue
+		results[name] = result
+
+	if DEFAULT_BACKEND not in results:
+		print(f"{DEFAULT_BACKEND} failed; nothing to compare against")
+		return 1
+
+	print(f"files={len(paths)} size_mb={total_mb:.1f}")
+	baseline = results[DEFAULT_BACKEND][3]
+	for name, (elapsed, pages, rss_mb, texts) in results.items():
+		line = (
+			f"{name:10s} seconds={elapsed:7.2f} pages/s={pages / elapsed:8.1f} "
+			f"MB/s={total_mb / elapsed:6.2f} peak_rss_mb={rss_mb:7.1f}"
+		)
+		if name != DEFAULT_BACKEND:
+			scores = [fuzz.ratio(_words(a), _words(b)) for a, b in zip(baseline, texts)]
+			line += f" similarity_mean={statistics.mean(scores):5.1f} similarity_min={min(scores):5.1f}"
+		print(line)
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
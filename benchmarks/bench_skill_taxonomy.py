@@ -0,0 +1,129 @@
+"""Time skill canonicalization against a large alias taxonomy.
+
+Usage (from the repository root):
+	python -m benchmarks.bench_skill_taxonomy [--aliases N] [--skills N] [--repeat N]
+
+Pads app/data/skill_taxonomy.json with generated product names up to N aliases,
+then canonicalizes a resume-sized skill list (exact aliases in mixed case, versioned
+or suffixed variants, and unknown skills) three ways: the old per-skill Python max()
+over every alias, a cold SkillTaxonomy (fresh memo) and a warm one (the next request).
+Before timing, checks the shipped taxonomy on skills that must (or must not) fold into
+another canonical name; exits 1 if any of them is wrong.
+"""
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+
+from rapidfuzz import fuzz
+
+import app.config as cfg
+from app.services.skill_taxonomy import FUZZY_CUTOFF, SkillTaxonomy, get_skill_taxonomy
+
+# skill -> expected canonical form (distinct skills that contain a shorter alias stay as they are)
+_CHECKS = {
+	"NoSQL": "NoSQL",
+	"Azure SQL": "Azure SQL",
+	"VB.NET": "VB.NET",
+	"Spark SQL": "Spark SQL",
+	"Kubernets": "Kubernetes",
+	"Spring Boot 2.x": "Spring Boot 2.x",
+	"Python 2.7": "Python 2.7",
+	"Java EE": "Java EE",
+	"Windows Server": "Windows Server",
+	"Python (advanced)": "Python",
+	"k8s": "Kubernetes",
+}
+
+_WORDS = ("cloud", "data", "stream", "micro", "graph", "secure", "deploy", "cache", "query", "mesh", "flow", "sync")
+
+
+def _taxonomy(total: int, rng: random.Random) -> dict:
+	skills = json.loads((cfg.DATA_DIR / "skill_taxonomy.json").read_text())["skills"]
+	count = len(SkillTaxonomy(skills))
+	i = 0
+	while count < total:
+		name = f"{rng.choice(_WORDS).title()}{rng.choice(_WORDS)} {i}"
+		skills[name] = [name.lower().replace(" ", "-"), name.lower().replace(" ", "")]
+		count += 3
+		i += 1
+	return skills
+
+
+def _skill_list(skills: dict, n: int, rng: random.Random) -> list:
+	aliases = [a for v in skills.values() for a in v]
+	out = []
+	for i in range(n):
+		roll = rng.random()
+		alias = rng.choice(aliases)
+		if roll < 0.6:
+			out.append(alias.upper() if i % 2 else alias.title())
+		elif roll < 0.85:
+			out.append(f"{alias} {rng.choice(('2.x', 'framework', 'development', '(advanced)'))}")
+		else:
+			out.append(f"In-house tool {i}")
+	return out
+
+
+def _legacy(skills: dict, items: list) -> list:
+	synonyms = {a: canonical for canonical, v in skills.items() for a in v}
+	out = []
+	for s in items:
+		key = s.strip().lower()
+		if key in synonyms:
+			out.append(synonyms[key])
+			continue
+		best = max(synonyms, key=lambda k: fuzz.partial_ratio(key, k))
+		out.append(synonyms[best] if fuzz.partial_ratio(key, best) >= FUZZY_CUTOFF else s.strip())
+	return out
+
+
+def _ms(fn, repeat: int) -> float:
+	samples = []
+	for _ in range(repeat):
+		t0 = time.perf_counter()
+		fn()
+		samples.append((time.perf_counter() - t0) * 1000)
+	return statistics.median(samples)
+
+
+def main() -> int:
+	ap = argparse.ArgumentParser()
+	ap.add_argument("--aliases", type=int, default=5000)
+	ap.add_argument("--skills", type=int, default=200)
+	ap.add_argument("--repeat", type=int, default=5)
+	args = ap.parse_args()
+
+	checked = get_skill_taxonomy().canonicalize(_CHECKS)
+	wrong = [(s, want, got) for (s, want), got in zip(_CHECKS.items(), checked) if got != want]
+	for s, want, got in wrong:
+		print(f"check failed: {s!r} -> {got!r} (expected {want!r})")
+	if wrong:
+		return 1
+
+	rng = random.Random(11)
+	skills = _taxonomy(args.aliases, rng)
+	items = _skill_list(skills, args.skills, rng)
+
+	t0 = time.perf_counter()
+	SkillTaxonomy(skills)
+	build_ms = (time.perf_counter() - t0) * 1000
+	legacy_ms = _ms(lambda: _legacy(skills, items), 1)
+	cold_ms = _ms(lambda: SkillTaxonomy(skills).canonicalize(items), args.repeat)
+	warm = SkillTaxonomy(skills)
+	result = warm.canonicalize(items)
+	warm_ms = _ms(lambda: warm.canonicalize(items), args.repeat)
+
+	changed = sum(a != b.strip() for a, b in zip(result, items))
+	print(f"aliases={len(warm)} skills={len(items)} canonicalized={changed}")
+	print(f"build       ms={build_ms:8.2f}")
+	print(f"python max  ms={legacy_ms:8.2f}")
+	print(f"cold        ms={cold_ms:8.2f}  (includes building the index)")
+	print(f"warm        ms={warm_ms:8.2f}")
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
@@ -0,0 +1,71 @@
+"""Compare the local seniority engine against the LLM on a corpus of past runs.
+
+Usage (from the repository root):
+	python -m benchmarks.seniority_parity <dir> [--limit N]
+
+<dir> is searched recursively for *.json files holding either a Skill Scope
+extraction (top-level "work") or a rendered run's resume.json ("experience").
+Prints every disagreement and a summary line; exits non-zero on any mismatch.
+Requires a configured OpenAI key (the LLM side is really called, uncached).
+"""
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+from app.services.llm_cache import set_cache_bypass
+from app.services.seniority import infer_seniority_locally, infer_seniority_with_llm
+
+
+def _load(path: Path):
+	try:
+		data = json.loads(path.read_text())
+	except Exception:
+		return None
+	if not isinstance(data, dict):
+		return None
+	work = data.get("work") if isinstance(data.get("work"), list) else []
+	experience = data.get("experience") if isinstance(data.get("experience"), list) else []
+	if not work and not experience:
+		return None
+	return work, experience
+
+
+async def _main(root: Path, limit: int) -> int:
+	set_cache_bypass(True)
+	cases = []
+	for path in sorted(root.rglob("*.json")):
+		loaded = _load(path)
+		if loaded:
+			cases.append((path, *loaded))
+		if limit and len(cases) >= limit:
+			break
+
+	same = differ = local_empty = 0
+	for path, work, experience in cases:
+		local = infer_seniority_locally(work, experience)
+		if not local:
+			local_empty += 1
+			continue
+		remote = await infer_seniority_with_llm(work, experience)
+		if remote == local:
+			same += 1
+		else:
+			differ += 1
+			print(f"MISMATCH {path}: local={local} llm={remote or '<empty>'}")
+
+	print(f"cases={len(cases)} identical={same} mismatched={differ} no_local_date={local_empty}")
+	return 1 if differ else 0
+
+
+def main() -> None:
+	ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	ap.add_argument("root", type=Path)
+	ap.add_argument("--limit", type=int, default=0)
+	args = ap.parse_args()
+	sys.exit(asyncio.run(_main(args.root, args.limit)))
+
+
+if __name__ == "__main__":
+	main()
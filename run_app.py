@@ -1,4 +1,5 @@
 import asyncio
+import multiprocessing
 import socket
 import webbrowser
 from contextlib import closing
@@ -35,6 +36,8 @@ async def _serve() -> None:
 
 
 def main() -> None:
+	# Required for the PDF process pool in the bundled (PyInstaller) app
+	multiprocessing.freeze_support()
 	asyncio.run(_serve())
 
 
@@ -0,0 +1,79 @@
+from app.services.chunking import split_resume_for_extraction
+from app.services.extraction import merge_extractions
+
+HEAD = "Jane Doe\njane@example.com\n\nSummary\nBackend engineer.\n\n"
+ROLES = [
+	"Acme Corp\nSenior Developer\nJan 2020 – Present\n- Built the billing service.\n- Led the team.\n",
+	"Globex\nDeveloper\n03/2016 - 12/2019\n- Wrote the reporting API.\n",
+	"Initech\nJunior Developer\n2014 - 2016\n- Fixed bugs.\n",
+]
+TAIL = "Education\nState University\nBS Computer Science\n"
+RESUME = HEAD + "Professional Experience\n" + "".join(ROLES) + TAIL
+
+
+def test_splits_whole_roles_and_keeps_the_rest_in_the_head():
+	head, *chunks = split_resume_for_extraction(RESUME, max_chars=10_000)
+	assert chunks == ["".join(ROLES)]
+	assert head == HEAD + "Professional Experience\n" + TAIL
+
+
+def test_packs_roles_up_to_max_chars():
+	head, *chunks = split_resume_for_extraction(RESUME, max_chars=len(ROLES[0]) + 1)
+	assert chunks == ROLES
+	head, *chunks = split_resume_for_extraction(RESUME, max_chars=len(ROLES[0]) + len(ROLES[1]))
+	assert chunks == [ROLES[0] + ROLES[1], ROLES[2]]
+
+
+def test_no_text_is_lost_or_duplicated():
+	parts = split_resume_for_extraction(RESUME, max_chars=80)
+	assert sorted("".join(parts).splitlines()) == sorted(RESUME.splitlines())
+
+
+def test_fewer_than_two_roles_is_not_split():
+	text = HEAD + "Experience\n" + ROLES[0] + TAIL
+	assert split_resume_for_extraction(text, max_chars=10) == [text]
+
+
+def test_merge_renumbers_work_in_chunk_order():
+	parts = [
+		{"basics": {"name": "Jane Doe", "location": {"city": ""}}, "work": []},
+		{"basics": {"name": "", "location": {"city": "Austin"}}, "work": [
+			{"name": "Globex", "position": "Developer", "startDate": "2016-03", "role_order": 2},
+			{"name": "Acme", "position": "Senior Developer", "startDate": "2020-01", "role_order": 1},
+		]},
+		{"work": [
+			{"name": "Initech", "position": "Junior Developer", "startDate": "2014", "role_order": 1},
+			# the same role seen at a chunk boundary
+			{"name": "globex ", "position": "developer", "startDate": "2016-03", "role_order": 2},
+		]},
+	]
+	merged = merge_extractions(parts)
+	assert merged["basics"] == {"name": "Jane Doe", "location": {"city": "Austin"}}
+	assert [(w["name"], w["role_order"]) for w in merged["work"]] == [("Acme", 1), ("Globex", 2), ("Initech", 3)]
+
+
+def test_merge_dedupes_skills_education_and_certificates():
+	parts = [
+		{
+			"skills": [{"name": "Languages", "keywords": ["Java", "Python"]}, {"name": "Docker"}],
+			"education": [{"institution": "State University", "area": "CS", "studyType": "BS"}],
+			"certificates": [{"name": "AWS SAA"}, {"name": ""}],
+		},
+		{
+			"skills": [{"name": "Backend", "keywords": ["java", "Kafka"]}, {"name": "docker"}],
+			"education": [{"institution": "state university", "area": "cs", "studyType": "bs"}],
+			"certificates": [{"name": "aws saa"}, {"name": "CKA"}],
+		},
+	]
+	merged = merge_extractions(parts)
+	assert merged["skills"] == [{"name": "Technical Skills", "keywords": ["Java", "Python", "Docker", "Kafka"]}]
+	assert len(merged["education"]) == 1
+	assert [c["name"] for c in merged["certificates"]] == ["AWS SAA", "CKA"]
+
+
+def test_merge_concatenates_other_lists():
+	parts = [{"projects": [{"name": "A"}], "source_file": "cv.pdf"}, {"projects": [{"name": "B"}], "source_file": ""}]
+	merged = merge_extractions(parts)
+	assert merged["projects"] == [{"name": "A"}, {"name": "B"}]
+	assert merged["source_file"] == "cv.pdf"
+	assert merged["skills"] == []
@@ -0,0 +1,65 @@
+import pytest
+
+from app.services.dates import PRESENT, iso_month, norm_date, parse_year_month, split_date_range
+
+
+@pytest.mark.parametrize("value, parsed", [
+	("2019-03-01", (2019, 3)),
+	("2019-03", (2019, 3)),
+	("2019/3", (2019, 3)),
+	("03/2019", (2019, 3)),
+	("3-2019", (2019, 3)),
+	("03/19", (2019, 3)),
+	("03/98", (1998, 3)),
+	("Mar 2019", (2019, 3)),
+	("Sept. 2019", (2019, 9)),
+	("march, 2019", (2019, 3)),
+	("2019 March", (2019, 3)),
+	("2019", (2019, 1)),
+	("Started in June of 2019", (2019, 6)),
+	("2019-13", (2019, 12)),
+	("Present", None),
+	("", None),
+	("Summer internship", None),
+])
+def test_parse_year_month(value, parsed):
+	assert parse_year_month(value) == parsed
+
+
+@pytest.mark.parametrize("value, mm_yyyy, yyyy_mm", [
+	("Mar 2019", "03/2019", "2019-03"),
+	("2019", "01/2019", "2019-01"),
+	("till date", PRESENT, PRESENT),
+	("Currently employed (present)", PRESENT, PRESENT),
+	("  N/A ", "N/A", "N/A"),
+])
+def test_norm_date_and_iso_month(value, mm_yyyy, yyyy_mm):
+	assert norm_date(value) == mm_yyyy
+	assert iso_month(value) == yyyy_mm
+
+
+@pytest.mark.parametrize("value, parts", [
+	("Jan 2019 – Present", ("Jan 2019", PRESENT)),
+	("Jan 2019 — Dec 2020", ("Jan 2019", "Dec 2020")),
+	("03/2017 - 12/2018", ("03/2017", "12/2018")),
+	("03/2017-12/2018", ("03/2017", "12/2018")),
+	("2015 to date", ("2015", PRESENT)),
+	("2015 to now", ("2015", PRESENT)),
+	("2015 through 2018", ("2015", "2018")),
+	("2019-2020", ("2019", "2020")),
+	("2019-03-01 - Present", ("2019-03-01", PRESENT)),
+	("2019-03-01-2021-02-01", ("2019-03-01", "2021-02-01")),
+	("2019-03 – 2021-02", ("2019-03", "2021-02")),
+])
+def test_split_date_range(value, parts):
+	assert split_date_range(value) == parts
+
+
+@pytest.mark.parametrize("value", [
+	# single dates, including ISO ones whose hyphens are not separators
+	"2019-03-01", "2019-03", "2019/03/01", "03/2019", "3-2019", "Mar 2019", "2019", "Present", "till date",
+	# not ranges at all
+	"", None, "Summer – internship", "Present – 2019", "- 2019", "2019 -",
+])
+def test_not_a_range(value):
+	assert split_date_range(value) is None
@@ -0,0 +1,88 @@
+import docx
+import pytest
+from docx.enum.text import WD_TAB_ALIGNMENT
+from docx.shared import Pt
+
+import app.config as cfg
+from app.services.docx_builder import NBSP, build_resume_docx
+from app.services.styles import DEFAULT_STYLE_NAMES
+
+DATA = {
+	"candidate_name": "Jane Doe",
+	"candidate_title": "Java Full Stack Developer",
+	"experience_level": "Senior",
+	"summary": "Backend engineer with a focus on payments.",
+	"core_skills": ["Java", "Spring Boot", "Kafka"],
+	"education": [{"degree": "BS in Computer Science", "school": "State University", "grad_date": "2012"}],
+	"certifications": ["AWS SAA", "CKA"],
+	"experience": [
+		{
+			"company": "Acme", "role": "Senior Developer", "start_date": "01/2020", "end_date": "Present",
+			"summary": "Payments platform.", "bullets": ["Built the billing service.", "Led a team of 5."],
+		},
+		{"company": "Globex", "role": "", "start_date": "03/2016", "end_date": "12/2019", "bullets": ["Wrote the reporting API."]},
+	],
+}
+
+
+@pytest.fixture
+def built(tmp_path):
+	out = build_resume_docx(DATA, cfg.REFERENCE_DOCX, tmp_path / "resume.docx", DEFAULT_STYLE_NAMES)
+	return docx.Document(str(out))
+
+
+def test_paragraphs_and_styles(built):
+	spacer = ("Spacer", NBSP)
+	assert [(p.style.name, p.text) for p in built.paragraphs] == [
+		("Custom Paragraph 1", DATA["summary"]),
+		spacer,
+		("Custom Heading 1", "Technical Skills"),
+		("Custom Paragraph 1", "Java, Spring Boot, Kafka"),
+		spacer,
+		("Custom Heading 1", "Education and Certifications"),
+		("Custom Paragraph 1", "BS in Computer Science, State University, 2012"),
+		spacer,
+		("Custom Paragraph 1", "AWS SAA, CKA"),
+		spacer,
+		("Custom Heading 1", "Professional Experience"),
+		spacer,
+		("Custom Header 2", "Acme\t01/2020 – Present"),
+		("Custom Heading 1", "Senior Developer"),
+		("Custom Paragraph 1", "Payments platform."),
+		("Custom Bullets 1", "Built the billing service."),
+		("Custom Bullets 1", "Led a team of 5."),
+		spacer,
+		("Custom Header 2", "Globex\t03/2016 – 12/2019"),
+		("Custom Bullets 1", "Wrote the reporting API."),
+	]
+
+
+def test_job_headers_have_one_right_tab_stop_at_the_margin(built):
+	section = built.sections[0]
+	usable = section.page_width - section.left_margin - section.right_margin
+	headers = [p for p in built.paragraphs if p.style.name == "Custom Header 2"]
+	for p in headers:
+		assert [(t.position, t.alignment) for t in p.paragraph_format.tab_stops] == [(usable, WD_TAB_ALIGNMENT.RIGHT)]
+
+
+def test_job_and_role_headers_are_tight(built):
+	paras = built.paragraphs
+	job = next(i for i, p in enumerate(paras) if p.text.startswith("Acme"))
+	assert paras[job].paragraph_format.space_after == Pt(0)
+	assert paras[job + 1].paragraph_format.space_before == Pt(0)
+	assert paras[job + 1].paragraph_format.space_after == Pt(0)
+
+
+def test_header_placeholders_are_filled(built):
+	header = "".join(p.text for p in built.sections[0].header.paragraphs)
+	assert "Jane Doe" in header
+	assert "Senior Java Full Stack Developer" in header
+	assert "{{" not in header
+
+
+def test_unknown_style_is_added(tmp_path):
+	styles = {**DEFAULT_STYLE_NAMES, "bullet": "Brand New Bullet"}
+	out = build_resume_docx(DATA, cfg.REFERENCE_DOCX, tmp_path / "resume.docx", styles)
+	doc = docx.Document(str(out))
+	assert doc.styles["Brand New Bullet"].base_style.name == "Normal"
+	assert sum(p.style.name == "Brand New Bullet" for p in doc.paragraphs) == 3
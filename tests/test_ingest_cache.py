@@ -0,0 +1,151 @@
+import asyncio
+from pathlib import Path
+from typing import List, Tuple
+
+import pytest
+from fastapi import HTTPException
+
+import app.config as cfg
+from app.routers.convert import _copy_upload_to_run
+from app.services import ingest_cache, pdf_ingest
+from app.services.ingest_cache import IngestCache
+from app.services.pdf_ingest import PdfBackend, PdfText
+
+
+class _FakeBackend(PdfBackend):
+	"""Ten pages of 100 characters each."""
+
+	name = "fake"
+	pages = 10
+
+	def extract_pages(self, pdf_path: Path, first: int, last: int) -> Tuple[int, List[str]]:
+		return self.pages, ["x" * 99 + "\f" for _ in range(first, min(last, self.pages))]
+
+
+@pytest.fixture
+def fake_pdf(monkeypatch):
+	async def run_inline(fn, *args):
+		return fn(*args)
+
+	monkeypatch.setitem(pdf_ingest.BACKENDS, "fake", _FakeBackend())
+	monkeypatch.setattr(pdf_ingest, "choose_backend", lambda path: "fake")
+	monkeypatch.setattr(pdf_ingest, "run_in_process", run_inline)
+	monkeypatch.setattr(cfg, "PDF_PROBE_PAGES", 2)
+	monkeypatch.setattr(cfg, "PDF_PAGES_PER_TASK", 3)
+	monkeypatch.setattr(cfg, "PDF_WORKERS", 2)
+
+
+@pytest.fixture
+def cache(monkeypatch, tmp_path) -> IngestCache:
+	monkeypatch.setattr(cfg, "USER_DATA_DIR", tmp_path)
+	return IngestCache(max_entries=8)
+
+
+def test_no_budget_by_default():
+	assert cfg.PDF_MAX_PAGES == 0
+	assert cfg.PDF_MAX_CHARS == 0
+
+
+def test_unlimited_extraction_reads_every_page(fake_pdf, monkeypatch):
+	monkeypatch.setattr(cfg, "PDF_MAX_PAGES", 0)
+	monkeypatch.setattr(cfg, "PDF_MAX_CHARS", 0)
+	pdf = asyncio.run(pdf_ingest.extract_pdf_async(Path("resume.pdf")))
+	assert (pdf.page_count, pdf.pages_read, len(pdf.text)) == (10, 10, 1000)
+	assert not pdf.truncated
+
+
+# The char budget is checked between waves: 2 probe pages, then 2 workers x 3 pages
+@pytest.mark.parametrize("max_pages, max_chars, pages_read", [(4, 0, 4), (0, 250, 8), (0, 150, 2), (10, 0, 10)])
+def test_budget_reports_real_page_count(fake_pdf, monkeypatch, max_pages, max_chars, pages_read):
+	monkeypatch.setattr(cfg, "PDF_MAX_PAGES", max_pages)
+	monkeypatch.setattr(cfg, "PDF_MAX_CHARS", max_chars)
+	pdf = asyncio.run(pdf_ingest.extract_pdf_async(Path("resume.pdf")))
+	assert pdf.page_count == 10
+	assert pdf.pages_read == pages_read
+	assert pdf.truncated == (pages_read < 10)
+
+
+def _count_extractions(monkeypatch) -> List[int]:
+	calls: List[int] = []
+
+	async def fake_extract(pdf_path: Path) -> PdfText:
+		calls.append(1)
+		pages = int(cfg.PDF_MAX_PAGES) or 10
+		return PdfText("page\f" * pages, 10, pages)
+
+	monkeypatch.setattr(ingest_cache, "extract_pdf_async", fake_extract)
+	return calls
+
+
+def test_cache_entry_records_page_count_and_truncation(cache, monkeypatch):
+	_count_extractions(monkeypatch)
+	monkeypatch.setattr(cfg, "PDF_MAX_PAGES", 3)
+	res = asyncio.run(cache.ingest(b"%PDF-1.4 one", "cv.pdf"))
+	assert res.page_count == 10
+	assert res.truncated
+	assert asyncio.run(IngestCache(max_entries=8).lookup(res.upload_id)) == res
+
+
+def test_budget_change_misses_the_cache(cache, monkeypatch):
+	calls = _count_extractions(monkeypatch)
+	monkeypatch.setattr(cfg, "PDF_MAX_PAGES", 3)
+	first = asyncio.run(cache.ingest(b"%PDF-1.4 two", "cv.pdf"))
+	assert asyncio.run(cache.ingest(b"%PDF-1.4 two", "cv.pdf")) == first
+	assert len(calls) == 1
+
+	monkeypatch.setattr(cfg, "PDF_MAX_PAGES", 0)
+	assert asyncio.run(cache.lookup(first.upload_id)) is None
+	again = asyncio.run(cache.get(first.upload_id))
+	assert len(calls) == 2
+	assert again.upload_id == first.upload_id
+	assert again.filename == "cv.pdf"
+	assert not again.truncated
+	assert asyncio.run(cache.lookup(first.upload_id)) == again
+
+
+def test_concurrent_uploads_share_one_extraction(cache, monkeypatch):
+	calls = _count_extractions(monkeypatch)
+
+	async def run():
+		return await asyncio.gather(*(cache.ingest(b"%PDF-1.4 three", "cv.pdf") for _ in range(3)))
+
+	results = asyncio.run(run())
+	assert len(calls) == 1
+	assert results[0] == results[1] == results[2]
+
+
+def test_waiter_takes_over_when_the_extracting_caller_is_cancelled(cache, monkeypatch):
+	started = []
+
+	async def slow_extract(pdf_path: Path) -> PdfText:
+		started.append(1)
+		await asyncio.sleep(0.05)
+		return PdfText("page\f", 1, 1)
+
+	monkeypatch.setattr(ingest_cache, "extract_pdf_async", slow_extract)
+
+	async def run():
+		first = asyncio.create_task(cache.ingest(b"%PDF-1.4 four", "cv.pdf"))
+		while not started:
+			await asyncio.sleep(0)
+		waiter = asyncio.create_task(cache.ingest(b"%PDF-1.4 four", "cv.pdf"))
+		await asyncio.sleep(0.01)
+		first.cancel()
+		with pytest.raises(asyncio.CancelledError):
+			await first
+		return await waiter
+
+	res = asyncio.run(run())
+	assert res.text == "page\f"
+	assert len(started) == 2
+
+
+def test_pruned_upload_is_reported_as_expired(cache, monkeypatch, tmp_path):
+	_count_extractions(monkeypatch)
+	res = asyncio.run(cache.ingest(b"%PDF-1.4 five", "cv.pdf"))
+	res.pdf_path.unlink()
+	run_dir = tmp_path / "run"
+	run_dir.mkdir()
+	with pytest.raises(HTTPException) as err:
+		asyncio.run(_copy_upload_to_run(res, run_dir))
+	assert err.value.status_code == 410
@@ -0,0 +1,90 @@
+import asyncio
+import json
+from typing import List
+
+from app.routers.jobs import _sse_events
+from app.services.jobs import FAILED, SUCCEEDED, Job, JobManager
+
+
+class _Request:
+	async def is_disconnected(self) -> bool:
+		return False
+
+
+async def _stream(job: Job, after: int = -1) -> List[dict]:
+	events = []
+	async for chunk in _sse_events(_Request(), job, after):
+		lines = dict(line.split(": ", 1) for line in chunk.strip().splitlines())
+		events.append({"id": int(lines["id"]), "event": lines["event"], "data": json.loads(lines["data"])})
+	return events
+
+
+async def _run_job(runner) -> Job:
+	manager = JobManager(max_workers=1)
+	job = manager.submit("test", runner)
+	await job.task
+	return job
+
+
+async def _summary_runner(job: Job) -> dict:
+	job.stage_done("extraction", {"basics": {"name": "Jane"}}, 10)
+	for word in ("Backend ", "engineer."):
+		job.token("summary", word)
+	job.stage_done("summary", "Backend engineer.", 20)
+	return {"docx_url": "/output/resume.docx"}
+
+
+def test_live_stream_has_tokens_and_previews():
+	async def run():
+		manager = JobManager(max_workers=1)
+		release = asyncio.Event()
+
+		async def runner(job: Job) -> dict:
+			job.token("summary", "Backend ")
+			job.stage_done("summary", "Backend", 5)
+			await release.wait()
+			return {}
+
+		job = manager.submit("test", runner)
+		while job.event_count < 2:
+			await asyncio.sleep(0)
+		live = [dict(ev) for ev in job.events_after(-1)]
+		release.set()
+		await job.task
+		return live
+
+	live = asyncio.run(run())
+	assert [ev["event"] for ev in live] == ["token", "stage"]
+	assert live[1]["data"]["preview"] == "Backend"
+
+
+def test_finished_job_drops_tokens_and_previews_but_keeps_ids():
+	job = asyncio.run(_run_job(_summary_runner))
+	assert job.status == SUCCEEDED
+	assert job.event_count == 5
+	assert [(ev["id"], ev["event"]) for ev in job.events] == [(0, "stage"), (3, "stage"), (4, "status")]
+	assert all("preview" not in ev["data"] for ev in job.events if ev["event"] == "stage")
+	assert job.events[-1]["data"]["result"] == {"docx_url": "/output/resume.docx"}
+
+
+def test_replay_after_finish_resumes_by_event_id():
+	async def run():
+		job = await _run_job(_summary_runner)
+		return await _stream(job), await _stream(job, after=1), await _stream(job, after=4)
+
+	everything, resumed, nothing = asyncio.run(run())
+	assert [ev["id"] for ev in everything] == [0, 3, 4]
+	assert [ev["id"] for ev in resumed] == [3, 4]
+	assert nothing == []
+	assert everything[-1]["data"]["status"] == SUCCEEDED
+
+
+def test_failed_job_publishes_its_error():
+	async def runner(job: Job) -> dict:
+		job.token("summary", "partial")
+		raise RuntimeError("model unavailable")
+
+	job = asyncio.run(_run_job(runner))
+	assert job.status == FAILED
+	assert [ev["event"] for ev in job.events] == ["status"]
+	assert job.events[0]["data"]["error"] == "model unavailable"
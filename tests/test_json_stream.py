@@ -0,0 +1,70 @@
+import json
+from typing import Any, List, Tuple
+
+import pytest
+
+from app.services.json_stream import JsonSectionParser
+
+DOC = {
+	"basics": {"name": "Jane \"JD\" Doe", "summary": "Uses {braces}, [brackets] and \\ slashes", "location": {"city": "Austin"}},
+	"work": [
+		{"name": "Acme", "highlights": ["Cut costs by 30%", "Led a team of 5 } ]"]},
+		{"name": "Globex", "highlights": []},
+	],
+	"skills": [{"name": "Java", "keywords": ["Spring", "Kafka"]}],
+	"languages": ["English", "Spanish"],
+	"source_file": "cv.pdf",
+	"score": 4.5,
+	"is_current": True,
+	"empty": None,
+}
+
+
+def _feed(text: str, size: int) -> Tuple[JsonSectionParser, List[Tuple[str, Any]], List[Tuple[str, Any]]]:
+	sections: List[Tuple[str, Any]] = []
+	items: List[Tuple[str, Any]] = []
+	parser = JsonSectionParser(
+		on_section=lambda k, v: sections.append((k, v)),
+		on_item=lambda k, v: items.append((k, v)),
+		item_keys=("work", "languages"),
+	)
+	for i in range(0, len(text), size):
+		parser.feed(text[i:i + size])
+	return parser, sections, items
+
+
+@pytest.mark.parametrize("indent", [None, 2])
+@pytest.mark.parametrize("size", [1, 3, 7, 10_000])
+def test_reports_every_section_and_item_in_order(indent, size):
+	text = json.dumps(DOC, indent=indent)
+	parser, sections, items = _feed(text, size)
+	assert sections == list(DOC.items())
+	assert parser.sections == DOC
+	# scalar array elements are not reported as items
+	assert items == [("work", w) for w in DOC["work"]]
+	assert parser.text == text
+
+
+def test_section_is_reported_before_the_rest_arrives():
+	seen: List[str] = []
+	parser = JsonSectionParser(on_section=lambda k, v: seen.append(k))
+	parser.feed('{"basics": {"name": "Jane"}, "wo')
+	assert seen == ["basics"]
+	parser.feed('rk": [')
+	assert seen == ["basics"]
+	parser.feed("]}")
+	assert seen == ["basics", "work"]
+
+
+def test_item_is_reported_as_soon_as_it_closes():
+	items: List[Any] = []
+	parser = JsonSectionParser(on_item=lambda k, v: items.append(v), item_keys=("work",))
+	parser.feed('{"work": [{"name": "Acme"}, {"name": "Glo')
+	assert items == [{"name": "Acme"}]
+
+
+def test_unparseable_values_are_skipped():
+	sections: List[Tuple[str, Any]] = []
+	parser = JsonSectionParser(on_section=lambda k, v: sections.append((k, v)))
+	parser.feed('{"a": tru, "b": 1}')
+	assert sections == [("a", None), ("b", 1)]
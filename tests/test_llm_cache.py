@@ -0,0 +1,93 @@
+import pytest
+
+from app.services import llm_cache
+from app.services.llm_cache import LLMCache, cache_key
+
+
+class Clock:
+	def __init__(self) -> None:
+		self.now = 1_000_000.0
+
+	def __call__(self) -> float:
+		self.now += 1
+		return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> Clock:
+	c = Clock()
+	monkeypatch.setattr(llm_cache.time, "time", c)
+	return c
+
+
+def _cache(tmp_path, max_bytes=0, ttl_s=0.0) -> LLMCache:
+	return LLMCache(tmp_path / "llm.sqlite3", max_bytes=max_bytes, ttl_s=ttl_s)
+
+
+def test_key_ignores_dict_order_but_not_content():
+	a = {"model": "m", "messages": [{"role": "user", "content": "hi"}], "temperature": 0}
+	b = {"temperature": 0, "messages": [{"content": "hi", "role": "user"}], "model": "m"}
+	assert cache_key(a) == cache_key(b)
+	assert cache_key(a) != cache_key({**a, "model": "other"})
+
+
+def test_round_trip_and_stats(tmp_path, clock):
+	cache = _cache(tmp_path)
+	assert cache.get("k") is None
+	cache.put("k", "value")
+	assert cache.get("k") == "value"
+	stats = cache.stats()
+	assert (stats["entries"], stats["bytes"], stats["hits"], stats["misses"]) == (1, 5, 1, 1)
+
+
+def test_replacing_an_entry_keeps_the_byte_total(tmp_path, clock):
+	cache = _cache(tmp_path)
+	cache.put("k", "aaaa")
+	cache.put("k", "bb")
+	assert cache.stats()["bytes"] == 2
+
+
+def test_evicts_least_recently_used_over_the_byte_cap(tmp_path, clock):
+	cache = _cache(tmp_path, max_bytes=10)
+	cache.put("a", "aaaa")
+	cache.put("b", "bbbb")
+	assert cache.get("a") == "aaaa"  # b is now the least recently used
+	cache.put("c", "cccc")
+	assert cache.get("b") is None
+	assert cache.get("a") == "aaaa"
+	assert cache.get("c") == "cccc"
+	assert cache.stats()["evictions"] == 1
+	assert cache.stats()["bytes"] == 8
+
+
+def test_oversized_values_are_not_stored(tmp_path, clock):
+	cache = _cache(tmp_path, max_bytes=4)
+	cache.put("big", "x" * 5)
+	assert cache.get("big") is None
+	assert cache.stats()["writes"] == 0
+
+
+def test_entries_expire_after_the_ttl(tmp_path, clock):
+	cache = _cache(tmp_path, ttl_s=60)
+	cache.put("k", "value")
+	clock.now += 30
+	assert cache.get("k") == "value"
+	clock.now += 60  # reads do not extend the TTL
+	assert cache.get("k") is None
+	assert cache.stats()["entries"] == 0
+	assert cache.stats()["bytes"] == 0
+
+
+def test_entries_survive_reopening(tmp_path, clock):
+	_cache(tmp_path).put("k", "value")
+	reopened = _cache(tmp_path)
+	assert reopened.get("k") == "value"
+	assert reopened.stats()["bytes"] == 5
+
+
+def test_clear(tmp_path, clock):
+	cache = _cache(tmp_path)
+	cache.put("k", "value")
+	cache.clear()
+	assert cache.get("k") is None
+	assert cache.stats()["bytes"] == 0
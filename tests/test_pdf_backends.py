@@ -0,0 +1,94 @@
+import pytest
+
+import app.config as cfg
+from app.services import pdf_ingest
+from app.services.pdf_ingest import BACKENDS, DEFAULT_BACKEND, PdfBackend, choose_backend, extract_text_from_pdf
+
+PAGES = ["First page text", "Second page text", "Third page text"]
+
+
+def _write_pdf(path, pages):
+	"""A minimal PDF with one line of Helvetica text per page."""
+	n = len(pages)
+	font = 3 + 2 * n
+	objects = [
+		b"<< /Type /Catalog /Pages 2 0 R >>",
+		b"<< /Type /Pages /Kids [" + b" ".join(b"%d 0 R" % (3 + 2 * i) for i in range(n)) + b"] /Count %d >>" % n,
+	]
+	for i, text in enumerate(pages):
+		stream = b"BT /F1 12 Tf 72 720 Td (" + text.encode("latin-1") + b") Tj ET"
+		objects.append(
+			b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents %d 0 R "
+			b"/Resources << /Font << /F1 %d 0 R >> >> >>" % (4 + 2 * i, font)
+		)
+		objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+	objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+	out = bytearray(b"%PDF-1.4\n")
+	offsets = []
+	for num, body in enumerate(objects, start=1):
+		offsets.append(len(out))
+		out += b"%d 0 obj\n" % num + body + b"\nendobj\n"
+	xref = len(out)
+	out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+	out += b"".join(b"%010d 00000 n \n" % o for o in offsets)
+	out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+	path.write_bytes(bytes(out))
+	return path
+
+
+@pytest.fixture
+def pdf_path(tmp_path):
+	return _write_pdf(tmp_path / "resume.pdf", PAGES)
+
+
+def _installed():
+	return [name for name, backend in BACKENDS.items() if backend.available()]
+
+
+@pytest.mark.parametrize("name", _installed())
+def test_backend_returns_requested_pages_each_ending_in_a_form_feed(pdf_path, name):
+	count, texts = BACKENDS[name].extract_pages(pdf_path, 1, 3)
+	assert count == 3
+	assert len(texts) == 2
+	assert all(t.endswith("\f") for t in texts)
+	assert [t.strip() for t in texts] == PAGES[1:]
+
+
+@pytest.mark.parametrize("name", _installed())
+def test_range_past_the_end_is_clipped(pdf_path, name):
+	count, texts = BACKENDS[name].extract_pages(pdf_path, 2, 100)
+	assert count == 3
+	assert [t.strip() for t in texts] == PAGES[2:]
+
+
+def test_pdfminer_pages_join_to_the_whole_document_text(pdf_path):
+	_, texts = BACKENDS["pdfminer"].extract_pages(pdf_path, 0, 3)
+	assert "".join(texts) == extract_text_from_pdf(pdf_path)
+
+
+def test_backend_must_implement_extract_pages():
+	class Incomplete(PdfBackend):
+		name = "incomplete"
+
+	with pytest.raises(TypeError):
+		Incomplete()
+
+
+def test_choose_backend(pdf_path, monkeypatch):
+	monkeypatch.setattr(cfg, "PDF_BACKEND", "pdfminer")
+	assert choose_backend(pdf_path) == "pdfminer"
+	monkeypatch.setattr(cfg, "PDF_BACKEND", "nonsense")
+	assert choose_backend(pdf_path) == DEFAULT_BACKEND
+
+	monkeypatch.setattr(cfg, "PDF_BACKEND", "auto")
+	monkeypatch.setattr(pdf_ingest.PdfiumBackend, "available", lambda self: True)
+	monkeypatch.setattr(cfg, "PDF_AUTO_FAST_BYTES", pdf_path.stat().st_size + 1)
+	assert choose_backend(pdf_path) == DEFAULT_BACKEND
+	monkeypatch.setattr(cfg, "PDF_AUTO_FAST_BYTES", pdf_path.stat().st_size)
+	assert choose_backend(pdf_path) == "pypdfium2"
+
+	monkeypatch.setattr(pdf_ingest.PdfiumBackend, "available", lambda self: False)
+	assert choose_backend(pdf_path) == DEFAULT_BACKEND
+	monkeypatch.setattr(cfg, "PDF_BACKEND", "pypdfium2")
+	assert choose_backend(pdf_path) == DEFAULT_BACKEND
@@ -0,0 +1,79 @@
+import random
+import re
+
+import pytest
+
+from app.services.pii import (
+	ADDRESS_HINT, EMAIL_RE, PHONE_RE, PII_RE, URL_RE, _GUARDS, _KINDS, _START, rehydrate, scrub_text,
+)
+
+RESUME = (
+	"Jane Doe\n"
+	"jane.doe+cv@example.co.uk | (512) 555-0199 | +1 512.555.0100\n"
+	"1200 Congress Avenue, Austin TX\n"
+	"https://github.com/janedoe and www.janedoe.dev, portfolio janedoe.io/work\n"
+	"Acme Corp[[TAB]]01/2020 – Present\n"
+	"- Cut p99 latency by 35% across 4 services; email ops@acme.com for details.\n"
+)
+
+
+def test_scrub_replaces_each_kind_with_numbered_tokens():
+	scrubbed, tokens = scrub_text(RESUME)
+	assert tokens == {
+		"[[EMAIL_1]]": "jane.doe+cv@example.co.uk",
+		"[[PHONE_1]]": "(512) 555-0199",
+		"[[PHONE_2]]": "+1 512.555.0100",
+		"[[ADDR_1]]": "1200 Congress Avenue",
+		"[[URL_1]]": "https://github.com/janedoe",
+		"[[URL_2]]": "www.janedoe.dev,",
+		"[[URL_3]]": "janedoe.io/work",
+		"[[EMAIL_2]]": "ops@acme.com",
+	}
+	assert "Acme Corp[[TAB]]01/2020 – Present" in scrubbed
+	assert "p99 latency by 35% across 4 services" in scrubbed
+
+
+def test_rehydrate_round_trips_text_and_structures():
+	scrubbed, tokens = scrub_text(RESUME)
+	assert rehydrate(scrubbed, tokens) == RESUME
+	data = {"basics": {"email": "[[EMAIL_1]]", "phones": ["[[PHONE_1]]", 42]}, "note": "see [[URL_9]]", "n": None}
+	assert rehydrate(data, tokens) == {
+		"basics": {"email": "jane.doe+cv@example.co.uk", "phones": ["(512) 555-0199", 42]},
+		"note": "see [[URL_9]]",
+		"n": None,
+	}
+	assert rehydrate(data, {}) is data
+
+
+@pytest.mark.parametrize("text, kind", [
+	("reach me at a.b@c.io", "EMAIL"),
+	("call 512-555-0100", "PHONE"),
+	("visit https://x.org/a?b=1", "URL"),
+	("at 12 Main St. today", "ADDR"),
+])
+def test_each_kind(text, kind):
+	m = PII_RE.search(text)
+	assert m is not None and m.lastgroup == kind
+
+
+# The guards only reject start positions where the plain pattern cannot match, or where
+# it also matches one position earlier, running to the same end
+_PLAIN = {"EMAIL": EMAIL_RE, "PHONE": PHONE_RE, "URL": URL_RE, "ADDR": ADDRESS_HINT}
+_ALPHABET = "aZ09 .-_@+()/:,\n" + "wwwcomhttps" + "StreetAve.Rd."
+
+
+@pytest.mark.parametrize("kind, pattern", _KINDS)
+def test_guards_only_skip_redundant_start_positions(kind, pattern):
+	guarded = re.compile(_START + "(?:" + _GUARDS[kind] + pattern + ")")
+	plain = _PLAIN[kind]
+	rng = random.Random(kind)
+	samples = [RESUME, "12 Main Street", "1 (512) 555 0100", "x@y.co", "www.a.b", "foo.com/bar", "123456 Elm Lane"]
+	samples += ["".join(rng.choice(_ALPHABET) for _ in range(rng.randint(5, 60))) for _ in range(2000)]
+	for text in samples:
+		for i in range(len(text)):
+			p, g = plain.match(text, i), guarded.match(text, i)
+			if g is not None:
+				assert p is not None and g.group(0) == p.group(0), (text, i)
+			elif p is not None:
+				earlier = plain.match(text, i - 1) if i else None
+				assert earlier is not None and earlier.end() == p.end(), (text, i)
@@ -0,0 +1,61 @@
+import io
+import os
+import shutil
+import zipfile
+
+import pytest
+
+import app.config as cfg
+from app.services.reference_template import get_reference_template, header_title_line
+
+
+@pytest.fixture
+def template_path(tmp_path):
+	path = tmp_path / "Reference.docx"
+	shutil.copyfile(cfg.REFERENCE_DOCX, path)
+	return path
+
+
+def _parts(blob: bytes):
+	with zipfile.ZipFile(io.BytesIO(blob)) as zf:
+		return {info.filename: zf.read(info) for info in zf.infolist()}
+
+
+@pytest.mark.parametrize("data, line", [
+	({"candidate_title": "Java Developer"}, "Java Developer"),
+	({"candidate_title": "Java Developer", "experience_level": " Senior "}, "Senior Java Developer"),
+	({"candidate_title": "Java Developer", "experience_level": "Senior", "experience_custom": "Lead"}, "Lead Java Developer"),
+	({"experience_level": "SME"}, "SME"),
+	({}, ""),
+])
+def test_header_title_line(data, line):
+	assert header_title_line(data) == line
+
+
+def test_render_fills_and_escapes_only_the_header(template_path):
+	tpl = get_reference_template(template_path)
+	original = _parts(template_path.read_bytes())
+	rendered = _parts(tpl.render({"candidate_name": "Jane <Doe> & Co", "candidate_title": "Developer"}))
+	assert list(rendered) == list(original)
+	header = rendered["word/header1.xml"].decode("utf-8")
+	assert "Jane &lt;Doe&gt; &amp; Co" in header
+	assert "Developer" in header
+	assert "{{CANDIDATE_" not in header
+	for name, raw in original.items():
+		if name != "word/header1.xml":
+			assert rendered[name] == raw, name
+
+
+def test_renders_do_not_leak_into_each_other(template_path):
+	tpl = get_reference_template(template_path)
+	tpl.render({"candidate_name": "First Person"})
+	second = _parts(tpl.render({"candidate_name": "Second Person"}))["word/header1.xml"]
+	assert b"Second Person" in second and b"First Person" not in second
+
+
+def test_cached_until_the_file_changes(template_path):
+	first = get_reference_template(template_path)
+	assert get_reference_template(template_path) is first
+	stat = template_path.stat()
+	os.utime(template_path, (stat.st_atime, stat.st_mtime + 10))
+	assert get_reference_template(template_path) is not first
@@ -0,0 +1,68 @@
+from datetime import date
+
+import pytest
+
+from app.services.seniority import _parse_start, infer_seniority_locally, level_for_years
+
+TODAY = date(2026, 6, 15)
+
+
+@pytest.mark.parametrize("years, level", [
+	(0, "Journeyman"), (5, "Journeyman"), (6, "Senior"), (10, "Senior"), (11, "SME"), (30, "SME"),
+])
+def test_level_for_years_thresholds(years, level):
+	assert level_for_years(years) == level
+
+
+@pytest.mark.parametrize("value, parsed", [
+	("2015-03-20", (2015, 3, 20)),
+	("2015-03", (2015, 3, 1)),
+	("2015", (2015, 1, 1)),
+	("2015/3/7", (2015, 3, 7)),
+	("03/2015", (2015, 3, 1)),
+	("Mar 2015", (2015, 3, 1)),
+	("March 2015", (2015, 3, 1)),
+])
+def test_parse_start(value, parsed):
+	assert _parse_start(value) == parsed
+
+
+@pytest.mark.parametrize("value", ["", None, "Present", "2015-13", "1850", "2015-02-40", "sometime"])
+def test_parse_start_rejects(value):
+	assert _parse_start(value) is None
+
+
+@pytest.mark.parametrize("start, level", [
+	# Whole years only: a start one day short of the anniversary stays in the lower band
+	("2020-06-16", "Journeyman"),
+	("2020-06-15", "Senior"),
+	("2015-06-16", "Senior"),
+	("2015-06-15", "SME"),
+	("2030-01-01", "Journeyman"),
+])
+def test_anniversary_boundaries(start, level):
+	assert infer_seniority_locally([{"startDate": start}], None, today=TODAY) == level
+
+
+def test_oldest_start_wins_across_overlapping_roles():
+	work = [
+		{"startDate": "2021-01-01", "endDate": ""},  # current role, "Present"
+		{"startDate": "2012-02-01", "endDate": "2022-01-01"},  # overlaps the current role
+		{"startDate": "2018-05-01", "endDate": "2020-01-01"},
+	]
+	assert infer_seniority_locally(work, None, today=TODAY) == "SME"
+
+
+def test_unparseable_entries_are_skipped():
+	work = [{"startDate": "Present"}, {"startDate": ""}, {"startDate": "2019-09"}]
+	assert infer_seniority_locally(work, None, today=TODAY) == "Senior"
+
+
+def test_falls_back_to_internal_experience():
+	roles = [{"start_date": "Present"}, {"start_date": "04/2016"}, {"start_date": "Jan 2022"}]
+	assert infer_seniority_locally([{"startDate": ""}], roles, today=TODAY) == "Senior"
+
+
+def test_no_dates_returns_empty():
+	assert infer_seniority_locally([{"startDate": "Present"}], [{"start_date": "n/a"}], today=TODAY) == ""
+	assert infer_seniority_locally(None, None, today=TODAY) == ""
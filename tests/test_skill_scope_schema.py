@@ -0,0 +1,82 @@
+import json
+
+import pytest
+
+from app.routers.convert import _skill_scope_to_internal
+from app.services.extraction import _system_prompt
+from app.services.skill_scope_schema import (
+	INTERNAL_FIELDS,
+	JSON_RESUME_SCHEMA,
+	SCHEMA_PROFILES,
+	SCHEMA_TEXT,
+	project_schema,
+	schema_text,
+)
+
+
+def _sample(schema, path=""):
+	"""A document shaped like `schema` with a distinct value in every leaf."""
+	if isinstance(schema, dict):
+		return {k: _sample(v, f"{path}.{k}") for k, v in schema.items()}
+	if isinstance(schema, list):
+		return [_sample(schema[0], f"{path}[{i}]") for i in range(2)]
+	if schema == "boolean":
+		return False
+	if schema == "integer":
+		return 1
+	if schema == "YYYY-MM-DD":
+		return "2019-04-01"
+	return path
+
+
+def _prune(value, schema):
+	"""Keep only the keys `schema` has, like a model answering the trimmed schema would."""
+	if isinstance(schema, dict) and isinstance(value, dict):
+		return {k: _prune(v, schema[k]) for k, v in value.items() if k in schema}
+	if isinstance(schema, list) and isinstance(value, list):
+		return [_prune(v, schema[0]) for v in value]
+	return value
+
+
+def test_project_schema_keeps_only_selected_fields_in_order():
+	schema = {"a": "string", "b": {"c": "string", "d": "string"}, "e": [{"f": "string", "g": "string"}]}
+	fields = {"e": {"g": True}, "b": {"d": True}}
+	assert list(project_schema(schema, fields)) == ["b", "e"]
+	assert project_schema(schema, fields) == {"b": {"d": "string"}, "e": [{"g": "string"}]}
+	assert project_schema(schema, True) is schema
+
+
+def test_every_internal_field_exists_in_the_full_schema():
+	def walk(schema, fields, path):
+		if fields is True:
+			return
+		if isinstance(schema, list):
+			schema = schema[0]
+		for key, sub in fields.items():
+			assert key in schema, f"{path}{key} is not in JSON_RESUME_SCHEMA"
+			walk(schema[key], sub, f"{path}{key}.")
+
+	walk(JSON_RESUME_SCHEMA, INTERNAL_FIELDS, "")
+
+
+def test_minimal_profile_loses_nothing_the_transform_reads():
+	full = _sample(JSON_RESUME_SCHEMA)
+	minimal = _prune(full, SCHEMA_PROFILES["minimal"])
+	assert _skill_scope_to_internal(minimal) == _skill_scope_to_internal(full)
+
+
+def test_schema_text_is_compact_json():
+	for name, schema in SCHEMA_PROFILES.items():
+		assert json.loads(SCHEMA_TEXT[name]) == schema
+		assert ": " not in SCHEMA_TEXT[name] and ", " not in SCHEMA_TEXT[name]
+	assert len(SCHEMA_TEXT["minimal"]) < len(SCHEMA_TEXT["full"]) / 2
+
+
+def test_system_prompt_embeds_the_profile_schema():
+	assert schema_text("minimal") in _system_prompt("minimal")
+	assert schema_text("full") in _system_prompt("full")
+
+
+def test_unknown_profile_is_rejected():
+	with pytest.raises(ValueError, match="unknown schema profile"):
+		_system_prompt("tiny")
@@ -0,0 +1,54 @@
+import pytest
+
+from app.services.normalize import normalize_resume_data
+from app.services.skill_taxonomy import SkillTaxonomy, get_skill_taxonomy
+
+
+@pytest.fixture(scope="module")
+def taxonomy() -> SkillTaxonomy:
+	return get_skill_taxonomy()
+
+
+@pytest.mark.parametrize("skill", [
+	"Python 2.7", "Python 3", "Spring Boot 2.x", "Oracle 11g", "Java 8",
+	"Java EE", "J2EE", "Jakarta EE", "Java SE", "Windows Server", "ES6",
+	"NoSQL", "Azure SQL", "VB.NET", "Spark SQL", "PySpark", "HDFS", "Docker Compose",
+])
+def test_editions_versions_and_platforms_are_kept(taxonomy, skill):
+	assert taxonomy.canonicalize([skill]) == [skill]
+
+
+@pytest.mark.parametrize("skill, canonical", [
+	("k8s", "Kubernetes"),
+	("golang", "Go"),
+	("ReactJS", "React"),
+	("node.js", "Node.js"),
+	("  spring   boot ", "Spring Boot"),
+	("Kubernets", "Kubernetes"),
+	("React development", "React"),
+	("Python (advanced)", "Python"),
+	("jee", "Java EE"),
+])
+def test_spelling_variants_map_to_the_canonical_name(taxonomy, skill, canonical):
+	assert taxonomy.canonicalize([skill]) == [canonical]
+
+
+def test_unknown_skills_are_returned_stripped(taxonomy):
+	assert taxonomy.canonicalize(["  In-house tool  "]) == ["In-house tool"]
+
+
+def test_versioned_skill_is_matched_exactly_or_not_at_all():
+	taxonomy = SkillTaxonomy({"Python": ["python"], "Python 3": ["python3"]})
+	assert taxonomy.canonicalize(["python3", "Python 2.7", "Pyhton 2.7"]) == ["Python 3", "Python 2.7", "Pyhton 2.7"]
+
+
+def test_normalize_keeps_every_distinct_skill():
+	data = normalize_resume_data({"core_skills": ["Java", "java", "Java EE", "J2EE", "Python 2.7", "Python", "k8s", "Kubernetes"]})
+	assert data["core_skills"] == ["Java", "Java EE", "J2EE", "Python 2.7", "Python", "Kubernetes"]
+
+
+def test_mentions_ignore_ordinary_words():
+	taxonomy = SkillTaxonomy({"React": ["react"], "Apache Kafka": ["kafka"]}, ambiguous=["react"])
+	assert taxonomy.mentions("Can react quickly; built Kafka pipelines.") == {"Apache Kafka"}
+	assert taxonomy.mentions("Built apps with React and kafka.") == {"React", "Apache Kafka"}
+	assert taxonomy.mentions("react, kafka", strict=False) == {"React", "Apache Kafka"}
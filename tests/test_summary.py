@@ -0,0 +1,87 @@
+import asyncio
+from typing import Any, Dict, List
+
+import pytest
+
+import app.config as cfg
+from app.services import summary
+from app.services.summary import validate_summary
+
+RESUME = "Built Java and Spring Boot services on AWS. Streamed events with Kafka. Deployed with Docker."
+GOOD = (
+	"Senior engineer building Java and Spring Boot services on AWS. "
+	"Streams events with Kafka and deploys with Docker. "
+	"Focused on reliable, well-tested backends."
+)
+
+
+class FakeLLM:
+	"""Stands in for chat_completion: streams replies[stage] word by word to on_delta."""
+
+	def __init__(self) -> None:
+		self.replies = {"summary_draft": GOOD, "summary": GOOD}
+		self.stages: List[str] = []
+
+	async def __call__(self, *, stage, messages, temperature=0, on_delta=None, **kwargs):
+		self.stages.append(stage)
+		text = self.replies[stage]
+		if on_delta is not None:
+			for word in text.split(" "):
+				on_delta(word + " ")
+		return text
+
+
+@pytest.fixture
+def llm(monkeypatch) -> FakeLLM:
+	fake = FakeLLM()
+	monkeypatch.setattr(summary, "chat_completion", fake)
+	return fake
+
+
+def test_cascade_is_off_by_default():
+	assert cfg.SUMMARY_CASCADE is False
+
+
+def test_without_cascade_the_summary_streams(llm, monkeypatch):
+	monkeypatch.setattr(cfg, "SUMMARY_CASCADE", False)
+	tokens: List[str] = []
+	text = asyncio.run(summary.summary_completion([], RESUME, on_token=tokens.append))
+	assert text == GOOD
+	assert llm.stages == ["summary"]
+	assert len(tokens) > 1
+
+
+def test_cascade_uses_an_accepted_draft(llm, monkeypatch):
+	monkeypatch.setattr(cfg, "SUMMARY_CASCADE", True)
+	tokens: List[str] = []
+	outcomes: List[Dict[str, Any]] = []
+	text = asyncio.run(summary.summary_completion([], RESUME, on_token=tokens.append, on_cascade=outcomes.append))
+	assert text == GOOD
+	assert llm.stages == ["summary_draft"]
+	assert tokens == [GOOD]
+	assert outcomes[0]["stage"] == "summary_draft"
+
+
+def test_cascade_escalates_a_bad_draft(llm, monkeypatch):
+	monkeypatch.setattr(cfg, "SUMMARY_CASCADE", True)
+	llm.replies["summary_draft"] = "Mr. Smith knows a variety of tools."
+	tokens: List[str] = []
+	text = asyncio.run(summary.summary_completion([], RESUME, candidate_name="John Smith", on_token=tokens.append))
+	assert text == GOOD
+	assert llm.stages == ["summary_draft", "summary"]
+	assert "".join(tokens).strip() == GOOD
+
+
+def test_validate_accepts_a_grounded_summary():
+	assert validate_summary(GOOD, RESUME) == []
+
+
+@pytest.mark.parametrize("text, problem", [
+	("Mr. Smith builds Java services. He uses AWS. He deploys with Docker.", "name prefix"),
+	("Smith builds Java services. Uses AWS. Deploys with Docker.", "name prefix"),
+	("Builds Java services on AWS.", "1 sentences"),
+	("Builds Java services. Uses a variety of AWS tools. Deploys with Docker.", "vague: variety of"),
+	("Builds Java services. Uses AWS and Kubernetes. Deploys with Docker.", "not in resume: Kubernetes"),
+])
+def test_validate_flags_problems(text, problem):
+	assert problem in validate_summary(text, RESUME, "John Smith")
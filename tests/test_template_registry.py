@@ -0,0 +1,76 @@
+import json
+import os
+import shutil
+
+import pytest
+
+import app.config as cfg
+from app.services.styles import DEFAULT_STYLE_NAMES
+from app.services.template_registry import DEFAULT_TEMPLATE, TemplateRegistry
+
+
+@pytest.fixture
+def root(tmp_path):
+	brand = tmp_path / "brand"
+	brand.mkdir()
+	shutil.copyfile(cfg.REFERENCE_DOCX, brand / "Reference.docx")
+	(brand / "style_map.json").write_text(json.dumps({"bullet": "Brand Bullet"}))
+	(brand / "resume.md.j2").write_text("# {{ data.candidate_name }}\n")
+	plain = tmp_path / "plain"
+	plain.mkdir()
+	shutil.copyfile(cfg.REFERENCE_DOCX, plain / "reference.docx")
+	(tmp_path / "empty").mkdir()
+	(tmp_path / "bad name").mkdir()
+	shutil.copyfile(cfg.REFERENCE_DOCX, tmp_path / "bad name" / "Reference.docx")
+	return tmp_path
+
+
+def test_names_lists_directories_with_a_reference_docx(root):
+	assert TemplateRegistry(root).names() == [DEFAULT_TEMPLATE, "brand", "plain"]
+
+
+def test_default_template(root):
+	registry = TemplateRegistry(root)
+	for name in (None, "", "  ", DEFAULT_TEMPLATE):
+		tpl = registry.get(name)
+		assert tpl.name == DEFAULT_TEMPLATE
+		assert tpl.reference_docx == cfg.REFERENCE_DOCX
+
+
+def test_named_template_merges_its_style_map(root):
+	tpl = TemplateRegistry(root).get("brand")
+	assert tpl.reference_docx == root / "brand" / "Reference.docx"
+	styles = tpl.style_names()
+	assert styles["bullet"] == "Brand Bullet"
+	assert styles["job_header"] == DEFAULT_STYLE_NAMES["job_header"]
+
+
+@pytest.mark.parametrize("name, message", [
+	("../brand", "invalid template name"),
+	("bad name", "invalid template name"),
+	("empty", "unknown template"),
+	("missing", "unknown template"),
+])
+def test_rejects_bad_and_unknown_names(root, name, message):
+	with pytest.raises(ValueError, match=message):
+		TemplateRegistry(root).get(name)
+
+
+def test_markdown_template_override_and_fallback(root):
+	registry = TemplateRegistry(root)
+	brand = registry.markdown_template(registry.get("brand"))
+	assert brand.render(data={"candidate_name": "Jane"}) == "# Jane"
+	plain = registry.markdown_template(registry.get("plain"))
+	assert plain.filename == str(cfg.VIEWS_DIR / "resume.md.j2")
+
+
+def test_markdown_template_is_compiled_once_and_reloaded_on_change(root):
+	registry = TemplateRegistry(root)
+	tpl = registry.get("brand")
+	first = registry.markdown_template(tpl)
+	assert registry.markdown_template(tpl) is first
+	path = root / "brand" / "resume.md.j2"
+	path.write_text("## {{ data.candidate_name }}\n")
+	stat = path.stat()
+	os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+	assert registry.markdown_template(tpl).render(data={"candidate_name": "Jane"}) == "## Jane"